@@ -5,7 +5,7 @@ from .models import Article, Category
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
-    list_display = ("name", "total_post")
+    list_display = ("name", "total_post", "published_post")
     list_filter = ("name",)
     ordering = (
         "-id",
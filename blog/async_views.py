@@ -0,0 +1,223 @@
+"""
+Async variants of the read views, for serving under ASGI without holding
+a thread per request. blog/urls.py routes a view here when its name is
+in BLOG_ASYNC_VIEWS.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.views import redirect_to_login
+from django.core.cache import cache
+from django.http import Http404
+from django.shortcuts import redirect, render
+
+from blog import search, slugs, trending, viewed
+from blog.cache import (
+    ARTICLES,
+    CATEGORIES,
+    TRENDING,
+    aget_stamps,
+    aget_versions,
+    article_scope,
+    author_scope,
+    category_scope,
+    make_key,
+)
+from blog.counters import view_counter
+from blog.models import Article, Category
+from blog.views import (
+    apaginate,
+    category_page_key,
+    find_category,
+    fragment_keys,
+    home_validators,
+    not_modified,
+    page_validators,
+    related_articles_of,
+    render_article_fragment,
+    render_related_fragment,
+    set_validators,
+    summarize_stats,
+)
+
+
+async def home(request):
+    page, validators = None, None
+    if request.method == "POST":
+        query = request.POST["query"]
+        articles = await sync_to_async(search.get_backend().search)(
+            query, limit=settings.BLOG_SEARCH_LIMIT
+        )
+    else:
+        versions, modified = await aget_stamps(
+            ARTICLES, CATEGORIES, TRENDING
+        )
+        validators = home_validators(request, versions, modified)
+        if response := not_modified(request, *validators):
+            return response
+        page = await apaginate(request, Article.published.for_listing())
+        articles = page.object_list
+
+    context = {
+        "articles": articles,
+        "page": page,
+        "categories": await category_sidebar(),
+        "trending": await trending.aleaderboard(),
+    }
+    response = render(request, "blog/home.html", context=context)
+    return set_validators(response, *validators) if validators else response
+
+
+async def category_sidebar(version=None):
+    """Async counterpart of ``blog.views.category_sidebar``."""
+    if version is None:
+        (version,) = await aget_versions(CATEGORIES)
+    key = make_key("categories", version)
+    categories = await cache.aget(key)
+    if categories is None:
+        rows = Category.objects.order_by("name").values(
+            "pk", "name", "published_post"
+        )
+        categories = [row async for row in rows]
+        await cache.aset(key, categories, settings.BLOG_PAGE_CACHE_TIMEOUT)
+    return categories
+
+
+async def category_articles(request, pk):
+    versions, modified = await aget_stamps(category_scope(pk), CATEGORIES)
+    query = request.GET.urlencode()
+    validators = page_validators(["category", pk, query, *versions], modified)
+    if response := not_modified(request, *validators):
+        return response
+
+    categories = await category_sidebar(versions[1])
+    category = find_category(categories, pk)
+
+    key = category_page_key(pk, query, versions)
+    page = await cache.aget(key)
+    if page is None:
+        articles = Article.published.filter(category_id=pk).for_listing()
+        page = await apaginate(request, articles)
+        await cache.aset(
+            key, page, settings.BLOG_CATEGORY_PAGE_CACHE_TIMEOUT
+        )
+
+    context = {
+        "category": category,
+        "articles": page.object_list,
+        "page": page,
+        "categories": categories,
+    }
+    response = render(request, "blog/category.html", context=context)
+    return set_validators(response, *validators)
+
+
+async def get_article(slug, published=False):
+    """Async counterpart of ``blog.views.get_article``."""
+    manager = Article.published if published else Article.objects
+    articles = manager.select_related("category")
+    found = await slugs.alookup(slug)
+    if found is not None:
+        article = await articles.filter(pk=found[0]).afirst()
+        if article is not None and article.slug == found[1]:
+            return article
+        await slugs.aforget(slug)
+
+    article = await articles.filter(slug=slug).afirst()
+    if article is None:
+        pk = await slugs.aredirect_target(slug)
+        article = await articles.filter(pk=pk).afirst() if pk else None
+    if article is None:
+        raise Http404("No article found matching the slug")
+
+    await slugs.aremember(slug, article.pk, article.slug)
+    return article
+
+
+async def article_fragments(slug, versions=None):
+    """Async counterpart of ``blog.views.article_fragments``."""
+    if versions is None:
+        versions = await aget_versions(article_scope(slug), ARTICLES)
+    article_key, related_key = fragment_keys(slug, *versions)
+    cached = await cache.aget_many([article_key, related_key])
+    timeout = settings.BLOG_PAGE_CACHE_TIMEOUT
+
+    article, views = cached.get(article_key), None
+    if article is None:
+        found = await slugs.alookup(slug)
+        if found is not None and found[1] != slug:
+            return {"pk": found[0], "slug": found[1]}, None, None
+
+        instance = await get_article(slug, published=True)
+        if instance.slug != slug:
+            return {"pk": instance.pk, "slug": instance.slug}, None, None
+        article = render_article_fragment(instance)
+        views = instance.views
+        await cache.aset(article_key, article, timeout)
+
+    related = cached.get(related_key)
+    if related is None:
+        related_articles = related_articles_of(article["pk"])
+        related = render_related_fragment(
+            [related async for related in related_articles]
+        )
+        await cache.aset(related_key, related, timeout)
+
+    return article, related, views
+
+
+async def article_details(request, slug):
+    versions, modified = await aget_stamps(article_scope(slug), ARTICLES)
+    validators = page_validators(["article", slug, *versions], modified)
+    if response := not_modified(request, *validators):
+        return response
+
+    article, related, views = await article_fragments(slug, versions)
+    if article["slug"] != slug:
+        return redirect(
+            "blog:article_details", slug=article["slug"], permanent=True
+        )
+    id_ = article["pk"]
+
+    seen = viewed.read(request)
+    if id_ not in seen:
+        await view_counter.aincr(id_)
+
+    context = {
+        "article": article,
+        "related_html": related,
+        "views": await view_counter.atotal(id_, stored=views),
+    }
+    response = render(request, "blog/article_details.html", context=context)
+    if id_ not in seen:
+        viewed.remember(response, seen, id_)
+    return set_validators(response, *validators)
+
+
+async def author_stats(author_id):
+    """Async counterpart of ``blog.views.author_stats``."""
+    key = make_key(
+        "author_stats",
+        author_id,
+        *await aget_versions(author_scope(author_id)),
+    )
+    stats = await cache.aget(key)
+    if stats is None:
+        rows = Article.objects.filter(author_id=author_id).category_stats()
+        stats = summarize_stats([row async for row in rows])
+        await cache.aset(key, stats, settings.BLOG_DASHBOARD_CACHE_TIMEOUT)
+    return stats
+
+
+async def dashboard(request):
+    user = await request.auser()
+    if not user.is_authenticated:
+        return redirect_to_login(request.get_full_path())
+
+    articles = Article.objects.filter(author=user).for_listing()
+    page = await apaginate(request, articles)
+    context = {
+        "articles": page.object_list,
+        "page": page,
+        "stats": await author_stats(user.pk),
+    }
+    return render(request, "blog/dashboard.html", context)
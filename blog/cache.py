@@ -0,0 +1,94 @@
+"""
+Scopes of the version stamps of cached blog fragments, see core/cache.py.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+from core.cache import (  # noqa: F401
+    aget_stamps,
+    aget_versions,
+    bump_versions,
+    get_stamps,
+    get_versions,
+)
+
+# Bumped whenever any article is created, changed or deleted
+ARTICLES = "articles"
+# Bumped whenever a category or its number of articles changes
+CATEGORIES = "categories"
+# Bumped whenever the trending leaderboards are recomputed
+TRENDING = "trending"
+
+
+def slug_digest(slug):
+    """
+    Fixed-length stand-in for a slug in cache keys: slugs come from the
+    URL, and memcached refuses keys with spaces or over 250 characters.
+    """
+    return hashlib.md5(slug.encode()).hexdigest()
+
+
+def article_scope(slug):
+    return f"article:{slug_digest(slug)}"
+
+
+def category_scope(category_id):
+    return f"category:{category_id}"
+
+
+def author_scope(author_id):
+    return f"author:{author_id}"
+
+
+def make_key(name, *parts):
+    return ":".join(["blog", name, *map(str, parts)])
+
+
+class LocalCache:
+    """
+    Per-process LRU cache, sized by the ``size_setting`` setting. With a
+    ``timeout_setting`` entries also expire after that many seconds, for
+    values other processes may change.
+    """
+
+    def __init__(self, size_setting, timeout_setting=None):
+        self.size_setting = size_setting
+        self.timeout_setting = timeout_setting
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires is not None and expires <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        expires = None
+        if self.timeout_setting:
+            timeout = getattr(settings, self.timeout_setting)
+            expires = time.monotonic() + timeout
+        with self._lock:
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            size = getattr(settings, self.size_setting)
+            while len(self._entries) > size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
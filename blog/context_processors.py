@@ -0,0 +1,6 @@
+from django.conf import settings
+
+
+def highlighting(request):
+    """Whether code blocks come highlighted from the server."""
+    return {"highlight_on_server": settings.BLOG_HIGHLIGHT_CODE}
@@ -0,0 +1,170 @@
+import atexit
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, transaction
+from django.db.models import F
+
+from blog import trending
+from blog.cache import make_key
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCounter:
+    """
+    Buffer article view increments in memory and write them to the
+    database in bulk, so reading an article never writes its row.
+
+    Pending views are flushed once ``BLOG_VIEW_COUNT_FLUSH_INTERVAL``
+    seconds have passed since the last flush or ``BLOG_VIEW_COUNT_MAX_PENDING``
+    views are buffered, and when the process exits. A daemon thread,
+    started by the first view of the process, flushes them on time even
+    when no further views come.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = Counter()
+        self._last_flush = time.monotonic()
+        self._thread = None
+
+    def _add(self, pk, n):
+        """Buffer ``n`` views of ``pk``; return whether a flush is due."""
+        with self._lock:
+            self._pending[pk] += n
+            if self._thread is None or not self._thread.is_alive():
+                # Threads don't survive a fork, each worker starts its own
+                self._thread = threading.Thread(
+                    target=self._flush_periodically,
+                    name="view-counter-flush",
+                    daemon=True,
+                )
+                self._thread.start()
+            return (
+                sum(self._pending.values())
+                >= settings.BLOG_VIEW_COUNT_MAX_PENDING
+                or self._interval_elapsed()
+            )
+
+    def _interval_elapsed(self):
+        return (
+            time.monotonic() - self._last_flush
+            >= settings.BLOG_VIEW_COUNT_FLUSH_INTERVAL
+        )
+
+    def _flush_periodically(self):
+        while True:
+            due = self._last_flush + settings.BLOG_VIEW_COUNT_FLUSH_INTERVAL
+            time.sleep(max(due - time.monotonic(), 1))
+            try:
+                self.flush_due()
+            except Exception:
+                logger.exception("Flushing article views failed")
+            finally:
+                close_old_connections()
+
+    def flush_due(self):
+        """Flush if the interval elapsed since the last flush."""
+        if self._pending and self._interval_elapsed():
+            return self.flush()
+        return 0
+
+    def incr(self, pk, n=1):
+        if self._add(pk, n):
+            self.flush()
+
+    async def aincr(self, pk, n=1):
+        if self._add(pk, n):
+            await sync_to_async(self.flush)()
+
+    def pending(self, pk):
+        """Views of ``pk`` counted but not yet written."""
+        return self._pending.get(pk, 0)
+
+    def total(self, pk, stored=None):
+        """
+        Views of ``pk`` including pending ones. The stored count comes
+        from the cache, then ``stored``, then the database.
+        """
+        key = make_key("views", pk)
+        views = cache.get(key)
+        if views is None:
+            if stored is None:
+                stored = self._stored_views(pk).first()
+            views = stored or 0
+            cache.set(key, views, settings.BLOG_VIEW_COUNT_CACHE_TIMEOUT)
+        return views + self.pending(pk)
+
+    async def atotal(self, pk, stored=None):
+        key = make_key("views", pk)
+        views = await cache.aget(key)
+        if views is None:
+            if stored is None:
+                stored = await self._stored_views(pk).afirst()
+            views = stored or 0
+            await cache.aset(
+                key, views, settings.BLOG_VIEW_COUNT_CACHE_TIMEOUT
+            )
+        return views + self.pending(pk)
+
+    def _stored_views(self, pk):
+        from blog.models import Article
+
+        return Article.objects.filter(pk=pk).values_list("views", flat=True)
+
+    def clear(self):
+        with self._lock:
+            self._pending.clear()
+
+    def flush(self):
+        """Write every pending increment; return how many were written."""
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            self._last_flush = time.monotonic()
+
+        if not pending:
+            return 0
+
+        # One UPDATE per distinct increment rather than one per article
+        by_increment = defaultdict(list)
+        for pk, n in pending.items():
+            by_increment[n].append(pk)
+
+        from blog.models import Article
+
+        try:
+            with transaction.atomic():
+                for n, pks in by_increment.items():
+                    Article.objects.filter(pk__in=pks).update(
+                        views=F("views") + n
+                    )
+                trending.record(pending)
+        except Exception:
+            with self._lock:
+                self._pending.update(pending)
+            raise
+
+        for pk, n in pending.items():
+            try:
+                cache.incr(make_key("views", pk), n)
+            except ValueError:
+                pass
+
+        return sum(pending.values())
+
+
+view_counter = ViewCounter()
+
+
+@atexit.register
+def _flush_on_exit():
+    try:
+        view_counter.flush()
+    except Exception:
+        pass
@@ -0,0 +1,30 @@
+from autoslug import AutoSlugField
+
+
+class BulkAutoSlugField(AutoSlugField):
+    """
+    AutoSlugField that only probes for a unique slug when it may change:
+    slugs made unique in bulk by ArticleQuerySet.assign_slugs are kept, and
+    so are the slugs of loaded rows whose source fields are unchanged.
+    """
+
+    def pre_save(self, instance, add):
+        slug = getattr(instance, self.attname)
+        if getattr(instance, "_slug_assigned", False):
+            return slug
+        if slug and not add and not self.sources_changed(instance):
+            return slug
+        return super().pre_save(instance, add)
+
+    def sources_changed(self, instance):
+        loaded = getattr(instance, "_loaded_values", None)
+        if loaded is None or not isinstance(self.populate_from, str):
+            return True
+
+        sources = [self.populate_from, *self.unique_with]
+        attnames = [instance._meta.get_field(name).attname for name in sources]
+        return any(
+            attname not in loaded
+            or loaded[attname] != getattr(instance, attname)
+            for attname in attnames
+        )
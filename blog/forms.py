@@ -1,4 +1,5 @@
 from django import forms
+from django.conf import settings
 
 from .models import Article, Category
 
@@ -14,11 +15,22 @@ class ArticleForm(forms.ModelForm):
         model = Article
         fields = ("author", "category", "topic", "body", "posted", "thumbnail")
 
+    def __init__(self, *args, upload_errors=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Rejections made by blog.uploadhandlers while streaming the upload
+        self.upload_errors = upload_errors or {}
+
     def clean_thumbnail(self):
+        if "thumbnail" in self.upload_errors:
+            raise forms.ValidationError(self.upload_errors["thumbnail"])
+
         thumbnail = self.cleaned_data.get("thumbnail", False)
 
-        if thumbnail and thumbnail.size > 3 * 1024**2:
-            raise forms.ValidationError("Thumbnail cannot exceed 3.0Mb")
+        limit = settings.BLOG_THUMBNAIL_MAX_UPLOAD_SIZE
+        if thumbnail and thumbnail.size > limit:
+            raise forms.ValidationError(
+                f"Thumbnail cannot exceed {limit / 1024**2:.1f}Mb"
+            )
 
         self.cleaned_data["thumbnail"] = thumbnail
 
@@ -0,0 +1,118 @@
+"""
+Server-side syntax highlighting of the code samples in article bodies.
+
+Code blocks (``<pre class="language-...">`` from TinyMCE's codesample
+plugin) are rendered with Pygments when an article is saved. Each block is
+keyed by a hash of its language and code. Rendered blocks are kept in a
+per-process LRU cache and in the HighlightedCode table, so unchanged
+samples are not tokenized again when an article is edited or re-rendered.
+"""
+import hashlib
+import re
+from html import unescape
+
+from django.utils.html import strip_tags
+from pygments import highlight as pygmentize
+from pygments.formatters import HtmlFormatter
+from pygments.lexers import TextLexer, get_lexer_by_name, guess_lexer
+from pygments.util import ClassNotFound
+
+from blog.cache import LocalCache
+
+CSS_CLASS = "highlight"
+
+_block_re = re.compile(r"<pre(?P<attrs>[^>]*)>(?P<code>.*?)</pre>", re.S)
+_language_re = re.compile(r"\blang(?:uage)?-([\w+#.-]+)")
+_code_tag_re = re.compile(r"^\s*<code[^>]*>")
+_br_re = re.compile(r"<br\s*/?>")
+
+# Names used by the editor that Pygments knows under another one
+LANGUAGE_ALIASES = {"markup": "html"}
+
+formatter = HtmlFormatter(nowrap=True)
+rendered_blocks = LocalCache("BLOG_HIGHLIGHT_CACHE_SIZE")
+
+
+def digest(language, code):
+    return hashlib.sha256(f"{language}\0{code}".encode()).hexdigest()
+
+
+def parse_block(match):
+    """Return ``(language, code)`` of a ``<pre>`` block match."""
+    code_tag = _code_tag_re.match(match["code"])
+    found = _language_re.search(
+        match["attrs"] + (code_tag.group() if code_tag else "")
+    )
+    language = found.group(1).lower() if found else ""
+    code = unescape(strip_tags(_br_re.sub("\n", match["code"])))
+    return LANGUAGE_ALIASES.get(language, language), code
+
+
+def render_block(language, code):
+    try:
+        lexer = get_lexer_by_name(language) if language else guess_lexer(code)
+    except ClassNotFound:
+        lexer = TextLexer()
+
+    language_class = f' class="language-{language}"' if language else ""
+    return (
+        f'<pre class="{CSS_CLASS}"><code{language_class}>'
+        f"{pygmentize(code, lexer, formatter)}</code></pre>"
+    )
+
+
+def render_blocks(blocks, store=True):
+    """
+    Return ``{digest: html}`` for ``blocks``, a ``{digest: (language,
+    code)}`` dict, rendering only what neither cache has seen. With
+    ``store`` off the HighlightedCode table is left alone.
+    """
+    rendered = {}
+    for key in blocks:
+        html = rendered_blocks.get(key)
+        if html is not None:
+            rendered[key] = html
+
+    missing = [key for key in blocks if key not in rendered]
+    if missing and store:
+        from blog.models import HighlightedCode
+
+        rendered.update(
+            HighlightedCode.objects.filter(pk__in=missing).values_list(
+                "digest", "html"
+            )
+        )
+        missing = [key for key in missing if key not in rendered]
+
+    new = {key: render_block(*blocks[key]) for key in missing}
+    if new and store:
+        HighlightedCode.objects.bulk_create(
+            [
+                HighlightedCode(
+                    digest=key, language=blocks[key][0], html=html
+                )
+                for key, html in new.items()
+            ],
+            ignore_conflicts=True,
+        )
+    rendered.update(new)
+
+    for key, html in rendered.items():
+        rendered_blocks.set(key, html)
+    return rendered
+
+
+def highlight(html, store=True):
+    """Replace the code blocks of sanitized ``html`` with highlighted ones."""
+    blocks, keys = {}, []
+    for match in _block_re.finditer(html):
+        language, code = parse_block(match)
+        key = digest(language, code)
+        blocks[key] = (language, code)
+        keys.append(key)
+    if not blocks:
+        return html
+
+    rendered = render_blocks(blocks, store=store)
+    keys = iter(keys)
+    return _block_re.sub(lambda match: rendered[next(keys)], html)
@@ -0,0 +1,80 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog import search
+from blog.models import Article, Category
+
+SYLLABLES = "ka lo mi nu pe ri so ta ve xi za do fu gi".split()
+WORDS = sorted(
+    {"".join(random.choices(SYLLABLES, k=4)) for _ in range(20000)}
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare full-text index search against the icontains table scan "
+        "on a throwaway dataset (rolled back when done)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--articles", type=int, default=5000)
+        parser.add_argument("--queries", type=int, default=50)
+        parser.add_argument("--words", type=int, default=300)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.seed(options["articles"], options["words"])
+            queries = [
+                random.choice(WORDS) for _ in range(options["queries"])
+            ]
+            for name, backend in (
+                ("icontains", search.DatabaseSearchBackend()),
+                ("fts5/bm25", search.SQLiteFTSBackend()),
+            ):
+                self.report(name, backend, queries)
+            transaction.set_rollback(True)
+
+    def seed(self, count, words):
+        user = get_user_model().objects.create_user(
+            email="benchmark@example.com", password=None
+        )
+        category = Category.objects.create(name="benchmark-search")
+        articles = [
+            Article(
+                author=user,
+                category=category,
+                topic=f"benchmark {i} {random.choice(WORDS)}",
+                slug=f"benchmark-search-{i}",
+                body="<p>"
+                + " ".join(random.choices(WORDS, k=words))
+                + "</p>",
+                # Both backends only search published articles
+                posted=True,
+            )
+            for i in range(count)
+        ]
+        created = Article.objects.bulk_create(articles, batch_size=1000)
+
+        start = time.perf_counter()
+        search.SQLiteFTSBackend().rebuild(created)
+        self.stdout.write(
+            f"Seeded {count} articles, indexed in "
+            f"{time.perf_counter() - start:.2f}s"
+        )
+
+    def report(self, name, backend, queries):
+        timings = []
+        for query in queries:
+            start = time.perf_counter()
+            backend.search(query, limit=50)
+            timings.append((time.perf_counter() - start) * 1000)
+
+        self.stdout.write(
+            f"{name:>10}: median {statistics.median(timings):.2f}ms, "
+            f"max {max(timings):.2f}ms over {len(timings)} queries"
+        )
@@ -0,0 +1,181 @@
+import asyncio
+import random
+import statistics
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+from django.test import AsyncClient, Client, override_settings
+
+from blog.counters import view_counter
+from blog.models import Article, Category
+
+BENCHMARK_EMAIL = "benchmark-views@example.com"
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure request throughput of the blog views against the "
+        "configured database profile (DJANGO_DB_PROFILE). Seeds its own "
+        "articles and removes them afterwards. With --asgi the requests "
+        "go through the ASGI handler as concurrent tasks; combine it with "
+        "DJANGO_BLOG_ASYNC_VIEWS to compare the sync and async views."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--requests", type=int, default=400)
+        parser.add_argument("--articles", type=int, default=200)
+        parser.add_argument(
+            "--asgi",
+            action="store_true",
+            help="Use --threads concurrent tasks on one event loop.",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Profile: {self.describe_profile()}")
+        async_views = ", ".join(sorted(settings.BLOG_ASYNC_VIEWS)) or "none"
+        self.stdout.write(
+            f"Handler: {'ASGI' if options['asgi'] else 'WSGI'}, "
+            f"async views: {async_views}"
+        )
+        slugs = self.seed(options["articles"])
+        try:
+            self.run_scenarios(
+                slugs,
+                options["threads"],
+                options["requests"],
+                self.aload if options["asgi"] else self.load,
+            )
+        finally:
+            view_counter.clear()
+            with override_settings(BLOG_RELATED_UPDATE_ON_SAVE=False):
+                get_user_model().objects.filter(
+                    email=BENCHMARK_EMAIL
+                ).delete()
+                Category.objects.filter(name="benchmark-views").delete()
+
+    def describe_profile(self):
+        description = f"{settings.DB_PROFILE} ({connection.vendor}"
+        if connection.vendor == "sqlite":
+            with connection.cursor() as cursor:
+                cursor.execute("PRAGMA journal_mode")
+                description += f", journal_mode={cursor.fetchone()[0]}"
+        return description + ")"
+
+    def seed(self, count):
+        user = get_user_model().objects.create_user(
+            email=BENCHMARK_EMAIL, password=None
+        )
+        category = Category.objects.create(name="benchmark-views")
+        Article.objects.bulk_create(
+            Article(
+                author=user,
+                category=category,
+                topic=f"benchmark views {i}",
+                body=f"<p>benchmark article {i}</p>",
+                posted=True,
+            )
+            for i in range(count)
+        )
+        return list(
+            Article.objects.filter(category=category).values_list(
+                "slug", flat=True
+            )
+        )
+
+    def run_scenarios(self, slugs, threads, requests, load):
+        def article():
+            return f"/article/details/{random.choice(slugs)}/"
+
+        scenarios = [
+            # name, next path, new client (session) per request, settings
+            ("read home", lambda: "/", False, {}),
+            ("read article", article, False, {}),
+            (
+                "write views",
+                article,
+                True,
+                {"BLOG_VIEW_COUNT_MAX_PENDING": 1},
+            ),
+        ]
+        for name, path, fresh, overrides in scenarios:
+            with override_settings(**overrides):
+                timings, errors, elapsed = load(
+                    path, fresh, threads, requests
+                )
+            self.report(name, timings, errors, elapsed)
+
+    def load(self, path, fresh, threads, requests):
+        timings, errors = [], []
+        per_thread = max(1, requests // threads)
+
+        def worker():
+            client = Client(SERVER_NAME="localhost")
+            try:
+                for _ in range(per_thread):
+                    if fresh:
+                        client = Client(SERVER_NAME="localhost")
+                    start = time.perf_counter()
+                    response = client.get(path())
+                    timings.append(time.perf_counter() - start)
+                    if response.status_code >= 400:
+                        errors.append(response.status_code)
+            except Exception as error:
+                errors.append(error)
+            finally:
+                connections.close_all()
+
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        start = time.perf_counter()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        return timings, errors, time.perf_counter() - start
+
+    def aload(self, path, fresh, tasks, requests):
+        timings, errors = [], []
+        per_task = max(1, requests // tasks)
+
+        async def worker():
+            client = AsyncClient()
+            for _ in range(per_task):
+                if fresh:
+                    client = AsyncClient()
+                start = time.perf_counter()
+                try:
+                    response = await client.get(path())
+                except Exception as error:
+                    errors.append(error)
+                    return
+                timings.append(time.perf_counter() - start)
+                if response.status_code >= 400:
+                    errors.append(response.status_code)
+
+        async def main():
+            await asyncio.gather(*(worker() for _ in range(tasks)))
+
+        # The async test client always sends "Host: testserver".
+        with override_settings(ALLOWED_HOSTS=["testserver"]):
+            start = time.perf_counter()
+            asyncio.run(main())
+        elapsed = time.perf_counter() - start
+        connections.close_all()
+        return timings, errors, elapsed
+
+    def report(self, name, timings, errors, elapsed):
+        if not timings:
+            self.stdout.write(f"{name:>13}: no requests completed")
+            return
+
+        timings = sorted(t * 1000 for t in timings)
+        p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+        self.stdout.write(
+            f"{name:>13}: {len(timings) / elapsed:8.1f} req/s, "
+            f"p50 {statistics.median(timings):.1f}ms, p99 {p99:.1f}ms, "
+            f"{len(errors)} errors"
+        )
@@ -0,0 +1,50 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog import related
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the related articles of every article, or with "
+        "--pending only the lists affected by articles saved or deleted "
+        "since the last run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "-k", type=int, default=settings.BLOG_RELATED_ARTICLES
+        )
+        parser.add_argument(
+            "--pending",
+            action="store_true",
+            help="Only refresh the lists of queued articles.",
+        )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        if options["pending"]:
+            queued = related.update_pending(options["k"])
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Refreshed the related articles of {queued} queued "
+                    f"articles in {time.perf_counter() - start:.2f}s"
+                )
+            )
+            return
+
+        # A full build covers whatever was queued before the corpus loads
+        related.take_pending()
+        corpus = related.Corpus.load()
+        loaded = time.perf_counter()
+        total = related.build(options["k"], corpus=corpus)
+        done = time.perf_counter()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Stored {total} links for {len(corpus.vectors)} articles "
+                f"(load {loaded - start:.2f}s, rank {done - loaded:.2f}s)"
+            )
+        )
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from blog import thumbnails
+from blog.models import Article
+
+
+class Command(BaseCommand):
+    help = "Generate the resized variants of article thumbnails."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Regenerate variants that already exist too.",
+        )
+
+    def handle(self, *args, **options):
+        articles = Article.objects.exclude(thumbnail="").exclude(
+            thumbnail__isnull=True
+        )
+        if not options["all"]:
+            articles = articles.filter(thumbnail_widths=[])
+
+        total = 0
+        for pk in articles.values_list("pk", flat=True).iterator():
+            if thumbnails.generate(pk):
+                total += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Generated variants for {total} articles")
+        )
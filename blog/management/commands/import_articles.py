@@ -0,0 +1,145 @@
+import json
+import sys
+import time
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+
+from blog import search
+from blog.cache import ARTICLES, author_scope, bump_versions
+from blog.models import Article, Category
+
+
+class Command(BaseCommand):
+    help = (
+        "Import articles from JSONL, as written by export_articles, in "
+        "fixed-size batches of bulk inserts. Rows whose topic already "
+        "exists or whose author is unknown are skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help='JSONL file, "-" for stdin.')
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--author", help="Email of the author of rows without one."
+        )
+
+    def handle(self, *args, **options):
+        path, batch_size = options["path"], options["batch_size"]
+        self.default_author = options["author"]
+        self.backend = search.get_backend()
+        self.authors = set()
+
+        start, imported, skipped = time.perf_counter(), 0, 0
+        stream = sys.stdin if path == "-" else open(path, encoding="utf-8")
+        try:
+            lines = enumerate(stream, start=1)
+            while batch := list(islice(lines, batch_size)):
+                created, ignored = self.import_batch(batch)
+                imported += created
+                skipped += ignored
+                if options["verbosity"] > 1:
+                    self.report(imported, skipped, start)
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        if imported:
+            # bulk_create sends no signals, drop the cached pages here
+            bump_versions(
+                ARTICLES,
+                *(author_scope(author_id) for author_id in self.authors),
+            )
+        self.report(imported, skipped, start, style=self.style.SUCCESS)
+        if imported:
+            self.stdout.write(
+                "Run build_related_articles to include them in the related "
+                "articles."
+            )
+
+    def report(self, imported, skipped, start, style=str):
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            style(
+                f"Imported {imported} articles in {elapsed:.2f}s "
+                f"({imported / (elapsed or 1):.0f} rows/s), "
+                f"skipped {skipped}"
+            )
+        )
+
+    def parse(self, batch):
+        rows = []
+        for number, line in batch:
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as error:
+                raise CommandError(f"Line {number}: {error}")
+            if not row.get("topic") or not row.get("category"):
+                raise CommandError(f"Line {number}: topic and category needed")
+            row.setdefault("author", self.default_author)
+            rows.append(row)
+        return rows
+
+    def import_batch(self, batch):
+        """Insert the articles of ``batch``; return (created, skipped)."""
+        rows = self.parse(batch)
+        authors = dict(
+            get_user_model()
+            .objects.filter(email__in={row["author"] for row in rows})
+            .values_list("email", "pk")
+        )
+        categories = self.categories({row["category"] for row in rows})
+        existing = set(
+            Article.objects.filter(
+                topic__in=[row["topic"] for row in rows]
+            ).values_list("topic", flat=True)
+        )
+
+        articles = []
+        for row in rows:
+            if row["topic"] in existing or row["author"] not in authors:
+                continue
+            existing.add(row["topic"])
+            articles.append(
+                Article(
+                    author_id=authors[row["author"]],
+                    category_id=categories[row["category"]],
+                    topic=row["topic"],
+                    slug=row.get("slug"),
+                    body=row.get("body", ""),
+                    posted=row.get("posted", False),
+                    created_on=parse_datetime(row.get("created_on") or ""),
+                    updated_on=parse_datetime(row.get("updated_on") or ""),
+                    views=row.get("views", 0),
+                    thumbnail=row.get("thumbnail") or None,
+                    thumbnail_widths=row.get("thumbnail_widths", []),
+                )
+            )
+
+        # Counts categories and assigns slugs once for the whole batch
+        articles = Article.objects.bulk_create(articles)
+        self.backend.index_many(articles)
+        self.authors.update(article.author_id for article in articles)
+        return len(articles), len(rows) - len(articles)
+
+    def categories(self, names):
+        """Map ``names`` to category ids, creating the missing ones."""
+        categories = dict(
+            Category.objects.filter(name__in=names).values_list("name", "pk")
+        )
+        missing = names - categories.keys()
+        if missing:
+            Category.objects.bulk_create(
+                [Category(name=name) for name in missing],
+                ignore_conflicts=True,
+            )
+            categories.update(
+                Category.objects.filter(name__in=missing).values_list(
+                    "name", "pk"
+                )
+            )
+        return categories
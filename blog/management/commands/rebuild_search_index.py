@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog import search
+from blog.models import Article
+
+
+class Command(BaseCommand):
+    help = "Rebuild the article full-text search index from scratch."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        articles = Article.published.only("topic", "body").iterator(
+            chunk_size=batch_size
+        )
+
+        start = time.perf_counter()
+        total = search.get_backend().rebuild(articles, batch_size=batch_size)
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Indexed {total or 0} articles in {elapsed:.2f}s"
+            )
+        )
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Category
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute Category.total_post and Category.published_post from "
+        "the articles table."
+    )
+
+    def handle(self, *args, **options):
+        rows = Category.objects.recount()
+        self.stdout.write(self.style.SUCCESS(f"Recounted {rows} categories"))
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from blog.cache import ARTICLES, CATEGORIES, article_scope, bump_versions
+from blog.models import Article
+
+
+class Command(BaseCommand):
+    help = (
+        "Render body_html and excerpt_html again for every article, e.g. "
+        "after the sanitizer allowlist changed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        articles, rendered = [], 0
+        queryset = Article.objects.only("body", "slug").order_by("pk")
+        for article in queryset.iterator(chunk_size=batch_size):
+            article.render_body()
+            articles.append(article)
+            if len(articles) == batch_size:
+                rendered += self.write(articles)
+        rendered += self.write(articles)
+        self.stdout.write(self.style.SUCCESS(f"Rendered {rendered} articles"))
+
+    def write(self, articles):
+        # bulk_update sends no signals, invalidate the cached pages here
+        Article.objects.bulk_update(articles, Article.RENDERED_FIELDS)
+        bump_versions(
+            ARTICLES,
+            CATEGORIES,
+            *(article_scope(article.slug) for article in articles),
+        )
+        count = len(articles)
+        articles.clear()
+        return count
@@ -0,0 +1,33 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog import trending
+
+
+class Command(BaseCommand):
+    help = (
+        "Compact the hourly view buckets and recompute the trending "
+        "articles leaderboards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--size", type=int, default=settings.BLOG_TRENDING_SIZE
+        )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        removed = trending.compact()
+        compacted = time.perf_counter()
+        ranked = trending.update(options["size"])
+        done = time.perf_counter()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Ranked {ranked} articles, removed {removed} buckets "
+                f"(compact {compacted - start:.2f}s, "
+                f"rank {done - compacted:.2f}s)"
+            )
+        )
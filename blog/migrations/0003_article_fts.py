@@ -0,0 +1,32 @@
+from django.db import migrations
+
+from blog.search import FTS_TABLE, SQLiteFTSBackend
+
+
+def create_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+        "topic, body, tokenize = 'porter unicode61')"
+    )
+    Article = apps.get_model("blog", "Article")
+    articles = Article.objects.only("topic", "body").iterator(chunk_size=1000)
+    SQLiteFTSBackend().rebuild(articles)
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0002_alter_article_slug'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
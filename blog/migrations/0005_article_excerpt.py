@@ -0,0 +1,33 @@
+# Generated by Django 5.0 on 2026-10-18 08:21
+
+from html import unescape
+
+from django.db import migrations, models
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+
+def fill_excerpts(apps, schema_editor):
+    Article = apps.get_model("blog", "Article")
+    articles = []
+    for article in Article.objects.only("body").iterator(chunk_size=1000):
+        text = " ".join(unescape(strip_tags(article.body or "")).split())
+        article.excerpt = Truncator(text).chars(150)
+        articles.append(article)
+    Article.objects.bulk_update(articles, ["excerpt"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_article_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='excerpt',
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.RunPython(fill_excerpts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-18 08:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_relatedarticle'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='thumbnail_widths',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+    ]
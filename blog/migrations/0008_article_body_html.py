@@ -0,0 +1,37 @@
+# Generated by Django 5.0 on 2026-10-18 14:05
+
+from django.db import migrations, models
+
+from blog.sanitizer import sanitize
+
+
+def render_bodies(apps, schema_editor):
+    Article = apps.get_model("blog", "Article")
+    articles = []
+    for article in Article.objects.only("body").iterator(chunk_size=1000):
+        article.body_html, article.excerpt_html = sanitize(article.body, 150)
+        articles.append(article)
+    Article.objects.bulk_update(
+        articles, ["body_html", "excerpt_html"], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0007_article_thumbnail_widths'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='body_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='excerpt_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.RunPython(render_bodies, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.0 on 2026-10-18 08:43
+
+from django.conf import settings
+from django.db import migrations, models
+
+from blog.highlighting import highlight
+
+
+def highlight_bodies(apps, schema_editor):
+    if not settings.BLOG_HIGHLIGHT_CODE:
+        return
+    Article = apps.get_model("blog", "Article")
+    articles = []
+    queryset = Article.objects.filter(body_html__contains="<pre").only(
+        "body_html"
+    )
+    for article in queryset.iterator(chunk_size=1000):
+        article.body_html = highlight(article.body_html, store=False)
+        articles.append(article)
+    Article.objects.bulk_update(articles, ["body_html"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_article_body_html'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HighlightedCode',
+            fields=[
+                ('digest', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('language', models.CharField(blank=True, max_length=50)),
+                ('html', models.TextField()),
+            ],
+        ),
+        migrations.RunPython(highlight_bodies, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0 on 2026-10-18 08:44
+
+import blog.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0009_highlightedcode'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='article',
+            name='slug',
+            field=blog.fields.BulkAutoSlugField(always_update=True, blank=True, default=None, editable=False, null=True, populate_from='topic', unique_with=['author']),
+        ),
+    ]
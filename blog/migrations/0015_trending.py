@@ -0,0 +1,44 @@
+# Generated by Django 5.0 on 2026-10-18 09:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0014_article_published_category_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrendingArticle',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('score', models.FloatField()),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='blog.article')),
+                ('category', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='blog.category')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArticleViewBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField()),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='view_buckets', to='blog.article')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['hour'], name='view_bucket_hour_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='articleviewbucket',
+            constraint=models.UniqueConstraint(fields=('article', 'hour'), name='unique_view_bucket'),
+        ),
+        migrations.AddIndex(
+            model_name='trendingarticle',
+            index=models.Index(fields=['category', 'rank'], name='trending_category_rank_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0 on 2026-10-18 09:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0015_trending'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingRelatedUpdate',
+            fields=[
+                ('article_id', models.BigIntegerField(primary_key=True, serialize=False)),
+            ],
+        ),
+    ]
@@ -0,0 +1,19 @@
+from django.db import migrations
+
+
+def forget_variants(apps, schema_editor):
+    # Variants moved to new names, the originals are served until
+    # generate_thumbnails creates them again
+    Article = apps.get_model("blog", "Article")
+    Article.objects.exclude(thumbnail_widths=[]).update(thumbnail_widths=[])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0016_pendingrelatedupdate'),
+    ]
+
+    operations = [
+        migrations.RunPython(forget_variants, migrations.RunPython.noop),
+    ]
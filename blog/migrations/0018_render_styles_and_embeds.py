@@ -0,0 +1,35 @@
+from html import unescape
+
+from django.conf import settings
+from django.db import migrations
+from django.utils.html import strip_tags
+
+from blog.highlighting import highlight
+from blog.sanitizer import sanitize
+
+
+def render_bodies(apps, schema_editor):
+    # Restores the alignment, colours, media and anchors dropped by 0008
+    Article = apps.get_model("blog", "Article")
+    articles = []
+    for article in Article.objects.only("body").iterator(chunk_size=1000):
+        body_html, article.excerpt_html = sanitize(article.body, 150)
+        article.excerpt = unescape(strip_tags(article.excerpt_html))
+        if settings.BLOG_HIGHLIGHT_CODE:
+            body_html = highlight(body_html, store=False)
+        article.body_html = body_html
+        articles.append(article)
+    Article.objects.bulk_update(
+        articles, ["body_html", "excerpt_html", "excerpt"], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0017_thumbnail_variant_names'),
+    ]
+
+    operations = [
+        migrations.RunPython(render_bodies, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.0 on 2026-10-18 09:32
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_published(apps, schema_editor):
+    Article = apps.get_model("blog", "Article")
+    Category = apps.get_model("blog", "Category")
+    published = (
+        Article.objects.filter(category=OuterRef("pk"), posted=True)
+        .order_by()
+        .values("category")
+        .annotate(n=Count("pk"))
+        .values("n")
+    )
+    Category.objects.update(published_post=Coalesce(Subquery(published), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0018_render_styles_and_embeds'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='published_post',
+            field=models.IntegerField(default=0, verbose_name='published posts'),
+        ),
+        migrations.RunPython(count_published, migrations.RunPython.noop),
+    ]
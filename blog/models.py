@@ -1,23 +1,299 @@
-from autoslug import AutoSlugField
+from collections import Counter
+from html import unescape
+
+from autoslug import utils as autoslug_utils
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.validators import FileExtensionValidator
-from django.db import models
+from django.db import models, transaction
+from django.db.models import DEFERRED, Count, F, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
 from django.urls import reverse
 from django.utils import timezone
+from django.utils.html import strip_tags
 from tinymce import models as tm
 
+from blog import highlighting, sanitizer, slugs, thumbnails
+from blog.cache import CATEGORIES, bump_versions
+from blog.fields import BulkAutoSlugField
+
 User = get_user_model()
 
 
+class CategoryQuerySet(models.QuerySet):
+    def adjust_totals(self, deltas, published=None):
+        """
+        Atomically add ``{category_id: delta}`` to ``total_post``, and the
+        ``published`` ones to ``published_post``.
+        """
+        published = published or {}
+        by_delta = {}
+        for category_id in deltas.keys() | published.keys():
+            delta = (deltas.get(category_id, 0), published.get(category_id, 0))
+            if any(delta):
+                by_delta.setdefault(delta, []).append(category_id)
+
+        for (total, posted), ids in by_delta.items():
+            self.filter(pk__in=ids).update(
+                total_post=F("total_post") + total,
+                published_post=F("published_post") + posted,
+            )
+        if by_delta:
+            bump_versions(CATEGORIES)
+
+    def move_totals(self, moves):
+        """
+        Count ``(category_id, posted, new_category_id, new_posted, n)``
+        moves of ``n`` articles; None categories for created or deleted
+        ones.
+        """
+        totals, published = Counter(), Counter()
+        for old, was_posted, new, is_posted, n in moves:
+            if old is not None:
+                totals[old] -= n
+                published[old] -= n * was_posted
+            if new is not None:
+                totals[new] += n
+                published[new] += n * is_posted
+        self.adjust_totals(totals, published)
+
+    def recount(self):
+        """
+        Recompute ``total_post`` and ``published_post`` in a single UPDATE;
+        return the rows.
+        """
+        articles = (
+            Article.objects.filter(category=OuterRef("pk"))
+            .order_by()
+            .values("category")
+        )
+        rows = self.update(
+            total_post=Coalesce(
+                Subquery(articles.annotate(n=Count("pk")).values("n")), 0
+            ),
+            published_post=Coalesce(
+                Subquery(
+                    articles.filter(posted=True)
+                    .annotate(n=Count("pk"))
+                    .values("n")
+                ),
+                0,
+            ),
+        )
+        bump_versions(CATEGORIES)
+        return rows
+
+
 class Category(models.Model):
     name = models.CharField(max_length=100, unique=True)
     total_post = models.IntegerField(verbose_name="total posts", default=0)
+    # Shown on public pages, which leave drafts out
+    published_post = models.IntegerField(
+        verbose_name="published posts", default=0
+    )
+
+    objects = CategoryQuerySet.as_manager()
 
     def __str__(self):
         return self.name
 
+    def get_absolute_url(self):
+        return reverse("blog:category", kwargs={"pk": self.pk})
+
+
+class ArticleQuerySet(models.QuerySet):
+    def for_listing(self):
+        """
+        Rows for list pages: related objects joined in and the full body
+        left out, templates show the precomputed ``excerpt_html`` instead.
+        """
+        return self.select_related("category", "author").defer(
+            "body", "body_html"
+        )
+
+    def category_stats(self):
+        """
+        One row per category with its article, published and view counts,
+        all computed by a single aggregate query.
+        """
+        return (
+            self.values("category_id", "category__name")
+            .annotate(
+                articles=Count("pk"),
+                published=Count("pk", filter=Q(posted=True)),
+                views=Coalesce(Sum("views"), 0),
+            )
+            .order_by("category__name")
+        )
+
+    def category_totals(self):
+        """``(category_id, posted, n)`` counts of the rows."""
+        return list(
+            self.values_list("category_id", "posted")
+            .annotate(n=Count("pk"))
+            .order_by()
+        )
+
+    def assign_slugs(self, objs):
+        """
+        Give ``objs`` unique slugs, keeping the ones they already have when
+        free, with one query for the whole batch. Bases that clash with an
+        existing slug or repeat within the batch need an index, a second
+        query finds the indexed slugs already taken for all of them.
+        """
+        field = self.model._meta.get_field("slug")
+        sep = field.index_sep
+
+        def crop(slug, tail=""):
+            return slug[: field.max_length - len(tail)] + tail
+
+        bases = []
+        for obj in objs:
+            value = obj.slug or autoslug_utils.get_prepopulated_value(
+                field, obj
+            )
+            base = crop(field.slugify(value or ""))
+            bases.append(base or self.model._meta.model_name)
+
+        articles = self.model._base_manager.using(self.db)
+        taken = set(
+            articles.filter(slug__in=set(bases)).values_list("slug", flat=True)
+        )
+        # Slugs are not unique in the database, so a free base does not
+        # mean its indexed slugs are free too
+        repeated = {base for base, n in Counter(bases).items() if n > 1}
+        indexed = Q()
+        for base in (set(bases) & taken) | repeated:
+            # Cropped enough to also find slugs with up to 6 digit indexes
+            prefix = base[: field.max_length - len(sep) - 6]
+            indexed |= Q(slug__startswith=prefix)
+        if indexed:
+            taken.update(
+                articles.filter(indexed).values_list("slug", flat=True)
+            )
+
+        for obj, base in zip(objs, bases):
+            slug, index = base, 1
+            while slug in taken:
+                index += 1
+                slug = crop(base, f"{sep}{index}")
+            taken.add(slug)
+            obj.slug = slug
+            obj._slug_assigned = True
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        now = timezone.now()
+        for obj in objs:
+            obj.render_body()
+            # Same defaults as Article.save, keeping imported timestamps
+            if obj.created_on is None and obj.posted:
+                obj.created_on = now
+            if obj.created_on and obj.updated_on is None:
+                obj.updated_on = now
+        self.assign_slugs(objs)
+
+        with transaction.atomic(using=self.db):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            for obj in objs:
+                # Later saves generate the slug from the topic again
+                obj._slug_assigned = False
+
+            # Old slugs taken by the new articles stop redirecting
+            new_slugs = [obj.slug for obj in objs]
+            SlugRedirect.objects.using(self.db).filter(
+                old_slug__in=new_slugs
+            ).delete()
+            slugs.forget(*new_slugs)
+            categories = {obj.category_id for obj in objs}
+
+            if kwargs.get("ignore_conflicts") or kwargs.get(
+                "update_conflicts"
+            ):
+                # Which rows were inserted is unknown, count them again
+                Category.objects.filter(pk__in=categories).recount()
+            else:
+                Category.objects.move_totals(
+                    (None, False, obj.category_id, obj.posted, 1)
+                    for obj in objs
+                )
+        return objs
+
+    def update(self, **kwargs):
+        category = kwargs.get("category", kwargs.get("category_id"))
+        posted = kwargs.get("posted")
+        if category is None and posted is None:
+            return super().update(**kwargs)
+
+        values = (category, posted)
+        if any(hasattr(value, "resolve_expression") for value in values):
+            # Where expressions move the rows is only known afterwards
+            with transaction.atomic(using=self.db):
+                rows = super().update(**kwargs)
+                Category.objects.recount()
+            return rows
+
+        category_id = getattr(category, "pk", category)
+        with transaction.atomic(using=self.db):
+            counts = self.category_totals()
+            rows = super().update(**kwargs)
+            Category.objects.move_totals(
+                (
+                    old,
+                    was_posted,
+                    old if category_id is None else category_id,
+                    was_posted if posted is None else bool(posted),
+                    n,
+                )
+                for old, was_posted, n in counts
+            )
+        return rows
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        moved = {"category", "posted"}
+        names = {self.model._meta.get_field(name).name for name in fields}
+        if not names & moved:
+            return super().bulk_update(objs, fields, *args, **kwargs)
+
+        # The first object of a pk is the one whose values are saved
+        objs = list(objs)
+        saved = {}
+        for obj in objs:
+            saved.setdefault(obj.pk, obj)
+        with transaction.atomic(using=self.db):
+            before = self.filter(pk__in=list(saved)).values_list(
+                "pk", "category_id", "posted"
+            )
+            before = {pk: values for pk, *values in before}
+            # A plain queryset, so that update() doesn't count them again
+            rows = models.QuerySet(
+                self.model, query=self.query.chain(), using=self._db
+            ).bulk_update(objs, fields, *args, **kwargs)
+            Category.objects.move_totals(
+                (
+                    *before[pk],
+                    obj.category_id if "category" in names else before[pk][0],
+                    obj.posted if "posted" in names else before[pk][1],
+                    1,
+                )
+                for pk, obj in saved.items()
+                if pk in before
+            )
+        return rows
+
+
+class PublishedManager(models.Manager.from_queryset(ArticleQuerySet)):
+    """Articles visible to the public."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(posted=True)
+
 
 class Article(models.Model):
+    EXCERPT_LENGTH = 150
+    # Columns rendered from body when it's saved
+    RENDERED_FIELDS = ("excerpt", "body_html", "excerpt_html")
+
     author = models.ForeignKey(to=User, on_delete=models.CASCADE, blank=True)
     category = models.ForeignKey(to=Category, on_delete=models.CASCADE)
     topic = models.CharField(max_length=255, unique=True)
@@ -31,7 +307,7 @@ class Article(models.Model):
             FileExtensionValidator(allowed_extensions=["png", "jpg", "jpeg"]),
         ],
     )
-    slug = AutoSlugField(
+    slug = BulkAutoSlugField(
         populate_from="topic",
         blank=True,
         null=True,
@@ -43,29 +319,243 @@ class Article(models.Model):
     created_on = models.DateTimeField(null=True, blank=True)
     updated_on = models.DateTimeField(null=True, blank=True)
     views = models.IntegerField(default=0)
+    excerpt = models.CharField(max_length=255, blank=True, editable=False)
+    body_html = models.TextField(blank=True, editable=False)
+    excerpt_html = models.TextField(blank=True, editable=False)
+    thumbnail_widths = models.JSONField(
+        default=list, blank=True, editable=False
+    )
+
+    objects = ArticleQuerySet.as_manager()
+    published = PublishedManager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["-created_on", "-id"], name="article_created_idx"
+            ),
+            models.Index(
+                fields=["author", "slug"], name="article_author_slug_idx"
+            ),
+            models.Index(
+                fields=["author", "-created_on", "-id"],
+                name="article_author_created_idx",
+            ),
+            # Public listings only read published rows, drafts stay out
+            models.Index(
+                fields=["-created_on", "-id"],
+                name="article_published_idx",
+                condition=Q(posted=True),
+            ),
+            models.Index(
+                fields=["category", "-created_on", "-id"],
+                name="article_published_category_idx",
+                condition=Q(posted=True),
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember what was loaded so signal handlers can see what changed
+        instance._loaded_values = {
+            name: value
+            for name, value in zip(field_names, values)
+            if value is not DEFERRED
+        }
+        return instance
 
     def thumbnail_url(self):
         if self.thumbnail:
+            if self.thumbnail_widths:
+                width = self.thumbnail_default_width()
+                return self.thumbnail_variant_url(width)
             return self.thumbnail.url
         else:
             url = "#"
             return url
 
+    def thumbnail_default_width(self):
+        """Smallest variant at least as wide as the page, else the widest."""
+        widths = self.thumbnail_widths
+        wide_enough = [
+            w for w in widths if w >= settings.BLOG_THUMBNAIL_DEFAULT_WIDTH
+        ]
+        return min(wide_enough) if wide_enough else max(widths)
+
+    def thumbnail_variant_url(self, width, extension="jpeg"):
+        name = thumbnails.variant_name(self.thumbnail.name, width, extension)
+        return self.thumbnail.storage.url(name)
+
+    def thumbnail_srcset(self, extension="jpeg"):
+        return ", ".join(
+            f"{self.thumbnail_variant_url(width, extension)} {width}w"
+            for width in self.thumbnail_widths
+        )
+
+    def thumbnail_webp_srcset(self):
+        return self.thumbnail_srcset("webp")
+
+    def thumbnail_changed(self):
+        loaded = getattr(self, "_loaded_values", {})
+        return loaded.get("thumbnail", "") != (self.thumbnail.name or "")
+
+    def render_body(self):
+        """Fill the columns derived from ``body``."""
+        body_html, self.excerpt_html = sanitizer.sanitize(
+            self.body, self.EXCERPT_LENGTH
+        )
+        # Plain text of the already truncated excerpt, cheaper than the body
+        self.excerpt = unescape(strip_tags(self.excerpt_html))
+        if settings.BLOG_HIGHLIGHT_CODE:
+            body_html = highlighting.highlight(body_html)
+        self.body_html = body_html
+
     def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "body" in update_fields:
+            self.render_body()
+            if update_fields is not None:
+                kwargs["update_fields"] = {
+                    *update_fields,
+                    *self.RENDERED_FIELDS,
+                }
+
+        if self.thumbnail_changed():
+            self._replaced_widths = []
+            if self.pk is not None:
+                # This copy may predate the variants, the row knows them
+                self._replaced_widths = (
+                    Article.objects.filter(pk=self.pk)
+                    .values_list("thumbnail_widths", flat=True)
+                    .first()
+                ) or []
+            # Variants of the previous image don't match the new one
+            self.thumbnail_widths = []
+
         if self.created_on is None and self.posted:
             self.created_on = timezone.now()
 
         if self.created_on:
             self.updated_on = timezone.now()
 
-        if not self.pk and self.category is not None:
-            self.category.total_post += 1
-            self.category.save()
-
-        return super().save(*args, **kwargs)
+        super().save(*args, **kwargs)
+        self._loaded_values = {
+            field.attname: field.get_prep_value(getattr(self, field.attname))
+            for field in self._meta.concrete_fields
+            if field.attname not in self.get_deferred_fields()
+        }
 
     def __str__(self):
         return self.topic
 
     def get_absolute_url(self):
         return reverse("blog:article_details", kwargs={"slug": self.slug})
+
+
+class RelatedArticle(models.Model):
+    """Precomputed neighbours of an article, see blog/related.py"""
+
+    article = models.ForeignKey(
+        to=Article, on_delete=models.CASCADE, related_name="related_links"
+    )
+    related = models.ForeignKey(
+        to=Article, on_delete=models.CASCADE, related_name="related_to"
+    )
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["article", "rank"], name="unique_related_rank"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.article_id} -> {self.related_id}"
+
+
+class PendingRelatedUpdate(models.Model):
+    """
+    Article saved or deleted since its related articles were refreshed,
+    see blog/related.py. Not a foreign key, deleted articles stay queued.
+    """
+
+    article_id = models.BigIntegerField(primary_key=True)
+
+    def __str__(self):
+        return str(self.article_id)
+
+
+class SlugRedirect(models.Model):
+    """Slug an article had before a rename, redirected to the article."""
+
+    old_slug = models.CharField(max_length=50, unique=True)
+    article = models.ForeignKey(
+        to=Article, on_delete=models.CASCADE, related_name="old_slugs"
+    )
+
+    def __str__(self):
+        return self.old_slug
+
+
+class HighlightedCode(models.Model):
+    """Code sample rendered by blog/highlighting.py, keyed by its hash."""
+
+    digest = models.CharField(max_length=64, primary_key=True)
+    language = models.CharField(max_length=50, blank=True)
+    html = models.TextField()
+
+    def __str__(self):
+        return f"{self.language or 'guessed'} {self.digest[:12]}"
+
+
+class ArticleViewBucket(models.Model):
+    """
+    Views of an article during the hour starting at ``hour``, or during
+    the whole day once compacted, see blog/trending.py.
+    """
+
+    article = models.ForeignKey(
+        to=Article, on_delete=models.CASCADE, related_name="view_buckets"
+    )
+    hour = models.DateTimeField()
+    views = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["article", "hour"], name="unique_view_bucket"
+            ),
+        ]
+        indexes = [models.Index(fields=["hour"], name="view_bucket_hour_idx")]
+
+    def __str__(self):
+        return f"{self.article_id} @ {self.hour:%Y-%m-%d %H:00}"
+
+
+class TrendingArticle(models.Model):
+    """
+    Leaderboard entry computed by blog/trending.py, site-wide when
+    ``category`` is null.
+    """
+
+    category = models.ForeignKey(
+        to=Category, on_delete=models.CASCADE, null=True, related_name="+"
+    )
+    article = models.ForeignKey(
+        to=Article, on_delete=models.CASCADE, related_name="+"
+    )
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["category", "rank"], name="trending_category_rank_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.category_id or 'site'} #{self.rank}: {self.article_id}"
@@ -0,0 +1,152 @@
+from datetime import datetime
+
+from django.db.models import F, Q
+from django.utils.encoding import force_str
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
+
+
+def encode_cursor(value, pk):
+    value = value.isoformat() if value is not None else ""
+    return urlsafe_base64_encode(f"{value}|{pk}".encode())
+
+
+def decode_cursor(cursor):
+    """Return the ``(value, pk)`` pair of a cursor, or None if malformed."""
+    try:
+        value, pk = force_str(urlsafe_base64_decode(cursor)).split("|")
+        return (datetime.fromisoformat(value) if value else None), int(pk)
+    except (TypeError, ValueError):
+        return None
+
+
+class KeysetPage:
+    def __init__(self, object_list, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+
+class KeysetPaginator:
+    """
+    Paginate a queryset newest first on ``(field, pk)`` using opaque
+    cursors instead of offsets, so every page costs one indexed range scan
+    no matter how deep it is. Rows whose ``field`` is null sort last, and
+    are read by a query of their own when a page reaches them.
+    """
+
+    def __init__(self, queryset, per_page, field="created_on"):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.field = field
+
+    def ordering(self, reverse=False):
+        if reverse:
+            return F(self.field).asc(nulls_first=True), "pk"
+        return F(self.field).desc(nulls_last=True), "-pk"
+
+    def after(self, value, pk):
+        if value is None:
+            return Q(**{f"{self.field}__isnull": True, "pk__lt": pk})
+        # The outer bound is what lets the database seek into the index
+        return Q(**{f"{self.field}__lte": value}) & (
+            Q(**{f"{self.field}__lt": value}) | Q(pk__lt=pk)
+        )
+
+    def before(self, value, pk):
+        if value is None:
+            return Q(**{f"{self.field}__isnull": True, "pk__gt": pk})
+        return Q(**{f"{self.field}__gte": value}) & (
+            Q(**{f"{self.field}__gt": value}) | Q(pk__gt=pk)
+        )
+
+    def cursor(self, obj):
+        return encode_cursor(getattr(obj, self.field), obj.pk)
+
+    def query(self, after=None, before=None):
+        """
+        Return the queryset fetching a page plus one row, and whether it
+        walks backwards from ``before``. The rows on the other side of the
+        null ``field`` boundary are left to ``tail``.
+        """
+        after = decode_cursor(after) if after else None
+        before = decode_cursor(before) if before else None
+
+        if before is not None:
+            rows = self.queryset.filter(self.before(*before))
+            rows = rows.order_by(*self.ordering(reverse=True))
+            return rows[: self.per_page + 1], True, False
+
+        rows = self.queryset
+        if after is not None:
+            rows = rows.filter(self.after(*after))
+        rows = rows.order_by(*self.ordering())
+        return rows[: self.per_page + 1], False, after is not None
+
+    def tail(self, after=None, before=None):
+        """
+        Return the queryset continuing ``query`` across the null ``field``
+        boundary, or None when it doesn't reach it.
+        """
+        after = decode_cursor(after) if after else None
+        before = decode_cursor(before) if before else None
+
+        if before is not None:
+            if before[0] is not None:
+                return None
+            rows = self.queryset.filter(**{f"{self.field}__isnull": False})
+            return rows.order_by(*self.ordering(reverse=True))
+        if after is None or after[0] is None:
+            return None
+        rows = self.queryset.filter(**{f"{self.field}__isnull": True})
+        return rows.order_by("-pk")
+
+    def make_page(self, rows, backwards, has_previous):
+        if backwards:
+            has_previous = len(rows) > self.per_page
+            rows = rows[: self.per_page][::-1]
+            has_next = True
+        else:
+            has_next = len(rows) > self.per_page
+            rows = rows[: self.per_page]
+
+        if not rows:
+            return KeysetPage([], None, None)
+
+        return KeysetPage(
+            rows,
+            self.cursor(rows[-1]) if has_next else None,
+            self.cursor(rows[0]) if has_previous else None,
+        )
+
+    def page(self, after=None, before=None):
+        """Return the page following ``after`` or preceding ``before``."""
+        rows, backwards, has_previous = self.query(after, before)
+        rows = list(rows)
+        missing = self.per_page + 1 - len(rows)
+        if missing > 0:
+            tail = self.tail(after, before)
+            if tail is not None:
+                rows.extend(tail[:missing])
+        return self.make_page(rows, backwards, has_previous)
+
+    async def apage(self, after=None, before=None):
+        rows, backwards, has_previous = self.query(after, before)
+        rows = [row async for row in rows]
+        missing = self.per_page + 1 - len(rows)
+        if missing > 0:
+            tail = self.tail(after, before)
+            if tail is not None:
+                rows.extend([row async for row in tail[:missing]])
+        return self.make_page(rows, backwards, has_previous)
@@ -0,0 +1,214 @@
+"""
+Related articles ranked by TF-IDF cosine similarity of their text, with a
+bonus for sharing a category.
+
+Vectors are sparse dicts and scoring walks an inverted index, so an
+article is only compared with the articles it shares a term with.
+
+Saving or deleting an article only queues it in PendingRelatedUpdate;
+``update_pending``, run by ``build_related_articles --pending``, loads
+the corpus once and refreshes the lists affected by the whole queue.
+"""
+import heapq
+import math
+import re
+from collections import Counter, defaultdict
+from html import unescape
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Min
+from django.utils.html import strip_tags
+
+from blog.cache import ARTICLES, bump_versions
+
+TOKEN_RE = re.compile(r"[^\W\d_]{3,}")
+STOP_WORDS = frozenset(
+    "the and for are but not you all any can had her was one our out has "
+    "him his how its may new now see two who did get let say she too use "
+    "that with have this will your from they been were said each which "
+    "their there what about would these other into more some than then "
+    "them could when only also just like over such very".split()
+)
+
+
+def tokenize(text):
+    return [
+        token
+        for token in TOKEN_RE.findall(text.lower())
+        if token not in STOP_WORDS
+    ]
+
+
+def term_counts(topic, body):
+    """Term frequencies of an article, topic terms weigh more."""
+    counts = Counter(tokenize(unescape(strip_tags(body or ""))))
+    for token in tokenize(topic or ""):
+        counts[token] += settings.BLOG_RELATED_TOPIC_WEIGHT
+    return counts
+
+
+class Corpus:
+    def __init__(self, documents):
+        """``documents`` yields ``(id, (category_id, term_counts))`` pairs"""
+        documents = dict(documents)
+        self.categories = {
+            pk: category for pk, (category, _) in documents.items()
+        }
+        self.members = defaultdict(list)
+        for pk, category in self.categories.items():
+            self.members[category].append(pk)
+
+        df = Counter()
+        for _, counts in documents.values():
+            df.update(counts.keys())
+
+        total = len(documents)
+        # Terms found in most articles relate everything to everything
+        max_df = max(2, total * settings.BLOG_RELATED_MAX_DF)
+        idf = {
+            term: math.log((1 + total) / (1 + n)) + 1
+            for term, n in df.items()
+            if n <= max_df
+        }
+
+        self.vectors = {}
+        self.postings = defaultdict(list)
+        for pk, (_, counts) in documents.items():
+            vector = {
+                term: (1 + math.log(n)) * idf[term]
+                for term, n in counts.items()
+                if term in idf
+            }
+            norm = math.sqrt(sum(w * w for w in vector.values())) or 1.0
+            vector = {term: w / norm for term, w in vector.items()}
+            self.vectors[pk] = vector
+            for term, weight in vector.items():
+                self.postings[term].append((pk, weight))
+
+    @classmethod
+    def load(cls):
+        from blog.models import Article
+
+        articles = Article.published.only("topic", "body", "category_id")
+        return cls(
+            (a.pk, (a.category_id, term_counts(a.topic, a.body)))
+            for a in articles.iterator(chunk_size=1000)
+        )
+
+    def scores(self, pk):
+        """Similarity of ``pk`` to every article sharing a term with it."""
+        scores = defaultdict(float)
+        for term, weight in self.vectors.get(pk, {}).items():
+            for other, other_weight in self.postings[term]:
+                scores[other] += weight * other_weight
+        scores.pop(pk, None)
+
+        category = self.categories.get(pk)
+        boost = settings.BLOG_RELATED_CATEGORY_BOOST
+        for other in scores:
+            if self.categories[other] == category:
+                scores[other] += boost
+        return scores
+
+    def neighbours(self, pk, k):
+        """The ``k`` best ``(score, id)`` pairs for ``pk``, best first."""
+        scores = self.scores(pk)
+        top = heapq.nlargest(k, ((s, o) for o, s in scores.items()))
+        if len(top) < k:
+            # Top up with unrelated articles from the same category
+            chosen = {o for _, o in top} | {pk}
+            for other in self.members[self.categories.get(pk)]:
+                if len(top) == k:
+                    break
+                if other not in chosen:
+                    top.append((settings.BLOG_RELATED_CATEGORY_BOOST, other))
+        return top
+
+
+def _write(pks, corpus, k):
+    """Replace the related articles of ``pks``, or of all when None."""
+    from blog.models import RelatedArticle
+
+    links = [
+        RelatedArticle(article_id=pk, related_id=other, rank=rank, score=s)
+        for pk in (corpus.vectors if pks is None else pks)
+        for rank, (s, other) in enumerate(corpus.neighbours(pk, k))
+    ]
+
+    stale = RelatedArticle.objects.all()
+    if pks is not None:
+        stale = stale.filter(article_id__in=pks)
+
+    with transaction.atomic():
+        stale.delete()
+        RelatedArticle.objects.bulk_create(links, batch_size=1000)
+    bump_versions(ARTICLES)
+    return len(links)
+
+
+def build(k=None, corpus=None):
+    """Recompute the related articles of every article."""
+    k = k or settings.BLOG_RELATED_ARTICLES
+    return _write(None, corpus or Corpus.load(), k)
+
+
+def update(pks, k=None, corpus=None):
+    """
+    Refresh the related articles after ``pks`` were saved or deleted:
+    their own lists, and the lists they entered or left.
+    """
+    from blog.models import RelatedArticle
+
+    k = k or settings.BLOG_RELATED_ARTICLES
+    corpus = corpus or Corpus.load()
+
+    current = {
+        row["article_id"]: row
+        for row in RelatedArticle.objects.values("article_id").annotate(
+            lowest=Min("score"), total=Count("id")
+        )
+    }
+    # Lists that held a deleted article lost a row, so are short now
+    affected = {
+        other for other, row in current.items() if row["total"] < k
+    }
+    affected.update(
+        RelatedArticle.objects.filter(related_id__in=pks).values_list(
+            "article_id", flat=True
+        )
+    )
+
+    for pk in pks:
+        if pk not in corpus.vectors:
+            continue
+        affected.add(pk)
+        for other, score in corpus.scores(pk).items():
+            row = current.get(other)
+            if row is None or row["total"] < k or score > row["lowest"]:
+                affected.add(other)
+
+    return _write(affected & corpus.vectors.keys(), corpus, k)
+
+
+def take_pending():
+    """Remove and return the ids of the queued articles."""
+    from blog.models import PendingRelatedUpdate
+
+    with transaction.atomic():
+        pending = PendingRelatedUpdate.objects.select_for_update()
+        pks = set(pending.values_list("article_id", flat=True))
+        pending.filter(article_id__in=pks).delete()
+    return pks
+
+
+def update_pending(k=None, corpus=None):
+    """
+    Refresh the lists affected by the queued articles; return how many
+    articles were queued.
+    """
+    # Taken first, articles saved meanwhile are queued for the next run
+    pks = take_pending()
+    if pks:
+        update(pks, k, corpus)
+    return len(pks)
@@ -0,0 +1,353 @@
+"""
+Allowlist sanitizer for article bodies, run once when an article is saved.
+
+TinyMCE output is parsed with the standard library's HTMLParser and
+re-serialized: tags and attributes outside the allowlist are dropped,
+script-like elements lose their content, URLs are limited to safe schemes
+and every element is closed. Inline styles keep the alignment and colours
+TinyMCE sets, and iframes are kept for the hosts in BLOG_EMBED_HOSTS only.
+The same pass records a tag-balanced excerpt that keeps inline formatting
+only, so list pages can show it inside a ``<p>``.
+"""
+import re
+from html import escape
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+from django.conf import settings
+
+ALLOWED_TAGS = {
+    "a",
+    "abbr",
+    "audio",
+    "b",
+    "blockquote",
+    "br",
+    "caption",
+    "code",
+    "del",
+    "div",
+    "em",
+    "figcaption",
+    "figure",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "hr",
+    "i",
+    "iframe",
+    "img",
+    "ins",
+    "kbd",
+    "li",
+    "mark",
+    "ol",
+    "p",
+    "pre",
+    "s",
+    "small",
+    "source",
+    "span",
+    "strong",
+    "sub",
+    "sup",
+    "table",
+    "tbody",
+    "td",
+    "tfoot",
+    "th",
+    "thead",
+    "tr",
+    "u",
+    "ul",
+    "video",
+}
+VOID_TAGS = {"br", "hr", "img", "source"}
+# Formatting kept in excerpts, everything else becomes a word break
+INLINE_TAGS = {
+    "a",
+    "abbr",
+    "b",
+    "code",
+    "del",
+    "em",
+    "i",
+    "ins",
+    "kbd",
+    "mark",
+    "s",
+    "small",
+    "span",
+    "strong",
+    "sub",
+    "sup",
+    "u",
+}
+# Elements dropped along with everything inside them, iframes unless
+# they embed an allowed host
+DROP_CONTENT_TAGS = {
+    "iframe",
+    "noscript",
+    "object",
+    "script",
+    "style",
+    "template",
+    "textarea",
+}
+
+GLOBAL_ATTRIBUTES = {"class", "id", "style", "title"}
+ALLOWED_ATTRIBUTES = {
+    "a": {"href", "target"},
+    "abbr": set(),
+    "audio": {"src", "controls", "loop", "muted"},
+    "iframe": {"src", "width", "height", "allowfullscreen"},
+    "img": {"src", "alt", "width", "height"},
+    "ol": {"start"},
+    "source": {"src", "type"},
+    "td": {"colspan", "rowspan"},
+    "th": {"colspan", "rowspan", "scope"},
+    "video": {
+        "src",
+        "poster",
+        "controls",
+        "width",
+        "height",
+        "loop",
+        "muted",
+    },
+}
+URL_ATTRIBUTES = {"href", "poster", "src"}
+ALLOWED_SCHEMES = {"http", "https", "mailto"}
+# Set on every kept iframe, embeds can't reach the page or navigate it
+EMBED_ATTRIBUTES = {
+    "sandbox": "allow-scripts allow-same-origin allow-popups "
+    "allow-presentation",
+    "loading": "lazy",
+}
+
+_color_re = re.compile(
+    r"#[0-9a-f]{3,8}|rgba?\([\d\s.,%]+\)|[a-z]+", re.IGNORECASE
+)
+# Declarations kept in style attributes, with the values they may take
+ALLOWED_STYLES = {
+    "text-align": re.compile(r"left|right|center|justify"),
+    "color": _color_re,
+    "background-color": _color_re,
+}
+
+_scheme_re = re.compile(r"^([^/?#]*?):")
+_whitespace_re = re.compile(r"\s+")
+_id_re = re.compile(r"[a-z][\w:.-]*", re.IGNORECASE)
+# Browsers ignore these inside URLs, so "java\tscript:" is "javascript:"
+_url_ignored_re = re.compile(r"[\x00-\x20\x7f]+")
+
+
+def safe_url(url):
+    match = _scheme_re.match(_url_ignored_re.sub("", url).lower())
+    return match is None or match.group(1) in ALLOWED_SCHEMES
+
+
+def is_embed(tag, attrs):
+    """Whether ``tag`` is an iframe of one of BLOG_EMBED_HOSTS."""
+    if tag != "iframe":
+        return False
+    # The first src is both the one kept and the one browsers load
+    src = next((value for name, value in attrs if name == "src"), None)
+    src = _url_ignored_re.sub("", src or "")
+    # Browsers treat backslashes as slashes, hiding the real host
+    if "\\" in src:
+        return False
+    url = urlsplit(src)
+    return (
+        url.scheme in ("https", "")
+        and "@" not in url.netloc
+        and url.hostname in settings.BLOG_EMBED_HOSTS
+    )
+
+
+def clean_style(value):
+    """Keep the allowed declarations of a style attribute."""
+    declarations = []
+    for declaration in value.split(";"):
+        name, colon, value = declaration.partition(":")
+        name, value = name.strip().lower(), value.strip()
+        pattern = ALLOWED_STYLES.get(name)
+        if colon and pattern and pattern.fullmatch(value):
+            declarations.append(f"{name}: {value};")
+    return " ".join(declarations)
+
+
+def clean_attributes(tag, attrs):
+    allowed = GLOBAL_ATTRIBUTES | ALLOWED_ATTRIBUTES.get(tag, set())
+    cleaned = {}
+    for name, value in attrs:
+        if name not in allowed or name in cleaned:
+            continue
+        value = value or ""
+        if name in URL_ATTRIBUTES and not safe_url(value):
+            continue
+        if name == "style":
+            value = clean_style(value)
+            if not value:
+                continue
+        if name == "id" and not _id_re.fullmatch(value):
+            continue
+        cleaned[name] = value
+
+    if cleaned.get("target"):
+        cleaned["rel"] = "noopener noreferrer"
+    if tag == "iframe":
+        cleaned.update(EMBED_ATTRIBUTES)
+    return cleaned
+
+
+def start_tag(tag, attrs):
+    return "<%s%s>" % (
+        tag,
+        "".join(
+            f' {name}="{escape(value)}"' for name, value in attrs.items()
+        ),
+    )
+
+
+class Sanitizer(HTMLParser):
+    def __init__(self, excerpt_length):
+        super().__init__(convert_charrefs=True)
+        self.html = []
+        self.open_tags = []
+        self.dropping = None
+        self.drop_depth = 0
+
+        self.excerpt = []
+        self.excerpt_tags = []
+        self.excerpt_left = excerpt_length
+        self.excerpt_started = False
+        self.excerpt_done = False
+        self.pending_space = False
+
+    def handle_starttag(self, tag, attrs):
+        if self.dropping:
+            self.drop_depth += tag == self.dropping
+            return
+        if tag in DROP_CONTENT_TAGS and not is_embed(tag, attrs):
+            self.dropping, self.drop_depth = tag, 1
+            return
+        if tag not in ALLOWED_TAGS:
+            return
+
+        attrs = clean_attributes(tag, attrs)
+        self.html.append(start_tag(tag, attrs))
+        if tag not in VOID_TAGS:
+            self.open_tags.append(tag)
+
+        if tag in INLINE_TAGS:
+            self.excerpt_start(tag, attrs)
+        else:
+            self.pending_space = True
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if self.dropping:
+            if tag == self.dropping:
+                self.drop_depth -= 1
+                if not self.drop_depth:
+                    self.dropping = None
+            return
+        if tag not in self.open_tags:
+            # Stray closing tag
+            return
+
+        # Close whatever was left open inside this element too
+        while self.open_tags:
+            open_tag = self.open_tags.pop()
+            self.html.append(f"</{open_tag}>")
+            self.excerpt_end(open_tag)
+            if open_tag == tag:
+                break
+        if tag not in INLINE_TAGS:
+            self.pending_space = True
+
+    def handle_data(self, data):
+        if self.dropping:
+            return
+        self.html.append(escape(data, quote=False))
+        self.excerpt_text(data)
+
+    def close(self):
+        super().close()
+        while self.open_tags:
+            open_tag = self.open_tags.pop()
+            self.html.append(f"</{open_tag}>")
+            self.excerpt_end(open_tag)
+        self.finish_excerpt()
+
+    # Excerpt
+    def excerpt_start(self, tag, attrs):
+        if self.excerpt_done:
+            return
+        if self.pending_space and self.excerpt_started and self.excerpt_left:
+            # Keep the word break outside the element
+            self.excerpt.append(" ")
+            self.excerpt_left -= 1
+            self.pending_space = False
+        self.excerpt.append(start_tag(tag, attrs))
+        self.excerpt_tags.append(tag)
+
+    def excerpt_end(self, tag):
+        if self.excerpt_done or tag not in INLINE_TAGS:
+            return
+        if self.excerpt_tags and self.excerpt_tags[-1] == tag:
+            self.excerpt_tags.pop()
+            self.excerpt.append(f"</{tag}>")
+
+    def excerpt_text(self, data):
+        if self.excerpt_done:
+            return
+        text = _whitespace_re.sub(" ", data)
+        space = self.pending_space or text.startswith(" ")
+        text = text.strip()
+        if not text:
+            self.pending_space = space or bool(data)
+            return
+        if space and self.excerpt_started:
+            text = " " + text
+
+        if len(text) > self.excerpt_left:
+            # Cut on a word boundary, leaving room for the ellipsis
+            cut = text[: max(self.excerpt_left - 1, 0)]
+            if " " in cut and not text[len(cut)].isspace():
+                cut = cut.rsplit(" ", 1)[0]
+            self.excerpt.append(escape(cut.rstrip(), quote=False) + "…")
+            self.finish_excerpt()
+            return
+
+        self.excerpt.append(escape(text, quote=False))
+        self.excerpt_left -= len(text)
+        self.excerpt_started = True
+        self.pending_space = data[-1].isspace()
+
+    def finish_excerpt(self):
+        if self.excerpt_done:
+            return
+        while self.excerpt_tags:
+            self.excerpt.append(f"</{self.excerpt_tags.pop()}>")
+        self.excerpt_done = True
+
+
+def sanitize(html, excerpt_length=150):
+    """
+    Return ``(body_html, excerpt_html)`` for the TinyMCE ``html``.
+
+    The excerpt holds at most ``excerpt_length`` characters of text.
+    """
+    parser = Sanitizer(excerpt_length)
+    parser.feed(html or "")
+    parser.close()
+    return "".join(parser.html), "".join(parser.excerpt)
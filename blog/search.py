@@ -0,0 +1,150 @@
+import re
+from html import unescape
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.utils.html import strip_tags
+from django.utils.module_loading import import_string
+
+FTS_TABLE = "blog_article_fts"
+
+
+def get_backend():
+    return import_string(settings.BLOG_SEARCH_BACKEND)()
+
+
+def document_text(article):
+    """Plain text indexed for an article: its topic and the stripped body."""
+    return article.topic, unescape(strip_tags(article.body or ""))
+
+
+class BaseSearchBackend:
+    """Interface every search backend implements."""
+
+    def index(self, article):
+        raise NotImplementedError
+
+    def index_many(self, articles):
+        """Index new ``articles``, e.g. after a bulk insert."""
+        for article in articles:
+            self.index(article)
+
+    def remove(self, article_id):
+        raise NotImplementedError
+
+    def rebuild(self, articles, batch_size=1000):
+        raise NotImplementedError
+
+    def search_ids(self, query, limit):
+        raise NotImplementedError
+
+    def search(self, query, limit=50):
+        """Return the articles matching ``query``, best match first."""
+        from blog.models import Article
+
+        ids = self.search_ids(query, limit)
+        articles = Article.published.for_listing().in_bulk(ids)
+        return [articles[id_] for id_ in ids if id_ in articles]
+
+
+class DatabaseSearchBackend(BaseSearchBackend):
+    """Unindexed fallback scanning the article table with ``icontains``."""
+
+    def index(self, article):
+        pass
+
+    def index_many(self, articles):
+        pass
+
+    def remove(self, article_id):
+        pass
+
+    def rebuild(self, articles, batch_size=1000):
+        pass
+
+    def search_ids(self, query, limit):
+        from blog.models import Article
+
+        articles = Article.published.filter(
+            Q(topic__icontains=query) | Q(body__icontains=query)
+        )
+        return list(articles.values_list("pk", flat=True)[:limit])
+
+
+class SQLiteFTSBackend(BaseSearchBackend):
+    """Inverted index kept in an SQLite FTS5 table, ranked by BM25."""
+
+    # Relative weight of the topic and body columns in the BM25 score.
+    weights = (10.0, 1.0)
+
+    def index(self, article):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [article.pk]
+            )
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, topic, body) "
+                "VALUES (%s, %s, %s)",
+                [article.pk, *document_text(article)],
+            )
+
+    def index_many(self, articles):
+        rows = [
+            (article.pk, *document_text(article))
+            for article in articles
+            if article.posted
+        ]
+        with connection.cursor() as cursor:
+            self._insert_many(cursor, rows)
+
+    def remove(self, article_id):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [article_id]
+            )
+
+    def rebuild(self, articles, batch_size=1000):
+        """Replace the whole index with ``articles``; return the row count."""
+        total = 0
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+            batch = []
+            for article in articles:
+                batch.append((article.pk, *document_text(article)))
+                if len(batch) >= batch_size:
+                    total += self._insert_many(cursor, batch)
+                    batch = []
+            total += self._insert_many(cursor, batch)
+        return total
+
+    def _insert_many(self, cursor, rows):
+        if rows:
+            cursor.executemany(
+                f"INSERT INTO {FTS_TABLE} (rowid, topic, body) "
+                "VALUES (%s, %s, %s)",
+                rows,
+            )
+        return len(rows)
+
+    def search_ids(self, query, limit):
+        match = self.match_expression(query)
+        if not match:
+            return []
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s "
+                f"ORDER BY bm25({FTS_TABLE}, %s, %s) LIMIT %s",
+                [match, *self.weights, limit],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    @staticmethod
+    def match_expression(query):
+        """
+        Turn free text into an FTS5 query: every word must match, as a
+        prefix, so user input can never produce an FTS5 syntax error.
+        """
+        terms = re.findall(r"\w+", query)
+        return " AND ".join(f'"{term}"*' for term in terms)
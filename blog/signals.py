@@ -0,0 +1,188 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from blog import search, slugs, thumbnails, trending
+from blog.cache import (
+    ARTICLES,
+    CATEGORIES,
+    article_scope,
+    author_scope,
+    bump_versions,
+    category_scope,
+    make_key,
+)
+from blog.models import (
+    Article,
+    Category,
+    PendingRelatedUpdate,
+    SlugRedirect,
+)
+
+
+@receiver(post_save, sender=Article)
+def index_article(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+
+    # Only published articles can be found
+    if instance.posted:
+        search.get_backend().index(instance)
+    else:
+        search.get_backend().remove(instance.pk)
+
+
+@receiver(post_delete, sender=Article)
+def unindex_article(sender, instance, **kwargs):
+    search.get_backend().remove(instance.pk)
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_delete, sender=Article)
+def invalidate_article_pages(sender, instance, **kwargs):
+    # The slug may have changed, pages cached under the old one go too
+    loaded = getattr(instance, "_loaded_values", {})
+    previous = loaded.get("slug")
+    changed = {slug for slug in (instance.slug, previous) if slug}
+    # So do the listings of the category it left
+    categories = {instance.category_id, loaded.get("category_id")} - {None}
+    bump_versions(
+        ARTICLES,
+        *(article_scope(slug) for slug in changed),
+        *(category_scope(category_id) for category_id in categories),
+    )
+    slugs.forget(*changed)
+
+    if kwargs.get("created", True):
+        # Primary keys can be reused, don't inherit a stale view count
+        cache.delete(make_key("views", instance.pk))
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_delete, sender=Article)
+def invalidate_author_stats(sender, instance, **kwargs):
+    previous = getattr(instance, "_loaded_values", {}).get("author_id")
+    authors = {instance.author_id, previous} - {None}
+    bump_versions(*(author_scope(author_id) for author_id in authors))
+
+
+@receiver(post_save, sender=Article)
+def redirect_old_slug(sender, instance, created, raw=False, **kwargs):
+    previous = getattr(instance, "_loaded_values", {}).get("slug")
+    if raw or not (created or previous != instance.slug):
+        return
+
+    # A slug taken again belongs to its new article
+    SlugRedirect.objects.filter(old_slug=instance.slug).delete()
+    if previous:
+        SlugRedirect.objects.update_or_create(
+            old_slug=previous, defaults={"article": instance}
+        )
+
+
+@receiver(post_save, sender=Category)
+def invalidate_category_pages(sender, instance, created, **kwargs):
+    if created:
+        return
+
+    # Article pages and dashboards show their category's name
+    articles = list(instance.article_set.values_list("slug", "author_id"))
+    bump_versions(
+        ARTICLES,
+        *{article_scope(slug) for slug, _ in articles},
+        *{author_scope(author_id) for _, author_id in articles},
+    )
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_sidebar(sender, **kwargs):
+    bump_versions(CATEGORIES)
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_delete, sender=Article)
+def queue_related_update(sender, instance, raw=False, **kwargs):
+    if raw or not settings.BLOG_RELATED_UPDATE_ON_SAVE:
+        return
+
+    # Refreshed by build_related_articles --pending, not in the request
+    PendingRelatedUpdate.objects.bulk_create(
+        [PendingRelatedUpdate(article_id=instance.pk)], ignore_conflicts=True
+    )
+
+
+@receiver(post_save, sender=Article)
+def count_saved_article(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+
+    if created:
+        Category.objects.move_totals(
+            [(None, False, instance.category_id, instance.posted, 1)]
+        )
+        return
+
+    # Fields not loaded were not saved either, so did not change
+    loaded = getattr(instance, "_loaded_values", {})
+    previous = loaded.get("category_id", instance.category_id)
+    was_posted = loaded.get("posted", instance.posted)
+    if (previous, was_posted) != (instance.category_id, instance.posted):
+        Category.objects.move_totals(
+            [(previous, was_posted, instance.category_id, instance.posted, 1)]
+        )
+
+
+@receiver(post_delete, sender=Article)
+def count_deleted_article(sender, instance, **kwargs):
+    Category.objects.move_totals(
+        [(instance.category_id, instance.posted, None, False, 1)]
+    )
+
+
+@receiver(post_save, sender=Article)
+def refresh_trending(sender, instance, created, raw=False, **kwargs):
+    if raw or created:
+        return
+
+    loaded = getattr(instance, "_loaded_values", {})
+    changed = {
+        name
+        for name in ("posted", "category_id", "topic", "slug")
+        if name in loaded and loaded[name] != getattr(instance, name)
+    }
+    if changed:
+        # Only published articles are ranked, each in its own category
+        moved = bool(changed & {"posted", "category_id"})
+        trending.forget(instance.pk, keep=not moved)
+
+
+@receiver(post_delete, sender=Article)
+def refresh_trending_of_deleted(sender, instance, **kwargs):
+    # Its entries were deleted with it, not the boards cached with them
+    trending.drop_cached([None, instance.category_id])
+
+
+@receiver(post_save, sender=Article)
+def process_thumbnail(sender, instance, raw=False, **kwargs):
+    if raw or not instance.thumbnail_changed():
+        return
+
+    previous = getattr(instance, "_loaded_values", {}).get("thumbnail")
+    if previous:
+        thumbnails.delete_variants(
+            previous, getattr(instance, "_replaced_widths", [])
+        )
+    if instance.thumbnail:
+        pk = instance.pk
+        transaction.on_commit(lambda: thumbnails.schedule(pk))
+
+
+@receiver(post_delete, sender=Article)
+def delete_thumbnail_variants(sender, instance, **kwargs):
+    if instance.thumbnail:
+        thumbnails.delete_variants(
+            instance.thumbnail.name, instance.thumbnail_widths
+        )
@@ -0,0 +1,85 @@
+"""
+Slug to primary key resolution.
+
+A slug resolves to ``(pk, current_slug)``: the current slug differs when
+the article was renamed and the slug comes from the SlugRedirect table.
+Resolutions are kept in a per-process cache, trusted for
+BLOG_SLUG_LOCAL_TIMEOUT seconds, in front of the shared cache. Saving or
+deleting an article forgets the slugs it had.
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+from blog.cache import LocalCache, make_key, slug_digest
+
+local = LocalCache("BLOG_SLUG_CACHE_SIZE", "BLOG_SLUG_LOCAL_TIMEOUT")
+
+
+def _key(slug):
+    return make_key("slug", slug_digest(slug))
+
+
+def lookup(slug):
+    """Return the cached ``(pk, current_slug)`` of ``slug``, or None."""
+    found = local.get(slug)
+    if found is None:
+        found = cache.get(_key(slug))
+        if found is not None:
+            found = tuple(found)
+            local.set(slug, found)
+    return found
+
+
+async def alookup(slug):
+    found = local.get(slug)
+    if found is None:
+        found = await cache.aget(_key(slug))
+        if found is not None:
+            found = tuple(found)
+            local.set(slug, found)
+    return found
+
+
+def remember(slug, pk, current_slug):
+    found = (pk, current_slug)
+    local.set(slug, found)
+    cache.set(_key(slug), found, settings.BLOG_SLUG_CACHE_TIMEOUT)
+
+
+async def aremember(slug, pk, current_slug):
+    found = (pk, current_slug)
+    local.set(slug, found)
+    await cache.aset(_key(slug), found, settings.BLOG_SLUG_CACHE_TIMEOUT)
+
+
+def forget(*slugs):
+    for slug in slugs:
+        local.delete(slug)
+    cache.delete_many([_key(slug) for slug in slugs])
+
+
+async def aforget(*slugs):
+    for slug in slugs:
+        local.delete(slug)
+    await cache.adelete_many([_key(slug) for slug in slugs])
+
+
+def redirect_target(slug):
+    """Primary key of the article that was renamed from ``slug``."""
+    from blog.models import SlugRedirect
+
+    return (
+        SlugRedirect.objects.filter(old_slug=slug)
+        .values_list("article_id", flat=True)
+        .first()
+    )
+
+
+async def aredirect_target(slug):
+    from blog.models import SlugRedirect
+
+    return await (
+        SlugRedirect.objects.filter(old_slug=slug)
+        .values_list("article_id", flat=True)
+        .afirst()
+    )
@@ -0,0 +1,101 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.sessions.backends.cache import SessionStore
+from django.core.cache import cache
+from django.test import AsyncRequestFactory, TestCase, override_settings
+
+from blog import async_views, related, views
+from blog.counters import view_counter
+from blog.models import Article, Category
+from blog.urls import view
+
+
+class AsyncViewsTest(TestCase):
+    """Test the async variants of the read views"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="minux@test.com", password="test"
+        )
+        category = Category.objects.create(name="category 1")
+        cls.articles = [
+            Article.objects.create(
+                author=cls.user,
+                category=category,
+                topic=f"Async topic {i}",
+                body=f"<p>Async body {i}</p>",
+                posted=True,
+            )
+            for i in range(3)
+        ]
+        related.build()
+
+    def setUp(self):
+        self.factory = AsyncRequestFactory()
+        cache.clear()
+        view_counter.clear()
+        self.addCleanup(view_counter.clear)
+
+    def request(self, path, user=None, method="get", **kwargs):
+        request = getattr(self.factory, method)(path, **kwargs)
+        request.session = SessionStore()
+
+        async def auser():
+            return user or AnonymousUser()
+
+        request.auser = auser
+        request.user = user or AnonymousUser()
+        return request
+
+    def test_view_selection(self):
+        """Test if BLOG_ASYNC_VIEWS picks the async variant"""
+
+        self.assertIs(view("home"), views.home)
+        with override_settings(BLOG_ASYNC_VIEWS={"home"}):
+            self.assertIs(view("home"), async_views.home)
+            self.assertIs(view("dashboard"), views.dashboard)
+
+    async def test_home(self):
+        """Test if home lists and searches articles"""
+
+        response = await async_views.home(self.request("/"))
+        self.assertEqual(response.status_code, 200)
+        for article in self.articles:
+            self.assertContains(response, article.topic)
+
+        request = self.request(
+            "/", method="post", data={"query": "Async topic 1"}
+        )
+        response = await async_views.home(request)
+        self.assertContains(response, "Async topic 1")
+        self.assertNotContains(response, "Async topic 2")
+
+    async def test_article_details(self):
+        """Test if details render and count one view per reader"""
+
+        article = self.articles[0]
+        request = self.request(article.get_absolute_url())
+        response = await async_views.article_details(request, article.slug)
+        self.assertContains(response, article.body)
+        self.assertContains(response, self.articles[1].topic)
+        self.assertEqual(view_counter.pending(article.pk), 1)
+
+        # Same reader, served from cache: no new view
+        request = self.request(article.get_absolute_url())
+        request.COOKIES.update(
+            (name, cookie.value) for name, cookie in response.cookies.items()
+        )
+        response = await async_views.article_details(request, article.slug)
+        self.assertContains(response, article.body)
+        self.assertEqual(view_counter.pending(article.pk), 1)
+
+    async def test_dashboard(self):
+        """Test if dashboard requires login"""
+
+        response = await async_views.dashboard(self.request("/dashboard/"))
+        self.assertEqual(response.status_code, 302)
+
+        request = self.request("/dashboard/", user=self.user)
+        response = await async_views.dashboard(request)
+        self.assertContains(response, self.articles[0].topic)
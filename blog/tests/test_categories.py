@@ -0,0 +1,126 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from blog.models import Article, Category
+from blog.pagination import KeysetPaginator
+from blog.views import category_sidebar
+
+
+@override_settings(BLOG_PAGE_SIZE=2)
+class CategoryPageTest(TestCase):
+    """Test category landing pages and the category sidebar"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="minux@test.com", password="test"
+        )
+        cls.linux = Category.objects.create(name="Linux")
+        cls.django = Category.objects.create(name="Django")
+        for i in range(3):
+            cls.create_article(cls.linux, f"Linux {i}")
+        cls.create_article(cls.linux, "Linux draft", posted=False)
+        cls.create_article(cls.django, "Django 0")
+
+    @classmethod
+    def create_article(cls, category, topic, posted=True):
+        return Article.objects.create(
+            author=cls.user,
+            category=category,
+            topic=topic,
+            body="<p>Body</p>",
+            posted=posted,
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.url = self.linux.get_absolute_url()
+
+    def topics(self, response):
+        return [article.topic for article in response.context["articles"]]
+
+    def test_lists_published_articles_of_category(self):
+        """Test a category page pages through its posted articles"""
+
+        response = self.client.get(self.url)
+        self.assertEqual(self.topics(response), ["Linux 2", "Linux 1"])
+
+        page = response.context["page"]
+        response = self.client.get(self.url, {"after": page.next_cursor})
+        self.assertEqual(self.topics(response), ["Linux 0"])
+
+    def test_unknown_category(self):
+        """Test a missing category is not found"""
+
+        response = self.client.get("/category/999/")
+        self.assertEqual(response.status_code, 404)
+
+    def test_sidebar(self):
+        """Test the sidebar links categories with their totals"""
+
+        response = self.client.get(self.url)
+        self.assertContains(response, self.django.get_absolute_url())
+        self.assertEqual(
+            [(c["name"], c["published_post"]) for c in category_sidebar()],
+            [("Django", 1), ("Linux", 3)],
+        )
+
+    def test_sidebar_leaves_drafts_out(self):
+        """Test a category with only drafts is not linked in the sidebar"""
+
+        drafts = Category.objects.create(name="Drafts")
+        self.create_article(drafts, "Draft 0", posted=False)
+
+        response = self.client.get(self.url)
+        self.assertNotContains(response, drafts.get_absolute_url())
+
+        article = Article.objects.get(topic="Draft 0")
+        article.posted = True
+        article.save()
+        response = self.client.get(self.url)
+        self.assertContains(response, drafts.get_absolute_url())
+
+    def test_cached_page(self):
+        """Test a cached page runs no queries until its category changes"""
+
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+        # Saving elsewhere leaves the page alone
+        article = Article.objects.get(topic="Django 0")
+        article.topic = "Django edited"
+        article.save()
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+        article = Article.objects.get(topic="Linux 2")
+        article.topic = "Linux edited"
+        article.save()
+        response = self.client.get(self.url)
+        self.assertEqual(self.topics(response)[0], "Linux edited")
+
+    def test_moved_article(self):
+        """Test moving an article refreshes both categories and totals"""
+
+        self.client.get(self.url)
+        article = Article.objects.get(topic="Linux 2")
+        article.category = self.django
+        article.save()
+
+        response = self.client.get(self.url)
+        self.assertEqual(self.topics(response), ["Linux 1", "Linux 0"])
+        self.assertEqual(
+            [c["published_post"] for c in category_sidebar()], [2, 2]
+        )
+
+    def test_uses_composite_index(self):
+        """Test the page query walks the category index in order"""
+
+        articles = Article.published.filter(category=self.linux)
+        rows, _, _ = KeysetPaginator(articles, 2).query()
+        plan = rows.explain()
+
+        self.assertIn("article_published_category_idx", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
@@ -0,0 +1,157 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.shortcuts import reverse
+from django.test import AsyncRequestFactory, TestCase
+
+from blog import async_views
+from blog.models import Article, Category
+
+
+class ConditionalGetTest(TestCase):
+    """Test ETag and Last-Modified on article and listing pages"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="minux@test.com", password="test"
+        )
+        cls.category = Category.objects.create(name="category 1")
+
+    def setUp(self):
+        cache.clear()
+        self.article = Article.objects.create(
+            author=self.user,
+            category=self.category,
+            topic="Topic 1",
+            body="<p>Body 1</p>",
+            posted=True,
+        )
+        self.url = self.article.get_absolute_url()
+        self.home = reverse("blog:home")
+
+    def revalidate(self, url, response):
+        """Status of a request revalidating ``response``."""
+        return self.client.get(
+            url, headers={"if-none-match": response["ETag"]}
+        ).status_code
+
+    def test_validators(self):
+        """Test if pages carry an ETag and a Last-Modified header"""
+
+        for url in (self.url, self.home):
+            response = self.client.get(url)
+            self.assertTrue(response.has_header("ETag"))
+            self.assertTrue(response.has_header("Last-Modified"))
+
+    def test_not_modified(self):
+        """Test if a current client copy gets a 304 without queries"""
+
+        for url in (self.url, self.home):
+            response = self.client.get(url)
+            with self.assertNumQueries(0):
+                self.assertEqual(self.revalidate(url, response), 304)
+
+            revalidated = self.client.get(
+                url,
+                headers={"if-modified-since": response["Last-Modified"]},
+            )
+            self.assertEqual(revalidated.status_code, 304)
+
+    def test_edit(self):
+        """Test if editing an article changes both pages' ETag"""
+
+        article_page = self.client.get(self.url)
+        home_page = self.client.get(self.home)
+
+        self.article.body = "<p>Edited</p>"
+        self.article.save()
+
+        self.assertEqual(self.revalidate(self.url, article_page), 200)
+        self.assertEqual(self.revalidate(self.home, home_page), 200)
+        self.assertContains(self.client.get(self.url), "Edited")
+
+    def test_unpublish(self):
+        """Test if unpublishing an article invalidates both pages"""
+
+        article_page = self.client.get(self.url)
+        home_page = self.client.get(self.home)
+
+        self.article.posted = False
+        self.article.save()
+
+        self.assertEqual(self.revalidate(self.url, article_page), 404)
+        self.assertEqual(self.revalidate(self.home, home_page), 200)
+
+    def test_publish(self):
+        """Test if publishing a draft invalidates the home page"""
+
+        draft = Article.objects.create(
+            author=self.user,
+            category=self.category,
+            topic="Draft",
+            body="<p>Draft</p>",
+        )
+        home_page = self.client.get(self.home)
+
+        draft.posted = True
+        draft.save()
+
+        self.assertEqual(self.revalidate(self.home, home_page), 200)
+        self.assertContains(self.client.get(self.home), "Draft")
+
+    def test_sign_in(self):
+        """Test if signing in invalidates the home page and its form"""
+
+        home_page = self.client.get(self.home)
+        self.client.post(
+            reverse("login_user"),
+            {"email": "minux@test.com", "password": "test"},
+        )
+
+        self.assertEqual(self.revalidate(self.home, home_page), 200)
+
+    def test_revalidated_privately(self):
+        """Test if pages are kept out of shared and heuristic caches"""
+
+        for url in (self.url, self.home):
+            response = self.client.get(url)
+            self.assertIn("private", response["Cache-Control"])
+            self.assertIn("no-cache", response["Cache-Control"])
+            self.assertIn("Cookie", response["Vary"])
+
+            response = self.client.get(
+                url, headers={"if-none-match": response["ETag"]}
+            )
+            self.assertEqual(response.status_code, 304)
+            self.assertIn("no-cache", response["Cache-Control"])
+
+    def test_delete(self):
+        """Test if deleting an article invalidates the client copies"""
+
+        article_page = self.client.get(self.url)
+        home_page = self.client.get(self.home)
+
+        self.article.delete()
+
+        self.assertEqual(self.revalidate(self.url, article_page), 404)
+        self.assertEqual(self.revalidate(self.home, home_page), 200)
+
+    def test_pages_differ(self):
+        """Test if listing pages get their own ETag"""
+
+        first = self.client.get(self.home)
+        second = self.client.get(self.home, {"after": "x"})
+        self.assertNotEqual(first["ETag"], second["ETag"])
+
+    async def test_async_not_modified(self):
+        """Test if the async views answer 304 too"""
+
+        factory = AsyncRequestFactory()
+        request = factory.get("/")
+        response = await async_views.home(request)
+        # The CSRF secret the middleware reads from the client's cookie
+        secret = request.META["CSRF_COOKIE"]
+        request = factory.get("/", headers={"if-none-match": response["ETag"]})
+        request.META["CSRF_COOKIE"] = secret
+        response = await async_views.home(request)
+        self.assertEqual(response.status_code, 304)
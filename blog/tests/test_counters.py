@@ -0,0 +1,217 @@
+import threading
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils.http import int_to_base36
+
+from blog import viewed
+from blog.counters import ViewCounter, view_counter
+from blog.models import Article, Category
+
+
+@override_settings(
+    BLOG_VIEW_COUNT_FLUSH_INTERVAL=3600, BLOG_VIEW_COUNT_MAX_PENDING=1000
+)
+class ViewCounterTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="minux@test.com", password="testpassword"
+        )
+        cls.category = Category.objects.create(name="Django")
+        cls.first = Article.objects.create(
+            author=cls.user, category=cls.category, topic="One", body="1"
+        )
+        cls.second = Article.objects.create(
+            author=cls.user, category=cls.category, topic="Two", body="2"
+        )
+
+    def setUp(self):
+        self.counter = ViewCounter()
+
+    def views(self, article):
+        article.refresh_from_db(fields=["views"])
+        return article.views
+
+    def test_incr_is_buffered(self):
+        """Test increments don't touch the database until flushed"""
+
+        with self.assertNumQueries(0):
+            self.counter.incr(self.first.pk)
+            self.counter.incr(self.first.pk)
+
+        self.assertEqual(self.counter.pending(self.first.pk), 2)
+        self.assertEqual(self.views(self.first), 0)
+
+    def test_flush(self):
+        """Test flush adds pending views to the stored counts"""
+
+        Article.objects.filter(pk=self.first.pk).update(views=5)
+        for _ in range(3):
+            self.counter.incr(self.first.pk)
+        self.counter.incr(self.second.pk)
+
+        self.assertEqual(self.counter.flush(), 4)
+        self.assertEqual(self.views(self.first), 8)
+        self.assertEqual(self.views(self.second), 1)
+        self.assertEqual(self.counter.pending(self.first.pk), 0)
+
+    def test_flush_groups_equal_increments(self):
+        """Test articles with the same increment share one UPDATE"""
+
+        self.counter.incr(self.first.pk)
+        self.counter.incr(self.second.pk)
+
+        # SAVEPOINT, UPDATE, the bucket SELECT, INSERT and UPDATE, RELEASE
+        with self.assertNumQueries(6):
+            self.counter.flush()
+
+    def test_flush_does_not_touch_other_columns(self):
+        """Test flush doesn't rewrite the article row"""
+
+        updated_on = self.first.updated_on
+        self.counter.incr(self.first.pk)
+        self.counter.flush()
+
+        self.first.refresh_from_db()
+        self.assertEqual(self.first.updated_on, updated_on)
+
+    @override_settings(BLOG_VIEW_COUNT_MAX_PENDING=2)
+    def test_flush_on_max_pending(self):
+        """Test a full buffer flushes itself"""
+
+        self.counter.incr(self.first.pk)
+        self.assertEqual(self.views(self.first), 0)
+        self.counter.incr(self.first.pk)
+        self.assertEqual(self.views(self.first), 2)
+
+    @override_settings(BLOG_VIEW_COUNT_FLUSH_INTERVAL=0)
+    def test_flush_on_interval(self):
+        """Test increments flush once the interval elapsed"""
+
+        self.counter.incr(self.first.pk)
+        self.assertEqual(self.views(self.first), 1)
+
+    def test_flush_due(self):
+        """Test the periodic flush waits for the interval"""
+
+        self.counter.incr(self.first.pk)
+        self.assertEqual(self.counter.flush_due(), 0)
+        with override_settings(BLOG_VIEW_COUNT_FLUSH_INTERVAL=0):
+            self.assertEqual(self.counter.flush_due(), 1)
+        self.assertEqual(self.views(self.first), 1)
+
+    def test_flush_thread(self):
+        """Test the first view starts one flushing thread"""
+
+        self.counter.incr(self.first.pk)
+        thread = self.counter._thread
+        self.assertTrue(thread.daemon)
+        self.assertTrue(thread.is_alive())
+
+        self.counter.incr(self.second.pk)
+        self.assertIs(self.counter._thread, thread)
+
+    def test_failed_flush_keeps_views(self):
+        """Test views survive a failed flush"""
+
+        self.counter.incr(self.first.pk)
+        with mock.patch(
+            "django.db.models.QuerySet.update", side_effect=RuntimeError
+        ):
+            with self.assertRaises(RuntimeError):
+                self.counter.flush()
+
+        self.assertEqual(self.counter.pending(self.first.pk), 1)
+
+    def test_concurrent_increments(self):
+        """Test no increment is lost across threads"""
+
+        def hit():
+            for _ in range(100):
+                self.counter.incr(self.first.pk)
+
+        threads = [threading.Thread(target=hit) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.counter.pending(self.first.pk), 800)
+
+
+@override_settings(
+    BLOG_VIEW_COUNT_FLUSH_INTERVAL=3600, BLOG_VIEW_COUNT_MAX_PENDING=1000
+)
+class ArticleDetailsViewCountTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="minux@test.com", password="testpassword"
+        )
+        cls.article = Article.objects.create(
+            author=cls.user,
+            category=Category.objects.create(name="Django"),
+            topic="One",
+            body="1",
+            posted=True,
+        )
+
+    def setUp(self):
+        view_counter.clear()
+
+    def tearDown(self):
+        view_counter.clear()
+
+    def test_view_is_counted_once_per_session(self):
+        """Test a reader's repeated visits count once"""
+
+        url = self.article.get_absolute_url()
+        self.client.get(url)
+        response = self.client.get(url)
+
+        self.assertEqual(view_counter.pending(self.article.pk), 1)
+        self.assertEqual(response.context["views"], 1)
+
+    def test_view_does_not_save_article(self):
+        """Test reading an article doesn't write the article row"""
+
+        with mock.patch.object(Article, "save") as save:
+            self.client.get(self.article.get_absolute_url())
+        save.assert_not_called()
+
+    def test_view_does_not_write_session(self):
+        """Test anonymous readers get a signed cookie and no session"""
+
+        response = self.client.get(self.article.get_absolute_url())
+
+        self.assertFalse(Session.objects.exists())
+        self.assertNotIn(settings.SESSION_COOKIE_NAME, response.cookies)
+        self.assertIn(settings.BLOG_VIEWED_COOKIE, response.cookies)
+
+    def test_tampered_cookie_is_ignored(self):
+        """Test a forged viewed cookie doesn't skip the count"""
+
+        self.client.cookies[settings.BLOG_VIEWED_COOKIE] = int_to_base36(
+            self.article.pk
+        )
+        self.client.get(self.article.get_absolute_url())
+
+        self.assertEqual(view_counter.pending(self.article.pk), 1)
+
+    @override_settings(BLOG_VIEWED_COOKIE_SIZE=2)
+    def test_cookie_keeps_recent_articles(self):
+        """Test the cookie only keeps the last articles counted"""
+
+        response = HttpResponse()
+        viewed.remember(response, [1, 2], 3)
+        request = RequestFactory().get("/")
+        request.COOKIES = {
+            name: cookie.value for name, cookie in response.cookies.items()
+        }
+
+        self.assertEqual(viewed.read(request), [2, 3])
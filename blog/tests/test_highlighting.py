@@ -0,0 +1,87 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+
+from blog import highlighting
+from blog.models import Article, Category, HighlightedCode
+
+CODE_SAMPLE = (
+    '<pre class="language-python"><code>def f(x):\n'
+    "    return x &lt; 1</code></pre>"
+)
+
+
+class HighlightTest(TestCase):
+    """Test server-side highlighting of code blocks"""
+
+    def setUp(self):
+        highlighting.rendered_blocks.clear()
+        self.addCleanup(highlighting.rendered_blocks.clear)
+
+    def test_highlight(self):
+        """Test if code blocks are rendered with Pygments"""
+
+        html = highlighting.highlight(f"<p>Intro</p>{CODE_SAMPLE}")
+        self.assertTrue(html.startswith("<p>Intro</p>"))
+        self.assertIn(
+            '<pre class="highlight"><code class="language-python">', html
+        )
+        self.assertIn('<span class="k">def</span>', html)
+        self.assertIn('<span class="o">&lt;</span>', html)
+
+    def test_no_code_blocks(self):
+        """Test if html without code blocks is returned as is"""
+
+        with self.assertNumQueries(0):
+            html = highlighting.highlight("<p>Text</p>")
+        self.assertEqual(html, "<p>Text</p>")
+
+    def test_unknown_language(self):
+        """Test if unknown languages are rendered as plain text"""
+
+        html = highlighting.highlight(
+            '<pre class="language-nope">a &amp; b</pre>'
+        )
+        self.assertIn("a &amp; b", html)
+
+    def test_caches(self):
+        """Test if rendered blocks come from the LRU cache and the table"""
+
+        first = highlighting.highlight(CODE_SAMPLE)
+        self.assertEqual(HighlightedCode.objects.count(), 1)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(highlighting.highlight(CODE_SAMPLE), first)
+
+        highlighting.rendered_blocks.clear()
+        with self.assertNumQueries(1):
+            self.assertEqual(highlighting.highlight(CODE_SAMPLE), first)
+
+    @override_settings(BLOG_HIGHLIGHT_CACHE_SIZE=1)
+    def test_lru_eviction(self):
+        """Test if the LRU cache keeps its size"""
+
+        highlighting.highlight(CODE_SAMPLE)
+        highlighting.highlight("<pre>other</pre>")
+        self.assertEqual(len(highlighting.rendered_blocks._entries), 1)
+
+    def test_article_body_html(self):
+        """Test if saved articles store highlighted code"""
+
+        article = Article.objects.create(
+            author=get_user_model().objects.create_user(
+                email="minux@test.com", password="test"
+            ),
+            category=Category.objects.create(name="category 1"),
+            topic="Topic",
+            body=CODE_SAMPLE,
+        )
+        self.assertIn('<span class="k">def</span>', article.body_html)
+
+    def test_highlight_js(self):
+        """Test if highlight.js is only shipped without server rendering"""
+
+        response = self.client.get("/")
+        self.assertNotContains(response, "highlight.min.js")
+        with override_settings(BLOG_HIGHLIGHT_CODE=False):
+            response = self.client.get("/")
+        self.assertContains(response, "highlight.min.js")
@@ -0,0 +1,167 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from blog import search
+from blog.models import Article, Category
+
+
+class BulkSlugTest(TestCase):
+    """Test slugs assigned by Article.objects.bulk_create"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="minux@test.com", password="test"
+        )
+        cls.category = Category.objects.create(name="category 1")
+
+    def article(self, topic, **kwargs):
+        return Article(
+            author=self.user,
+            category=self.category,
+            topic=topic,
+            body="<p>Body</p>",
+            **kwargs,
+        )
+
+    def test_unique_slugs(self):
+        """Test if clashing slugs get an index like AutoSlugField does"""
+
+        Article.objects.create(
+            author=self.user, category=self.category, topic="Hello", body="x"
+        )
+        Article.objects.bulk_create(
+            [self.article("Hello!"), self.article("Hello?"), self.article("A")]
+        )
+        slugs = set(Article.objects.values_list("slug", flat=True))
+        self.assertEqual(slugs, {"hello", "hello-2", "hello-3", "a"})
+
+    def test_repeated_free_base(self):
+        """Test a free base repeated in the batch skips taken indexes"""
+
+        for topic in ("Foo", "Foo?"):
+            Article.objects.create(
+                author=self.user, category=self.category, topic=topic, body="x"
+            )
+        # "foo" is free again, "foo-2" is not
+        Article.objects.filter(slug="foo").update(slug="bar")
+
+        Article.objects.bulk_create(
+            [self.article("foo!"), self.article("FOO")]
+        )
+        self.assertEqual(
+            sorted(Article.objects.values_list("slug", flat=True)),
+            ["bar", "foo", "foo-2", "foo-3"],
+        )
+
+    def test_keeps_given_slug(self):
+        """Test if a free slug given to the article is kept"""
+
+        (article,) = Article.objects.bulk_create(
+            [self.article("Topic", slug="old-slug")]
+        )
+        self.assertEqual(article.slug, "old-slug")
+
+        # Saving again generates the slug from the topic
+        article.save()
+        self.assertEqual(article.slug, "topic")
+
+    def test_queries_per_batch(self):
+        """Test if bulk_create doesn't query once per article"""
+
+        articles = [self.article(f"Topic {i}") for i in range(50)]
+        # Slug lookup, then insert, category count and taken redirects in
+        # a savepoint
+        with self.assertNumQueries(6):
+            Article.objects.bulk_create(articles)
+        self.category.refresh_from_db()
+        self.assertEqual(self.category.total_post, 50)
+
+
+class ImportExportTest(TestCase):
+    """Test the import_articles and export_articles commands"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="minux@test.com", password="test"
+        )
+        category = Category.objects.create(name="category 1")
+        for i in range(3):
+            Article.objects.create(
+                author=cls.user,
+                category=category,
+                topic=f"Exported {i}",
+                body=f"<p>Exported body {i}</p>",
+                posted=True,
+                views=i,
+            )
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "articles.jsonl")
+
+    def test_export(self):
+        """Test if every article is written as a JSON line"""
+
+        call_command("export_articles", self.path, stdout=StringIO())
+        with open(self.path) as f:
+            rows = [json.loads(line) for line in f]
+        self.assertEqual(
+            [row["topic"] for row in rows],
+            ["Exported 0", "Exported 1", "Exported 2"],
+        )
+        self.assertEqual(rows[2]["author"], "minux@test.com")
+        self.assertEqual(rows[2]["category"], "category 1")
+        self.assertEqual(rows[2]["views"], 2)
+
+    def test_round_trip(self):
+        """Test if exported articles import again with their fields"""
+
+        call_command("export_articles", self.path, stdout=StringIO())
+        exported = {
+            article.topic: article for article in Article.objects.all()
+        }
+        Article.objects.all().delete()
+        Category.objects.all().delete()
+
+        out = StringIO()
+        call_command("import_articles", self.path, batch_size=2, stdout=out)
+        self.assertIn("Imported 3 articles", out.getvalue())
+
+        for article in Article.objects.all():
+            original = exported[article.topic]
+            self.assertEqual(article.slug, original.slug)
+            self.assertEqual(article.created_on, original.created_on)
+            self.assertEqual(article.views, original.views)
+            self.assertEqual(article.body_html, original.body_html)
+        self.assertEqual(Category.objects.get().total_post, 3)
+        self.assertEqual(len(search.get_backend().search("Exported")), 3)
+
+    def test_skips_existing_and_unknown_authors(self):
+        """Test if existing topics and unknown authors are skipped"""
+
+        rows = [
+            {"topic": "Exported 0", "category": "category 1"},
+            {"topic": "New", "category": "new category"},
+            {"topic": "Other", "category": "c", "author": "x@test.com"},
+        ]
+        with open(self.path, "w") as f:
+            f.writelines(json.dumps(row) + "\n" for row in rows)
+
+        out = StringIO()
+        call_command(
+            "import_articles", self.path, author="minux@test.com", stdout=out
+        )
+        self.assertIn("Imported 1 articles", out.getvalue())
+        self.assertIn("skipped 2", out.getvalue())
+        article = Article.objects.get(topic="New")
+        self.assertEqual(article.category.name, "new category")
+        self.assertEqual(article.category.total_post, 1)
@@ -1,4 +1,7 @@
+from io import StringIO
+
 from django.contrib.auth import get_user_model
+from django.core.management import call_command
 from django.db.utils import IntegrityError
 from django.test import TestCase
 from django.utils.text import slugify
@@ -209,5 +212,183 @@ class ArticleTest(TestCase):
             posted=True,
         )
 
+        self.category.refresh_from_db()
         updated_total_post = self.category.total_post
         self.assertGreater(updated_total_post, total_post)
+
+
+class CategoryTotalPostTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="minux@test.com", password="testpassword"
+        )
+        cls.django = Category.objects.create(name="Django")
+        cls.linux = Category.objects.create(name="Linux")
+
+    def create_article(self, topic, category, posted=True):
+        return Article.objects.create(
+            author=self.user,
+            category=category,
+            topic=topic,
+            body=topic,
+            posted=posted,
+        )
+
+    def assertTotals(self, django, linux):
+        self.django.refresh_from_db()
+        self.linux.refresh_from_db()
+        self.assertEqual(
+            (self.django.total_post, self.linux.total_post), (django, linux)
+        )
+
+    def assertPublished(self, django, linux):
+        self.django.refresh_from_db()
+        self.linux.refresh_from_db()
+        self.assertEqual(
+            (self.django.published_post, self.linux.published_post),
+            (django, linux),
+        )
+
+    def test_create(self):
+        """Test creating articles increments their category"""
+
+        self.create_article("one", self.django)
+        self.create_article("two", self.django)
+        self.assertTotals(2, 0)
+
+    def test_update_keeps_total(self):
+        """Test saving an existing article doesn't count it again"""
+
+        article = self.create_article("one", self.django)
+        article.body = "edited"
+        article.save()
+        self.assertTotals(1, 0)
+
+    def test_delete(self):
+        """Test deleting an article decrements its category"""
+
+        self.create_article("one", self.django).delete()
+        self.assertTotals(0, 0)
+
+    def test_change_category(self):
+        """Test moving an article moves its count"""
+
+        article = self.create_article("one", self.django)
+        article.category = self.linux
+        article.save()
+        self.assertTotals(0, 1)
+
+    def test_change_category_of_loaded_article(self):
+        """Test moving an article loaded from the database"""
+
+        article = Article.objects.get(
+            pk=self.create_article("one", self.django).pk
+        )
+        article.category = self.linux
+        article.save()
+        self.assertTotals(0, 1)
+
+    def test_bulk_create(self):
+        """Test bulk_create counts the created articles"""
+
+        Article.objects.bulk_create(
+            Article(
+                author=self.user,
+                category=self.linux if i % 3 == 0 else self.django,
+                topic=f"topic {i}",
+                slug=f"topic-{i}",
+                body="body",
+            )
+            for i in range(6)
+        )
+        self.assertTotals(4, 2)
+
+    def test_queryset_update(self):
+        """Test queryset updates move counts between categories"""
+
+        self.create_article("one", self.django)
+        self.create_article("two", self.django)
+        self.create_article("three", self.linux)
+
+        Article.objects.all().update(category=self.linux)
+        self.assertTotals(0, 3)
+
+    def test_bulk_update(self):
+        """Test bulk_update moves counts between categories"""
+
+        one = self.create_article("one", self.django)
+        two = self.create_article("two", self.django, posted=False)
+        three = self.create_article("three", self.linux)
+
+        one.category = self.linux
+        two.category = self.linux
+        two.posted = True
+        three.body = "edited"
+        Article.objects.bulk_update(
+            [one, two, three], ["category", "posted", "body"], batch_size=2
+        )
+        self.assertTotals(0, 3)
+        self.assertPublished(0, 3)
+
+        one.category = self.django
+        Article.objects.bulk_update([one], ["category_id"])
+        self.assertTotals(1, 2)
+        self.assertPublished(1, 2)
+
+    def test_queryset_delete(self):
+        """Test queryset deletes decrement every category"""
+
+        self.create_article("one", self.django)
+        self.create_article("two", self.linux)
+
+        Article.objects.all().delete()
+        self.assertTotals(0, 0)
+
+    def test_published(self):
+        """Test drafts count in the total but not as published"""
+
+        self.create_article("one", self.django)
+        draft = self.create_article("two", self.django, posted=False)
+        self.assertTotals(2, 0)
+        self.assertPublished(1, 0)
+
+        draft.posted = True
+        draft.save()
+        self.assertPublished(2, 0)
+
+        draft.category = self.linux
+        draft.posted = False
+        draft.save()
+        self.assertTotals(1, 1)
+        self.assertPublished(1, 0)
+
+        draft.delete()
+        self.assertPublished(1, 0)
+
+    def test_queryset_update_posted(self):
+        """Test queryset updates of posted move published counts"""
+
+        self.create_article("one", self.django)
+        self.create_article("two", self.django, posted=False)
+        self.create_article("three", self.linux, posted=False)
+
+        Article.objects.all().update(posted=True)
+        self.assertPublished(2, 1)
+
+        Article.objects.filter(category=self.linux).update(
+            category=self.django, posted=False
+        )
+        self.assertTotals(3, 0)
+        self.assertPublished(2, 0)
+
+    def test_recount_command(self):
+        """Test recount_categories repairs drifted totals"""
+
+        self.create_article("one", self.django)
+        self.create_article("two", self.django, posted=False)
+        Category.objects.update(total_post=42, published_post=42)
+
+        call_command("recount_categories", stdout=StringIO())
+        self.assertTotals(2, 0)
+        self.assertPublished(1, 0)
@@ -0,0 +1,148 @@
+from datetime import timedelta
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.shortcuts import reverse
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from blog.models import Article, Category
+from blog.pagination import KeysetPaginator, decode_cursor, encode_cursor
+
+
+class KeysetPaginatorTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="minux@test.com", password="testpassword"
+        )
+        cls.category = Category.objects.create(name="Django")
+        now = timezone.now()
+
+        cls.articles = []
+        for i in range(5):
+            article = Article.objects.create(
+                author=cls.user,
+                category=cls.category,
+                topic=f"Topic {i}",
+                body="Body",
+            )
+            # Two articles share a timestamp and two are unpublished drafts
+            created_on = None if i < 2 else now - timedelta(days=min(i, 3))
+            Article.objects.filter(pk=article.pk).update(
+                created_on=created_on
+            )
+            cls.articles.append(article)
+
+        cls.expected = [cls.articles[i].pk for i in (2, 4, 3, 1, 0)]
+
+    def walk(self, paginator):
+        pks, page, pages = [], paginator.page(), []
+        while True:
+            pages.append(page)
+            pks.extend(article.pk for article in page)
+            if not page.has_next():
+                return pks, pages
+            page = paginator.page(after=page.next_cursor)
+
+    def test_forward_walk(self):
+        """Test walking forward yields every row once, drafts last"""
+
+        pks, pages = self.walk(KeysetPaginator(Article.objects.all(), 2))
+
+        self.assertEqual(pks, self.expected)
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        self.assertFalse(pages[0].has_previous())
+
+    def test_backward_walk(self):
+        """Test previous cursors return the same pages in reverse"""
+
+        paginator = KeysetPaginator(Article.objects.all(), 2)
+        pks, pages = self.walk(paginator)
+
+        page = pages[-1]
+        for expected in reversed(pages[:-1]):
+            page = paginator.page(before=page.previous_cursor)
+            self.assertEqual(list(page), list(expected))
+        self.assertFalse(page.has_previous())
+
+    def test_invalid_cursor(self):
+        """Test malformed cursors fall back to the first page"""
+
+        paginator = KeysetPaginator(Article.objects.all(), 2)
+        page = paginator.page(after="not-a-cursor")
+        self.assertEqual([a.pk for a in page], self.expected[:2])
+
+    def test_cursor_pages_seek_index(self):
+        """Test pages after or before a cursor seek into the index"""
+
+        paginator = KeysetPaginator(Article.published.all(), 2)
+        cursor = encode_cursor(timezone.now(), self.articles[2].pk)
+        for rows, _, _ in (
+            paginator.query(after=cursor),
+            paginator.query(before=cursor),
+        ):
+            plan = rows.explain()
+            self.assertIn("SEARCH blog_article", plan)
+            self.assertIn("article_published_idx", plan)
+
+    def test_async_walk(self):
+        """Test the async pages cross into the null tail too"""
+
+        paginator = KeysetPaginator(Article.objects.all(), 2)
+        page = async_to_sync(paginator.apage)()
+        page = async_to_sync(paginator.apage)(after=page.next_cursor)
+        self.assertEqual([a.pk for a in page], self.expected[2:4])
+
+        page = async_to_sync(paginator.apage)(before=page.previous_cursor)
+        self.assertEqual([a.pk for a in page], self.expected[:2])
+
+    def test_cursor_round_trip(self):
+        """Test cursors decode to what was encoded"""
+
+        now = timezone.now()
+        self.assertEqual(decode_cursor(encode_cursor(now, 7)), (now, 7))
+        self.assertEqual(decode_cursor(encode_cursor(None, 7)), (None, 7))
+
+
+@override_settings(BLOG_PAGE_SIZE=1)
+class PaginatedViewsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="minux@test.com", password="testpassword"
+        )
+        cls.category = Category.objects.create(name="Django")
+        for i in range(2):
+            Article.objects.create(
+                author=cls.user,
+                category=cls.category,
+                topic=f"Topic {i}",
+                body="Body",
+                posted=True,
+            )
+
+    def test_home_pages(self):
+        """Test home renders one page and links to the next"""
+
+        response = self.client.get(reverse("blog:home"))
+        page = response.context["page"]
+
+        self.assertContains(response, "Topic 1")
+        self.assertNotContains(response, "Topic 0")
+        self.assertContains(response, f"?after={page.next_cursor}")
+
+        response = self.client.get(
+            reverse("blog:home"), {"after": page.next_cursor}
+        )
+        self.assertContains(response, "Topic 0")
+        self.assertContains(response, "?before=")
+
+    def test_dashboard_pages(self):
+        """Test dashboard renders one page and links to the next"""
+
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("blog:dashboard"))
+
+        self.assertEqual(len(response.context["articles"]), 1)
+        self.assertContains(response, "?after=")
@@ -0,0 +1,92 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.shortcuts import reverse
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from blog import related, search
+from blog.models import Article, Category
+
+
+class PublishedArticlesTest(TestCase):
+    """Test drafts stay out of public pages"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="minux@test.com", password="test"
+        )
+        cls.category = Category.objects.create(name="category 1")
+        cls.posted = cls.create_article("Posted signals", posted=True)
+        cls.draft = cls.create_article("Draft signals", posted=False)
+
+    @classmethod
+    def create_article(cls, topic, posted):
+        return Article.objects.create(
+            author=cls.user,
+            category=cls.category,
+            topic=topic,
+            body="<p>Django signals</p>",
+            posted=posted,
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_manager(self):
+        """Test Article.published only holds posted articles"""
+
+        self.assertQuerySetEqual(Article.published.all(), [self.posted])
+        self.assertEqual(Article.objects.count(), 2)
+
+    def test_home_hides_drafts(self):
+        """Test the home page lists posted articles only"""
+
+        response = self.client.get(reverse("blog:home"))
+        self.assertEqual(list(response.context["articles"]), [self.posted])
+
+    def test_details_hides_drafts(self):
+        """Test a draft's details page is not found"""
+
+        response = self.client.get(self.draft.get_absolute_url())
+        self.assertEqual(response.status_code, 404)
+
+    def test_dashboard_shows_drafts(self):
+        """Test authors still see their drafts on the dashboard"""
+
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("blog:dashboard"))
+        self.assertContains(response, "Draft signals")
+
+    def test_search_hides_drafts(self):
+        """Test drafts are not indexed and unpublishing drops them"""
+
+        backend = search.get_backend()
+        self.assertEqual(backend.search("signals"), [self.posted])
+
+        self.posted.posted = False
+        self.posted.save()
+        self.assertEqual(backend.search("signals"), [])
+
+    def test_related_hides_drafts(self):
+        """Test drafts are left out of related articles"""
+
+        self.assertNotIn(self.draft.pk, related.Corpus.load().vectors)
+
+    def test_listing_uses_partial_index(self):
+        """Test the listing query walks the partial index in order"""
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse("blog:home"))
+        listing = next(
+            query["sql"]
+            for query in queries
+            if 'FROM "blog_article"' in query["sql"]
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("EXPLAIN QUERY PLAN " + listing)
+            plan = " ".join(str(row[-1]) for row in cursor.fetchall())
+
+        self.assertIn("article_published_idx", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
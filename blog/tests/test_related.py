@@ -0,0 +1,158 @@
+from collections import Counter
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from blog import related
+from blog.models import (
+    Article,
+    Category,
+    PendingRelatedUpdate,
+    RelatedArticle,
+)
+
+
+class CorpusTest(TestCase):
+    def test_tokenize(self):
+        """Test short words, digits and stop words are dropped"""
+
+        self.assertEqual(
+            related.tokenize("The Django ORM and 42 signals"),
+            ["django", "orm", "signals"],
+        )
+
+    def test_term_counts(self):
+        """Test markup is stripped and topic terms weigh more"""
+
+        with self.settings(BLOG_RELATED_TOPIC_WEIGHT=3):
+            counts = related.term_counts("Kernel", "<p>kernel <b>irq</b></p>")
+        self.assertEqual(counts, Counter({"kernel": 4, "irq": 1}))
+
+    @override_settings(BLOG_RELATED_MAX_DF=1, BLOG_RELATED_CATEGORY_BOOST=0)
+    def test_similar_articles_rank_first(self):
+        """Test neighbours are ordered by similarity"""
+
+        corpus = related.Corpus(
+            [
+                (1, (1, Counter(kernel=2, scheduler=1))),
+                (2, (1, Counter(kernel=2, scheduler=1, irq=1))),
+                (3, (1, Counter(kernel=1, django=3))),
+                (4, (1, Counter(django=1))),
+            ]
+        )
+        self.assertEqual([o for _, o in corpus.neighbours(1, 2)], [2, 3])
+
+    @override_settings(BLOG_RELATED_MAX_DF=1, BLOG_RELATED_CATEGORY_BOOST=1)
+    def test_category_boost(self):
+        """Test sharing a category outweighs small text differences"""
+
+        corpus = related.Corpus(
+            [
+                (1, (1, Counter(kernel=1, irq=1))),
+                (2, (2, Counter(kernel=1, irq=1))),
+                (3, (1, Counter(kernel=1, django=1))),
+            ]
+        )
+        self.assertEqual([o for _, o in corpus.neighbours(1, 1)], [3])
+
+    @override_settings(BLOG_RELATED_MAX_DF=1)
+    def test_top_up_from_category(self):
+        """Test lists are topped up with articles of the same category"""
+
+        corpus = related.Corpus(
+            [
+                (1, (1, Counter(kernel=1))),
+                (2, (1, Counter(django=1))),
+                (3, (2, Counter(rust=1))),
+            ]
+        )
+        self.assertEqual([o for _, o in corpus.neighbours(1, 2)], [2])
+
+
+@override_settings(BLOG_RELATED_ARTICLES=2, BLOG_RELATED_MAX_DF=1)
+class RelatedArticlesTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="minux@test.com", password="testpassword"
+        )
+        cls.category = Category.objects.create(name="Linux")
+        cls.kernel = cls.create_article("Kernel", "scheduler interrupts")
+        cls.irq = cls.create_article("Interrupts", "bash interrupts")
+        cls.shell = cls.create_article("Shell", "bash scripts")
+
+    @classmethod
+    def create_article(cls, topic, body):
+        return Article.objects.create(
+            author=cls.user,
+            category=cls.category,
+            topic=topic,
+            body=f"<p>{body}</p>",
+            posted=True,
+        )
+
+    def setUp(self):
+        # Drop the fixture articles queued on creation
+        related.take_pending()
+
+    def neighbours(self, article):
+        return list(
+            RelatedArticle.objects.filter(article=article)
+            .order_by("rank")
+            .values_list("related__topic", flat=True)
+        )
+
+    def test_build_command(self):
+        """Test build_related_articles stores every article's neighbours"""
+
+        call_command("build_related_articles", stdout=StringIO())
+
+        self.assertEqual(self.neighbours(self.kernel), ["Interrupts", "Shell"])
+        self.assertEqual(RelatedArticle.objects.count(), 6)
+
+    def test_save_only_queues(self):
+        """Test saving an article queues it without ranking anything"""
+
+        related.build()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.shell.body = "<p>kernel scheduler interrupts</p>"
+            self.shell.save()
+
+        self.assertEqual(self.neighbours(self.kernel), ["Interrupts", "Shell"])
+        self.assertEqual(
+            list(PendingRelatedUpdate.objects.values_list("pk", flat=True)),
+            [self.shell.pk],
+        )
+
+    def test_update_pending_after_save(self):
+        """Test the queued saves refresh the lists they belong to"""
+
+        related.build()
+        self.shell.body = "<p>kernel scheduler interrupts</p>"
+        self.shell.save()
+        call_command("build_related_articles", "--pending", stdout=StringIO())
+
+        self.assertEqual(self.neighbours(self.kernel)[0], "Shell")
+        self.assertEqual(self.neighbours(self.shell)[0], "Kernel")
+        self.assertFalse(PendingRelatedUpdate.objects.exists())
+
+    def test_update_pending_after_delete(self):
+        """Test a queued delete refills the lists it was in"""
+
+        related.build()
+        self.create_article("Drivers", "kernel modules")
+        self.irq.delete()
+
+        self.assertEqual(related.update_pending(), 2)
+        self.assertEqual(self.neighbours(self.kernel), ["Drivers", "Shell"])
+
+    def test_details_page(self):
+        """Test the details page lists neighbours in rank order"""
+
+        related.build()
+        response = self.client.get(self.kernel.get_absolute_url())
+
+        content = response.content.decode()
+        self.assertLess(content.index("Interrupts"), content.index("Shell"))
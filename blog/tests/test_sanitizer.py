@@ -0,0 +1,162 @@
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+
+from blog.models import Article, Category
+from blog.sanitizer import sanitize
+
+
+class SanitizeTest(SimpleTestCase):
+    """Test the allowlist sanitizer"""
+
+    def test_keeps_allowed_markup(self):
+        """Test if allowed tags and attributes are kept"""
+
+        html = (
+            '<h2 class="title">Title</h2><p>Some <strong>bold</strong> '
+            'and <a href="https://example.com" title="x">a link</a></p>'
+        )
+        body_html, _ = sanitize(html)
+        self.assertEqual(body_html, html)
+
+    def test_removes_scripts(self):
+        """Test if script content, handlers and unsafe urls are removed"""
+
+        body_html, excerpt_html = sanitize(
+            '<p onclick="steal()">Text<script>alert(1)</script></p>'
+            '<a href=" JaVa\tScript:alert(1)">link</a>'
+            '<img src="data:image/png;base64,xx"><style>p {}</style>'
+        )
+        self.assertEqual(body_html, "<p>Text</p><a>link</a><img>")
+        self.assertEqual(excerpt_html, "Text <a>link</a>")
+
+    def test_escapes_text_and_attributes(self):
+        """Test if text and attribute values are escaped again"""
+
+        body_html, _ = sanitize('<p title="a&quot;b">1 &lt; 2</p>')
+        self.assertEqual(body_html, '<p title="a&quot;b">1 &lt; 2</p>')
+
+    def test_balances_tags(self):
+        """Test if unclosed tags are closed and stray ones dropped"""
+
+        body_html, _ = sanitize("<div><p>One <em>two</p></span>three")
+        self.assertEqual(body_html, "<div><p>One <em>two</em></p>three</div>")
+
+    def test_target_blank_links(self):
+        """Test if links opening a new tab get rel=noopener"""
+
+        body_html, _ = sanitize('<a href="/a" target="_blank">a</a>')
+        self.assertEqual(
+            body_html,
+            '<a href="/a" target="_blank" rel="noopener noreferrer">a</a>',
+        )
+
+    def test_keeps_editor_styles(self):
+        """Test if alignment and colours are kept, other styles dropped"""
+
+        body_html, _ = sanitize(
+            '<p style="text-align: center; position: fixed">a</p>'
+            '<span style="color: #e03e2d; background-color: rgb(1, 2, 3);">'
+            "b</span>"
+            '<span style="color: red; background: url(/x)">c</span>'
+            '<p style="color: expression(alert(1))">d</p>'
+        )
+        self.assertEqual(
+            body_html,
+            '<p style="text-align: center;">a</p>'
+            '<span style="color: #e03e2d; background-color: rgb(1, 2, 3);">'
+            "b</span>"
+            '<span style="color: red;">c</span><p>d</p>',
+        )
+
+    def test_keeps_anchors_and_media(self):
+        """Test if anchors and videos are kept"""
+
+        html = (
+            '<p><a id="intro"></a>Intro</p><video controls="controls">'
+            '<source src="https://example.com/a.mp4" type="video/mp4">'
+            "</video>"
+        )
+        body_html, _ = sanitize(html)
+        self.assertEqual(body_html, html)
+
+    def test_embeds_allowed_hosts_only(self):
+        """Test if iframes are kept for allowed hosts, sandboxed"""
+
+        with self.settings(BLOG_EMBED_HOSTS={"www.youtube.com"}):
+            body_html, _ = sanitize(
+                '<iframe src="https://www.youtube.com/embed/x" width="560" '
+                "allowfullscreen></iframe>"
+                '<iframe src="https://evil.com/">text</iframe>'
+                '<iframe src="https://evil.com/" '
+                'src="https://www.youtube.com/embed/x"></iframe>'
+                '<iframe src="https://evil.com\\@www.youtube.com/"></iframe>'
+            )
+        self.assertEqual(
+            body_html,
+            '<iframe src="https://www.youtube.com/embed/x" width="560" '
+            'allowfullscreen="" sandbox="allow-scripts allow-same-origin '
+            'allow-popups allow-presentation" loading="lazy"></iframe>',
+        )
+
+    def test_excerpt_keeps_inline_markup(self):
+        """Test if excerpt keeps inline tags and flattens blocks"""
+
+        _, excerpt_html = sanitize(
+            "<h2>Title</h2>\n<ul><li>one</li><li><em>two</em></li></ul>"
+        )
+        self.assertEqual(excerpt_html, "Title one <em>two</em>")
+
+    def test_excerpt_truncates_balanced(self):
+        """Test if a truncated excerpt closes the tags it opened"""
+
+        _, excerpt_html = sanitize(
+            "<p>Some <strong>long bold words here</strong> end</p>", 20
+        )
+        self.assertEqual(excerpt_html, "Some <strong>long bold…</strong>")
+
+
+class ArticleRenderTest(TestCase):
+    """Test the rendered body columns of articles"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="minux@test.com", password="test"
+        )
+        cls.category = Category.objects.create(name="category 1")
+
+    def test_render_on_save(self):
+        """Test if saving the body renders body_html and excerpt_html"""
+
+        article = Article.objects.create(
+            author=self.user,
+            category=self.category,
+            topic="Topic",
+            body="<p>Body<script>x</script></p>",
+        )
+        article.refresh_from_db()
+        self.assertEqual(article.body_html, "<p>Body</p>")
+        self.assertEqual(article.excerpt_html, "Body")
+
+        article.body = "<p>New <b>body</b></p>"
+        article.save(update_fields=["body"])
+        article.refresh_from_db()
+        self.assertEqual(article.body_html, "<p>New <b>body</b></p>")
+        self.assertEqual(article.excerpt_html, "New <b>body</b>")
+
+    def test_render_on_bulk_create(self):
+        """Test if bulk_create renders the body columns"""
+
+        Article.objects.bulk_create(
+            [
+                Article(
+                    author=self.user,
+                    category=self.category,
+                    topic="Topic",
+                    body="<p>Bulk</p>",
+                )
+            ]
+        )
+        article = Article.objects.get(topic="Topic")
+        self.assertEqual(article.body_html, "<p>Bulk</p>")
+        self.assertEqual(article.excerpt, "Bulk")
@@ -0,0 +1,122 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.shortcuts import reverse
+from django.test import TestCase
+
+from blog import search
+from blog.models import Article, Category
+
+
+class SQLiteFTSBackendTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="minux@test.com", password="testpassword"
+        )
+        cls.category = Category.objects.create(name="Django")
+
+    def setUp(self):
+        self.backend = search.SQLiteFTSBackend()
+
+    def create_article(self, topic, body):
+        return Article.objects.create(
+            author=self.user,
+            category=self.category,
+            topic=topic,
+            body=body,
+            posted=True,
+        )
+
+    def test_index_on_save(self):
+        """Test saved articles are searchable"""
+
+        article = self.create_article("Signals", "<p>Django signals</p>")
+        self.assertEqual(self.backend.search("signals"), [article])
+
+    def test_reindex_on_update(self):
+        """Test updated content replaces the indexed content"""
+
+        article = self.create_article("Signals", "<p>old words</p>")
+        article.body = "<p>fresh words</p>"
+        article.save()
+
+        self.assertEqual(self.backend.search("old"), [])
+        self.assertEqual(self.backend.search("fresh"), [article])
+
+    def test_remove_on_delete(self):
+        """Test deleted articles leave the index"""
+
+        article = self.create_article("Signals", "<p>Django signals</p>")
+        article.delete()
+        self.assertEqual(self.backend.search("signals"), [])
+
+    def test_html_is_stripped(self):
+        """Test markup is not indexed"""
+
+        self.create_article("Markup", "<strong>bold</strong>")
+        self.assertEqual(self.backend.search("strong"), [])
+
+    def test_topic_ranks_above_body(self):
+        """Test topic matches rank above body matches"""
+
+        body_match = self.create_article("Other", "<p>kernel modules</p>")
+        topic_match = self.create_article("Kernel", "<p>modules</p>")
+
+        self.assertEqual(
+            self.backend.search("kernel"), [topic_match, body_match]
+        )
+
+    def test_prefix_and_all_terms_match(self):
+        """Test every term must match, as a prefix"""
+
+        article = self.create_article("Linux", "<p>kernel scheduler</p>")
+        self.create_article("Python", "<p>kernel threads</p>")
+
+        self.assertEqual(self.backend.search("kern sched"), [article])
+
+    def test_query_syntax_is_escaped(self):
+        """Test FTS5 operators in user input do not raise"""
+
+        self.create_article("Linux", "<p>kernel</p>")
+        self.assertEqual(self.backend.search('"* OR -('), [])
+        self.assertEqual(self.backend.search(""), [])
+
+    def test_rebuild_command(self):
+        """Test rebuild_search_index restores a wiped index"""
+
+        article = self.create_article("Signals", "<p>Django signals</p>")
+        self.backend.rebuild([])
+        self.assertEqual(self.backend.search("signals"), [])
+
+        call_command("rebuild_search_index", stdout=StringIO())
+        self.assertEqual(self.backend.search("signals"), [article])
+
+
+class HomeSearchTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="minux@test.com", password="testpassword"
+        )
+        cls.category = Category.objects.create(name="Django")
+        cls.article = Article.objects.create(
+            author=cls.user,
+            category=cls.category,
+            topic="Signals",
+            body="<p>Django signals</p>",
+            posted=True,
+        )
+
+    def test_search_results(self):
+        """Test home search renders matching articles"""
+
+        response = self.client.post(reverse("blog:home"), {"query": "sign"})
+        self.assertContains(response, self.article.topic)
+
+    def test_search_without_results(self):
+        """Test home search without matches"""
+
+        response = self.client.post(reverse("blog:home"), {"query": "rust"})
+        self.assertNotContains(response, self.article.topic)
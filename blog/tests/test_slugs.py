@@ -0,0 +1,142 @@
+import warnings
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.cache.backends.base import CacheKeyWarning
+from django.db import connection
+from django.http import Http404
+from django.test import AsyncRequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from blog import async_views, slugs
+from blog.models import Article, Category, SlugRedirect
+from blog.views import get_article
+
+
+class SlugResolutionTest(TestCase):
+    """Test slug resolution and redirects of renamed articles"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="minux@test.com", password="test"
+        )
+        cls.category = Category.objects.create(name="category 1")
+
+    def setUp(self):
+        cache.clear()
+        slugs.local.clear()
+        self.article = Article.objects.create(
+            author=self.user,
+            category=self.category,
+            topic="First topic",
+            body="<p>Body</p>",
+            posted=True,
+        )
+        self.old_url = self.article.get_absolute_url()
+
+    def rename(self, topic):
+        self.article.topic = topic
+        self.article.save()
+
+    def test_get_article_cached(self):
+        """Test if resolved slugs load the article by primary key"""
+
+        get_article("first-topic")
+        self.assertEqual(
+            slugs.lookup("first-topic"), (self.article.pk, "first-topic")
+        )
+        with self.assertNumQueries(1):
+            self.assertEqual(get_article("first-topic"), self.article)
+
+    def test_get_article_missing(self):
+        """Test if unknown slugs raise Http404"""
+
+        with self.assertRaises(Http404):
+            get_article("missing")
+
+    def test_unusual_slug(self):
+        """Test if slugs memcached can't hold in a key are not found"""
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", CacheKeyWarning)
+            for slug in ("a%20b", "a%07b", "a" * 300):
+                response = self.client.get(f"/article/details/{slug}/")
+                self.assertEqual(response.status_code, 404)
+
+    def test_rename_redirects(self):
+        """Test if the old slug redirects to the renamed article"""
+
+        self.rename("Second topic")
+        self.assertEqual(SlugRedirect.objects.get().old_slug, "first-topic")
+        response = self.client.get(self.old_url)
+        self.assertRedirects(
+            response, "/article/details/second-topic/", status_code=301
+        )
+
+        # Served from the slug cache from now on
+        with self.assertNumQueries(0):
+            response = self.client.get(self.old_url)
+        self.assertEqual(response.status_code, 301)
+
+    def test_renames_chain(self):
+        """Test if every old slug redirects to the current one"""
+
+        self.rename("Second topic")
+        self.rename("Third topic")
+        for slug in ("first-topic", "second-topic"):
+            self.assertEqual(get_article(slug), self.article)
+        self.assertRedirects(
+            self.client.get(self.old_url),
+            "/article/details/third-topic/",
+            status_code=301,
+        )
+
+    def test_slug_taken_again(self):
+        """Test if a new article using an old slug stops its redirect"""
+
+        self.client.get(self.old_url)
+        self.rename("Second topic")
+        self.client.get(self.old_url)
+
+        other = Article.objects.create(
+            author=self.user,
+            category=self.category,
+            topic="First topic",
+            body="<p>Other</p>",
+            posted=True,
+        )
+        self.assertFalse(SlugRedirect.objects.exists())
+        response = self.client.get(self.old_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(get_article("first-topic"), other)
+
+    def test_delete(self):
+        """Test if deleted articles are no longer resolved"""
+
+        get_article("first-topic")
+        self.article.delete()
+        self.assertIsNone(slugs.lookup("first-topic"))
+        self.assertEqual(self.client.get(self.old_url).status_code, 404)
+
+    def test_save_without_rename(self):
+        """Test if saving with the same topic doesn't probe for slugs"""
+
+        self.article.body = "<p>New body</p>"
+        with CaptureQueriesContext(connection) as queries:
+            self.article.save()
+        self.assertFalse(
+            any('"blog_article"."slug" =' in q["sql"] for q in queries)
+        )
+        self.assertEqual(self.article.slug, "first-topic")
+
+    async def test_async_redirect(self):
+        """Test if the async details view redirects old slugs"""
+
+        await SlugRedirect.objects.acreate(
+            old_slug="old-topic", article=self.article
+        )
+        request = AsyncRequestFactory().get("/")
+        response = await async_views.article_details(request, "old-topic")
+        self.assertEqual(response.status_code, 301)
+        self.assertEqual(response.url, "/article/details/first-topic/")
@@ -0,0 +1,165 @@
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from blog import thumbnails
+from blog.models import Article, Category
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def image_file(name="thumb.png", size=(1000, 500), mode="RGBA"):
+    buffer = BytesIO()
+    Image.new(mode, size, "red").save(buffer, "PNG")
+    return SimpleUploadedFile(name, buffer.getvalue(), "image/png")
+
+
+@override_settings(
+    MEDIA_ROOT=MEDIA_ROOT,
+    BLOG_THUMBNAIL_ASYNC=False,
+    BLOG_THUMBNAIL_WIDTHS=(320, 640, 1280),
+    BLOG_THUMBNAIL_DEFAULT_WIDTH=640,
+)
+class ThumbnailTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="minux@test.com", password="testpassword"
+        )
+        cls.category = Category.objects.create(name="Django")
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def create_article(self, thumbnail, topic="Topic"):
+        with self.captureOnCommitCallbacks(execute=True):
+            article = Article.objects.create(
+                author=self.user,
+                category=self.category,
+                topic=topic,
+                body="Body",
+                thumbnail=thumbnail,
+                posted=True,
+            )
+        article.refresh_from_db()
+        return article
+
+    def test_variants_generated(self):
+        """Test each width smaller than the original gets both formats"""
+
+        article = self.create_article(image_file())
+
+        self.assertEqual(article.thumbnail_widths, [320, 640])
+        for name in thumbnails.variant_names(article.thumbnail.name, [320]):
+            self.assertTrue(default_storage.exists(name))
+
+        webp = thumbnails.variant_name(article.thumbnail.name, 320, "webp")
+        with default_storage.open(webp) as file, Image.open(file) as image:
+            self.assertEqual(image.format, "WEBP")
+            self.assertEqual(image.size, (320, 160))
+
+    def test_small_image_not_upscaled(self):
+        """Test images narrower than every width keep their size"""
+
+        article = self.create_article(image_file(size=(200, 100)))
+        self.assertEqual(article.thumbnail_widths, [200])
+
+    def test_jpeg_without_alpha(self):
+        """Test transparent images are flattened for JPEG"""
+
+        article = self.create_article(image_file())
+        jpeg = thumbnails.variant_name(article.thumbnail.name, 320, "jpeg")
+        with default_storage.open(jpeg) as file, Image.open(file) as image:
+            self.assertEqual(image.mode, "RGB")
+
+    def test_thumbnail_url_and_srcset(self):
+        """Test urls point at the variants"""
+
+        article = self.create_article(image_file())
+
+        self.assertTrue(article.thumbnail_url().endswith("_640w.jpeg"))
+        self.assertIn("_320w.webp 320w", article.thumbnail_webp_srcset())
+        self.assertIn("_640w.jpeg 640w", article.thumbnail_srcset())
+
+    def test_thumbnail_url_before_variants(self):
+        """Test the original is served until variants exist"""
+
+        article = Article.objects.create(
+            author=self.user,
+            category=self.category,
+            topic="Topic",
+            body="Body",
+            thumbnail=image_file(),
+        )
+        self.assertEqual(article.thumbnail_url(), article.thumbnail.url)
+
+    def test_replacing_thumbnail(self):
+        """Test a new image drops the previous variants"""
+
+        article = self.create_article(image_file())
+        old = thumbnails.variant_names(article.thumbnail.name, [320, 640])
+
+        article.thumbnail = image_file("other.png", size=(400, 200))
+        with self.captureOnCommitCallbacks(execute=True):
+            article.save()
+        article.refresh_from_db()
+
+        self.assertEqual(article.thumbnail_widths, [320])
+        self.assertFalse(any(default_storage.exists(name) for name in old))
+
+    def test_same_root_other_extension(self):
+        """Test uploads differing by extension keep their own variants"""
+
+        png = self.create_article(image_file("photo.png"), "PNG")
+        jpg = self.create_article(
+            image_file("photo.jpg", size=(400, 200), mode="RGB"), "JPG"
+        )
+        self.assertNotEqual(
+            png.thumbnail_variant_url(320), jpg.thumbnail_variant_url(320)
+        )
+
+        jpg.delete()
+        for name in thumbnails.variant_names(png.thumbnail.name, [320, 640]):
+            self.assertTrue(default_storage.exists(name))
+
+    def test_delete_keeps_uploads_named_like_variants(self):
+        """Test deleting variants leaves other originals alone"""
+
+        article = self.create_article(image_file("photo.png"), "Photo")
+        other = self.create_article(image_file("photo_320w.jpeg"), "Other")
+
+        article.delete()
+        self.assertTrue(default_storage.exists(other.thumbnail.name))
+
+    def test_details_page_srcset(self):
+        """Test the details page offers the variants"""
+
+        article = self.create_article(image_file())
+        response = self.client.get(article.get_absolute_url())
+
+        self.assertContains(response, 'type="image/webp"')
+        self.assertContains(response, article.thumbnail_srcset())
+
+    def test_generate_command(self):
+        """Test generate_thumbnails backfills missing variants"""
+
+        article = Article.objects.create(
+            author=self.user,
+            category=self.category,
+            topic="Topic",
+            body="Body",
+            thumbnail=image_file(),
+        )
+        call_command("generate_thumbnails", stdout=StringIO())
+
+        article.refresh_from_db()
+        self.assertEqual(article.thumbnail_widths, [320, 640])
@@ -0,0 +1,193 @@
+from datetime import datetime, timedelta, timezone
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.shortcuts import reverse
+from django.test import TestCase, override_settings
+
+from blog import trending
+from blog.counters import ViewCounter
+from blog.models import Article, ArticleViewBucket, Category, TrendingArticle
+
+NOW = datetime(2024, 5, 10, 12, 30, tzinfo=timezone.utc)
+
+
+@override_settings(
+    BLOG_TRENDING_WINDOW_HOURS=24 * 7,
+    BLOG_TRENDING_HOURLY_HOURS=48,
+    BLOG_TRENDING_HALF_LIFE_HOURS=24,
+    BLOG_VIEW_COUNT_FLUSH_INTERVAL=3600,
+    BLOG_VIEW_COUNT_MAX_PENDING=1000,
+)
+class TrendingTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="minux@test.com", password="test"
+        )
+        cls.linux = Category.objects.create(name="Linux")
+        cls.django = Category.objects.create(name="Django")
+        cls.kernel = cls.create_article(cls.linux, "Kernel")
+        cls.shell = cls.create_article(cls.linux, "Shell")
+        cls.orm = cls.create_article(cls.django, "ORM")
+
+    @classmethod
+    def create_article(cls, category, topic, posted=True):
+        return Article.objects.create(
+            author=cls.user,
+            category=category,
+            topic=topic,
+            body="<p>Body</p>",
+            posted=posted,
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def add_views(self, article, hours_ago, views):
+        ArticleViewBucket.objects.create(
+            article=article,
+            hour=trending.bucket_hour(NOW) - timedelta(hours=hours_ago),
+            views=views,
+        )
+
+    def test_flush_records_hourly_buckets(self):
+        """Test flushed views are added to the current hour's bucket"""
+
+        counter = ViewCounter()
+        for _ in range(2):
+            counter.incr(self.kernel.pk)
+            counter.flush()
+
+        bucket = ArticleViewBucket.objects.get()
+        self.assertEqual(bucket.article, self.kernel)
+        self.assertEqual(bucket.views, 2)
+        self.assertEqual(bucket.hour.minute, 0)
+
+    def test_compact(self):
+        """Test old hourly buckets merge by day and expired ones go"""
+
+        self.add_views(self.kernel, 3, 1)
+        self.add_views(self.kernel, 24 * 3, 2)
+        self.add_views(self.kernel, 24 * 3 + 1, 3)
+        self.add_views(self.kernel, 24 * 8, 4)
+
+        self.assertEqual(trending.compact(NOW), 2)
+        self.assertEqual(
+            list(
+                ArticleViewBucket.objects.order_by("hour").values_list(
+                    "hour", "views"
+                )
+            ),
+            [
+                (datetime(2024, 5, 7, tzinfo=timezone.utc), 5),
+                (datetime(2024, 5, 10, 9, tzinfo=timezone.utc), 1),
+            ],
+        )
+
+    def test_recent_views_weigh_more(self):
+        """Test fewer recent views outrank more older ones"""
+
+        self.add_views(self.kernel, 1, 10)
+        self.add_views(self.shell, 24 * 3, 30)
+
+        scores = trending.scores(NOW)
+        self.assertGreater(scores[self.kernel.pk][1], scores[self.shell.pk][1])
+
+    def test_update(self):
+        """Test leaderboards are stored site-wide and per category"""
+
+        self.add_views(self.kernel, 1, 5)
+        self.add_views(self.shell, 1, 1)
+        self.add_views(self.orm, 1, 3)
+        draft = self.create_article(self.django, "Draft", posted=False)
+        self.add_views(draft, 1, 100)
+
+        self.assertEqual(trending.update(size=2, now=NOW), 3)
+
+        self.assertEqual(
+            [entry["topic"] for entry in trending.leaderboard()],
+            ["Kernel", "ORM"],
+        )
+        self.assertEqual(
+            [entry["topic"] for entry in trending.leaderboard(self.linux.pk)],
+            ["Kernel", "Shell"],
+        )
+        self.assertEqual(TrendingArticle.objects.count(), 5)
+
+    def test_single_cached_read(self):
+        """Test the leaderboard is read from the cache alone"""
+
+        self.add_views(self.kernel, 1, 5)
+        trending.update(now=NOW)
+
+        with self.assertNumQueries(0):
+            board = trending.leaderboard()
+        self.assertEqual(board[0]["slug"], self.kernel.slug)
+
+        cache.clear()
+        with self.assertNumQueries(1):
+            self.assertEqual(trending.leaderboard(), board)
+
+    def test_unpublished(self):
+        """Test unpublishing an article takes it off the boards"""
+
+        self.add_views(self.kernel, 1, 5)
+        self.add_views(self.shell, 1, 1)
+        trending.update(now=NOW)
+        home = self.client.get(reverse("blog:home"))
+        self.assertContains(home, "Kernel")
+
+        self.kernel.posted = False
+        self.kernel.save()
+
+        self.assertEqual(
+            [entry["topic"] for entry in trending.leaderboard()], ["Shell"]
+        )
+        self.assertEqual(
+            [entry["topic"] for entry in trending.leaderboard(self.linux.pk)],
+            ["Shell"],
+        )
+        response = self.client.get(
+            reverse("blog:home"), headers={"if-none-match": home["ETag"]}
+        )
+        self.assertNotContains(response, "Kernel")
+
+    def test_deleted(self):
+        """Test deleting an article takes it off the cached boards"""
+
+        self.add_views(self.kernel, 1, 5)
+        trending.update(now=NOW)
+        self.assertEqual(len(trending.leaderboard()), 1)
+
+        self.kernel.delete()
+        self.assertEqual(trending.leaderboard(), [])
+        self.assertEqual(trending.leaderboard(self.linux.pk), [])
+
+    def test_renamed(self):
+        """Test renaming an article updates the boards ranking it"""
+
+        self.add_views(self.kernel, 1, 5)
+        trending.update(now=NOW)
+        trending.leaderboard()
+
+        self.kernel.topic = "Kernel 2"
+        self.kernel.save()
+        self.assertEqual(trending.leaderboard()[0]["topic"], "Kernel 2")
+
+    def test_home_page(self):
+        """Test the home page shows the popular articles"""
+
+        ArticleViewBucket.objects.create(
+            article=self.orm, hour=trending.bucket_hour(), views=5
+        )
+        home = self.client.get(reverse("blog:home"))
+        call_command("update_trending", stdout=StringIO())
+
+        response = self.client.get(
+            reverse("blog:home"), headers={"if-none-match": home["ETag"]}
+        )
+        self.assertContains(response, "Popular this week")
+        self.assertContains(response, self.orm.get_absolute_url())
@@ -0,0 +1,128 @@
+import shutil
+import tempfile
+from io import BytesIO
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.shortcuts import reverse
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from blog.models import Article, Category
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def image_bytes(format_="PNG", size=(64, 64)):
+    buffer = BytesIO()
+    Image.new("RGB", size, "red").save(buffer, format_)
+    return buffer.getvalue()
+
+
+@override_settings(
+    MEDIA_ROOT=MEDIA_ROOT,
+    BLOG_THUMBNAIL_ASYNC=False,
+    BLOG_THUMBNAIL_MAX_UPLOAD_SIZE=64 * 1024,
+    FILE_UPLOAD_MAX_MEMORY_SIZE=0,
+)
+class ThumbnailUploadTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="minux@test.com", password="testpassword"
+        )
+        cls.category = Category.objects.create(name="Django")
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        self.url = reverse("blog:article_create")
+
+    def post(self, name, content, url=None):
+        data = {
+            "author": self.user.pk,
+            "category": self.category.pk,
+            "topic": "Topic",
+            "body": "Body",
+            "thumbnail": SimpleUploadedFile(name, content),
+        }
+        return self.client.post(url or self.url, data)
+
+    def assertRejected(self, response, message):
+        self.assertEqual(response.status_code, 200)
+        self.assertFormError(response.context["form"], "thumbnail", message)
+        self.assertFalse(Article.objects.exists())
+
+    def test_valid_png(self):
+        """Test valid images are saved"""
+
+        response = self.post("thumb.png", image_bytes())
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(Article.objects.get().thumbnail)
+
+    def test_valid_jpeg(self):
+        """Test jpeg images are saved"""
+
+        response = self.post("thumb.jpg", image_bytes("JPEG"))
+        self.assertEqual(response.status_code, 302)
+
+    def test_extension_rejected(self):
+        """Test files outside the whitelist are rejected"""
+
+        response = self.post("thumb.gif", image_bytes("GIF"))
+        self.assertRejected(
+            response,
+            "File extension “gif” is not allowed. "
+            "Allowed extensions are: png, jpg, jpeg.",
+        )
+
+    def test_oversize_rejected(self):
+        """Test files over the limit are rejected"""
+
+        content = image_bytes() + b"\0" * 64 * 1024
+        response = self.post("thumb.png", content)
+        self.assertRejected(response, "Thumbnail cannot exceed 0.1Mb")
+
+    def test_bad_magic_rejected(self):
+        """Test files that aren't images are rejected"""
+
+        response = self.post("thumb.jpeg", b"a" * 1024)
+        self.assertRejected(response, "Thumbnail must be a PNG or JPEG image")
+
+    def test_mismatched_content_rejected(self):
+        """Test images of another format are rejected"""
+
+        response = self.post("thumb.png", image_bytes("GIF"))
+        self.assertRejected(response, "Thumbnail must be a PNG or JPEG image")
+
+    def test_truncated_header_rejected(self):
+        """Test files without a complete image header are rejected"""
+
+        response = self.post("thumb.png", image_bytes()[:12])
+        self.assertIn("thumbnail", response.context["form"].errors)
+        self.assertFalse(Article.objects.exists())
+
+    def test_update_accepts_thumbnail(self):
+        """Test the update view takes uploads too"""
+
+        self.post("thumb.png", image_bytes())
+        article = Article.objects.get()
+
+        url = reverse("blog:article_update", kwargs={"slug": article.slug})
+        response = self.post("new.png", image_bytes(), url=url)
+
+        self.assertEqual(response.status_code, 302)
+        article.refresh_from_db()
+        self.assertIn("new", article.thumbnail.name)
+
+    def test_csrf_still_enforced(self):
+        """Test the views still require a CSRF token"""
+
+        client = self.client_class(enforce_csrf_checks=True)
+        client.force_login(self.user)
+        response = client.post(self.url, {"topic": "Topic"})
+        self.assertEqual(response.status_code, 403)
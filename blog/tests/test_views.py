@@ -1,13 +1,16 @@
 from re import template
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.shortcuts import reverse
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import resolve
 
+from blog import related
+from blog.counters import view_counter
 from blog.forms import ArticleForm
-from blog.models import Article, Category
+from blog.models import Article, Category, RelatedArticle
 from blog.views import (
     article_create,
     article_details,
@@ -237,6 +240,57 @@ class ArticleUpdateView(TestCase):
         self.assertEqual(resolve(url).func, article_details)
 
 
+class SaveDraftTest(TestCase):
+    """Test where saving an article leads to"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(name="category 1")
+        cls.user = get_user_model().objects.create_user(
+            email="minux@test.com", password="test"
+        )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        self.form_data = {
+            "author": self.user.pk,
+            "category": self.category.pk,
+            "topic": "My draft",
+            "body": "Body",
+        }
+
+    def test_create_draft(self):
+        """Test saving a new draft leads to the dashboard"""
+
+        response = self.client.post(
+            reverse("blog:article_create"), data=self.form_data
+        )
+        self.assertRedirects(response, reverse("blog:dashboard"))
+        self.assertFalse(Article.objects.get().posted)
+
+    def test_update_draft(self):
+        """Test saving a draft again leads to the dashboard"""
+
+        article = Article.objects.create(
+            author=self.user, category=self.category, topic="My draft"
+        )
+        url = reverse("blog:article_update", kwargs={"slug": article.slug})
+        self.form_data["body"] = "Edited"
+
+        response = self.client.post(url, data=self.form_data)
+        self.assertRedirects(response, reverse("blog:dashboard"))
+
+    def test_create_posted(self):
+        """Test saving a posted article leads to its page"""
+
+        self.form_data["posted"] = True
+        response = self.client.post(
+            reverse("blog:article_create"), data=self.form_data
+        )
+        article = Article.objects.get()
+        self.assertRedirects(response, article.get_absolute_url())
+
+
 class DashboardTest(TestCase):
     def setUp(self):
         self.url = reverse("blog:dashboard")
@@ -265,3 +319,235 @@ class DashboardTest(TestCase):
 
     def test_redirect_to_update_view(self):
         """Test if delete link redirect to article update view"""
+
+
+class DashboardStatsTest(TestCase):
+    """Test the dashboard is scoped to its author with cached stats"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="minux@test.com", password="test"
+        )
+        cls.other = get_user_model().objects.create_user(
+            email="other@test.com", password="test"
+        )
+        cls.linux = Category.objects.create(name="Linux")
+        cls.django = Category.objects.create(name="Django")
+        cls.create_article(cls.user, cls.linux, "Kernel", True, 10)
+        cls.create_article(cls.user, cls.linux, "Shell", False, 0)
+        cls.create_article(cls.user, cls.django, "ORM", True, 5)
+        cls.create_article(cls.other, cls.linux, "Other topic", True, 99)
+
+    @classmethod
+    def create_article(cls, author, category, topic, posted, views):
+        return Article.objects.create(
+            author=author,
+            category=category,
+            topic=topic,
+            body="<p>Body</p>",
+            posted=posted,
+            views=views,
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def stats(self):
+        return self.client.get(reverse("blog:dashboard")).context["stats"]
+
+    def test_own_articles_only(self):
+        """Test the dashboard lists the author's articles only"""
+
+        response = self.client.get(reverse("blog:dashboard"))
+        topics = {article.topic for article in response.context["articles"]}
+        self.assertEqual(topics, {"Kernel", "Shell", "ORM"})
+
+    def test_stats(self):
+        """Test per-category and total counts of the author"""
+
+        stats = self.stats()
+        self.assertEqual(
+            [
+                (row["category__name"], row["articles"], row["drafts"])
+                for row in stats["categories"]
+            ],
+            [("Django", 1, 0), ("Linux", 2, 1)],
+        )
+        self.assertEqual(
+            (stats["articles"], stats["published"], stats["drafts"]),
+            (3, 2, 1),
+        )
+        self.assertEqual(stats["views"], 15)
+
+    def test_invalidate_on_save(self):
+        """Test the author's saves refresh the stats, others' don't"""
+
+        self.stats()
+        self.create_article(self.other, self.django, "Elsewhere", True, 1)
+        with self.assertNumQueries(3):
+            self.stats()
+
+        self.create_article(self.user, self.django, "Views", False, 0)
+        self.assertEqual(self.stats()["drafts"], 2)
+
+
+class ListingQueryCountTest(TestCase):
+    """Listing pages run a fixed number of queries whatever the page size"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="minux@test.com", password="test"
+        )
+        for i in range(8):
+            Article.objects.create(
+                author=cls.user,
+                category=Category.objects.create(name=f"category {i}"),
+                topic=f"Topic {i}",
+                body=f"<p>Body {i} &amp; more</p>",
+                posted=True,
+            )
+        cls.article = Article.objects.first()
+        RelatedArticle.objects.bulk_create(
+            RelatedArticle(
+                article=cls.article, related=related, rank=rank, score=1
+            )
+            for rank, related in enumerate(
+                Article.objects.exclude(pk=cls.article.pk)[:6]
+            )
+        )
+
+    def test_excerpt(self):
+        """Test excerpt is plain text rendered from the body"""
+
+        self.assertEqual(self.article.excerpt, "Body 0 & more")
+
+    def test_home_queries(self):
+        """Test home queries don't grow with the number of articles"""
+
+        # The articles, the category sidebar and trending articles
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("blog:home"))
+        self.assertContains(response, "category 7")
+
+    def test_search_queries(self):
+        """Test search results don't query per article"""
+
+        with self.assertNumQueries(2):
+            response = self.client.post(
+                reverse("blog:home"), {"query": "body"}
+            )
+        self.assertContains(response, "category 7")
+
+    def test_dashboard_queries(self):
+        """Test dashboard queries don't grow with the number of articles"""
+
+        self.client.force_login(self.user)
+        # Session, user, stats and the articles
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse("blog:dashboard"))
+        self.assertContains(response, "category 7")
+
+        # Stats come from the cache until the author saves again
+        with self.assertNumQueries(3):
+            self.client.get(reverse("blog:dashboard"))
+
+    def test_article_details_queries(self):
+        """Test related articles don't query per article"""
+
+        # The article and its related articles, no session
+        with self.assertNumQueries(2):
+            response = self.client.get(self.article.get_absolute_url())
+        self.assertEqual(response.content.count(b"<h3>"), 6)
+
+
+@override_settings(
+    BLOG_VIEW_COUNT_FLUSH_INTERVAL=3600, BLOG_VIEW_COUNT_MAX_PENDING=1000
+)
+class ArticleDetailsCacheTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="minux@test.com", password="test"
+        )
+        cls.category = Category.objects.create(name="category 1")
+        cls.article = Article.objects.create(
+            author=cls.user,
+            category=cls.category,
+            topic="Topic 1",
+            body="Body 1",
+            posted=True,
+        )
+        cls.other = Article.objects.create(
+            author=cls.user,
+            category=cls.category,
+            topic="Topic 2",
+            body="Body 2",
+            posted=True,
+        )
+        related.build()
+
+    def setUp(self):
+        view_counter.clear()
+        self.url = self.article.get_absolute_url()
+        self.client.get(self.url)
+
+    def tearDown(self):
+        view_counter.clear()
+
+    def test_cached_page_skips_database(self):
+        """Test a cached article is served without article queries"""
+
+        # Readers have no session to look up or save
+        with self.assertNumQueries(0):
+            response = self.client_class().get(self.url)
+        self.assertContains(response, "Body 1")
+        self.assertContains(response, "Topic 2")
+
+    def test_views_outside_cached_fragment(self):
+        """Test view counts change while the fragment stays cached"""
+
+        response = self.client_class().get(self.url)
+        self.assertEqual(response.context["views"], 2)
+
+        view_counter.flush()
+        response = self.client_class().get(self.url)
+        self.assertEqual(response.context["views"], 3)
+
+    def test_invalidate_on_article_save(self):
+        """Test saving the article refreshes its page"""
+
+        self.article.body = "Edited body"
+        self.article.save()
+
+        self.assertContains(self.client.get(self.url), "Edited body")
+
+    def test_invalidate_on_related_article_save(self):
+        """Test saving another article refreshes the related list"""
+
+        self.other.topic = "Renamed topic"
+        self.other.save()
+
+        self.assertContains(self.client.get(self.url), "Renamed topic")
+
+    def test_invalidate_on_category_save(self):
+        """Test renaming the category refreshes its articles' pages"""
+
+        self.category.name = "renamed category"
+        self.category.save()
+
+        self.assertContains(self.client.get(self.url), "renamed category")
+
+    def test_invalidate_old_slug_on_rename(self):
+        """Test renaming an article redirects its old slug"""
+
+        self.article.topic = "Moved"
+        self.article.save()
+
+        self.assertRedirects(
+            self.client.get(self.url),
+            self.article.get_absolute_url(),
+            status_code=301,
+        )
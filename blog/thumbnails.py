@@ -0,0 +1,133 @@
+"""
+Resized WebP and JPEG variants of article thumbnails, generated off the
+request thread and stored in a ``variants`` directory next to the
+original upload, named after the whole original name so that no two
+uploads share a variant.
+"""
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connections
+from PIL import Image, ImageOps
+
+from blog.cache import article_scope, bump_versions
+
+logger = logging.getLogger(__name__)
+
+FORMATS = {"webp": "WEBP", "jpeg": "JPEG"}
+
+_executor = None
+
+
+def variant_name(name, width, extension):
+    directory, filename = os.path.split(name)
+    return os.path.join(
+        directory, "variants", f"{filename}_{width}w.{extension}"
+    )
+
+
+def variant_names(name, widths):
+    return [
+        variant_name(name, width, extension)
+        for width in widths
+        for extension in FORMATS
+    ]
+
+
+def target_widths(width):
+    """Configured widths below ``width``, or ``width`` itself if none."""
+    widths = [w for w in settings.BLOG_THUMBNAIL_WIDTHS if w < width]
+    return widths or [width]
+
+
+def render_variants(image):
+    """Yield ``(width, extension, bytes)`` for each variant of ``image``."""
+    image = ImageOps.exif_transpose(image)
+    for width in target_widths(image.width):
+        height = max(1, round(image.height * width / image.width))
+        resized = image.resize((width, height), Image.Resampling.LANCZOS)
+
+        for extension, format_ in FORMATS.items():
+            variant = resized
+            if format_ == "JPEG" and variant.mode != "RGB":
+                variant = variant.convert("RGB")
+            elif variant.mode not in ("RGB", "RGBA"):
+                variant = variant.convert("RGBA")
+
+            buffer = BytesIO()
+            variant.save(
+                buffer,
+                format_,
+                quality=settings.BLOG_THUMBNAIL_QUALITY,
+                optimize=format_ == "JPEG",
+            )
+            yield width, extension, buffer.getvalue()
+
+
+def delete_variants(name, widths):
+    """Delete the variants of the image ``name`` in ``widths``."""
+    for path in variant_names(name, widths):
+        default_storage.delete(path)
+
+
+def generate(article_id):
+    """Create the variants of an article's current thumbnail."""
+    from blog.models import Article
+
+    article = (
+        Article.objects.filter(pk=article_id)
+        .only("slug", "thumbnail", "thumbnail_widths")
+        .first()
+    )
+    if article is None or not article.thumbnail:
+        return []
+
+    name = article.thumbnail.name
+    with article.thumbnail.open("rb") as original:
+        with Image.open(original) as image:
+            variants = list(render_variants(image))
+
+    widths = sorted({width for width, _, _ in variants})
+    for width, extension, content in variants:
+        path = variant_name(name, width, extension)
+        default_storage.delete(path)
+        default_storage.save(path, ContentFile(content))
+
+    # The thumbnail may have been replaced while this was running
+    updated = Article.objects.filter(pk=article_id, thumbnail=name).update(
+        thumbnail_widths=widths
+    )
+    if updated:
+        bump_versions(article_scope(article.slug))
+    else:
+        delete_variants(name, widths)
+    return widths
+
+
+def _generate_in_worker(article_id):
+    try:
+        return generate(article_id)
+    except Exception:
+        logger.exception("Thumbnail variants failed for %s", article_id)
+    finally:
+        connections.close_all()
+
+
+def schedule(article_id):
+    """Generate variants in the worker pool, or inline when disabled."""
+    global _executor
+
+    if not settings.BLOG_THUMBNAIL_ASYNC:
+        return generate(article_id)
+
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.BLOG_THUMBNAIL_WORKERS,
+            thread_name_prefix="thumbnails",
+        )
+    return _executor.submit(_generate_in_worker, article_id)
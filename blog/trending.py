@@ -0,0 +1,250 @@
+"""
+Trending articles, ranked by their recent views with older views
+weighing less.
+
+Flushed view counts are also added to hourly buckets. ``compact`` merges
+the buckets older than BLOG_TRENDING_HOURLY_HOURS into daily ones and
+drops those that left the BLOG_TRENDING_WINDOW_HOURS window. ``update``
+ranks the published articles, site-wide and per category, and stores the
+leaderboards in the TrendingArticle table and in the cache, where pages
+read them with a single lookup. The update_trending command runs both and
+is meant to be scheduled. Articles unpublished, moved or deleted in
+between leave the boards at once, see ``forget``.
+"""
+import heapq
+from collections import defaultdict
+from datetime import timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Sum
+from django.db.models.functions import TruncDay
+from django.utils import timezone
+
+from blog.cache import TRENDING, bump_versions, make_key
+
+LEADERBOARD_FIELDS = (
+    "category_id",
+    "article_id",
+    "article__topic",
+    "article__slug",
+    "score",
+)
+
+
+def bucket_hour(now=None):
+    """Start of the hour holding ``now``."""
+    return (now or timezone.now()).replace(minute=0, second=0, microsecond=0)
+
+
+def window_start(now=None):
+    hours = settings.BLOG_TRENDING_WINDOW_HOURS
+    return bucket_hour(now) - timedelta(hours=hours)
+
+
+def record(pending, now=None):
+    """Add ``{article_id: views}`` to the buckets of the current hour."""
+    from blog.models import Article, ArticleViewBucket
+
+    hour = bucket_hour(now)
+    # Articles deleted since they were viewed have nothing to count
+    pks = Article.objects.filter(pk__in=pending).values_list("pk", flat=True)
+    by_increment = defaultdict(list)
+    for pk in pks:
+        by_increment[pending[pk]].append(pk)
+    if not by_increment:
+        return
+
+    ArticleViewBucket.objects.bulk_create(
+        [
+            ArticleViewBucket(article_id=pk, hour=hour)
+            for pks in by_increment.values()
+            for pk in pks
+        ],
+        ignore_conflicts=True,
+    )
+    for n, pks in by_increment.items():
+        ArticleViewBucket.objects.filter(article_id__in=pks, hour=hour).update(
+            views=F("views") + n
+        )
+
+
+def compact(now=None):
+    """
+    Merge hourly buckets older than BLOG_TRENDING_HOURLY_HOURS into daily
+    ones and delete those out of the window; return the rows removed.
+    """
+    from blog.models import ArticleViewBucket
+
+    now = now or timezone.now()
+    # Whole days only, so no day has both daily and hourly buckets
+    cutoff = now - timedelta(hours=settings.BLOG_TRENDING_HOURLY_HOURS)
+    cutoff = cutoff.astimezone(dt_timezone.utc).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    buckets = ArticleViewBucket.objects
+
+    with transaction.atomic():
+        expired, _ = buckets.filter(hour__lt=window_start(now)).delete()
+        old = buckets.filter(hour__lt=cutoff)
+        days = [
+            ArticleViewBucket(article_id=pk, hour=day, views=views)
+            for pk, day, views in old.annotate(
+                day=TruncDay("hour", tzinfo=dt_timezone.utc)
+            )
+            .values("article_id", "day")
+            .annotate(total=Sum("views"))
+            .order_by()
+            .values_list("article_id", "day", "total")
+        ]
+        merged, _ = old.delete()
+        buckets.bulk_create(days, batch_size=1000)
+    return expired + merged - len(days)
+
+
+def scores(now=None):
+    """
+    Decayed view counts of the published articles viewed in the window,
+    as ``{article_id: (category_id, score)}``. Views lose half their
+    weight every BLOG_TRENDING_HALF_LIFE_HOURS.
+    """
+    from blog.models import ArticleViewBucket
+
+    now = now or timezone.now()
+    half_life = settings.BLOG_TRENDING_HALF_LIFE_HOURS * 3600
+    rows = ArticleViewBucket.objects.filter(
+        hour__gte=window_start(now), article__posted=True
+    ).values_list("article_id", "article__category_id", "hour", "views")
+
+    found = {}
+    for pk, category_id, hour, views in rows.iterator(chunk_size=2000):
+        age = max((now - hour).total_seconds(), 0)
+        _, score = found.get(pk, (category_id, 0.0))
+        found[pk] = (category_id, score + views * 0.5 ** (age / half_life))
+    return found
+
+
+def rank(scores, size):
+    """
+    Top ``size`` ``(score, article_id)`` pairs per category, and
+    site-wide under None.
+    """
+    by_category = defaultdict(list)
+    for pk, (category_id, score) in scores.items():
+        by_category[category_id].append((score, pk))
+
+    site = ((score, pk) for pk, (_, score) in scores.items())
+    boards = {None: heapq.nlargest(size, site)}
+    for category_id, entries in by_category.items():
+        boards[category_id] = heapq.nlargest(size, entries)
+    return boards
+
+
+def _key(category_id):
+    return make_key("trending", category_id or "site")
+
+
+def _boards(rows):
+    boards = defaultdict(list)
+    for category_id, pk, topic, slug, score in rows:
+        boards[category_id].append(
+            {"pk": pk, "topic": topic, "slug": slug, "score": score}
+        )
+    return boards
+
+
+def update(size=None, now=None):
+    """
+    Recompute and store every leaderboard; return how many articles were
+    ranked.
+    """
+    from blog.models import TrendingArticle
+
+    size = size or settings.BLOG_TRENDING_SIZE
+    found = scores(now)
+    entries = [
+        TrendingArticle(
+            category_id=category_id, article_id=pk, rank=position, score=score
+        )
+        for category_id, board in rank(found, size).items()
+        for position, (score, pk) in enumerate(board)
+    ]
+
+    stale = set(
+        TrendingArticle.objects.values_list("category_id", flat=True)
+    )
+    with transaction.atomic():
+        TrendingArticle.objects.all().delete()
+        TrendingArticle.objects.bulk_create(entries, batch_size=1000)
+
+    boards = _boards(
+        TrendingArticle.objects.order_by("category_id", "rank").values_list(
+            *LEADERBOARD_FIELDS
+        )
+    )
+    cache.delete_many([_key(category_id) for category_id in stale])
+    cache.set_many(
+        {
+            _key(category_id): boards.get(category_id, [])
+            for category_id in boards.keys() | {None}
+        },
+        None,
+    )
+    bump_versions(TRENDING)
+    return len(found)
+
+
+def drop_cached(category_ids):
+    """Drop the cached leaderboards of ``category_ids``, None site-wide."""
+    cache.delete_many([_key(category_id) for category_id in category_ids])
+    bump_versions(TRENDING)
+
+
+def forget(article_id, keep=False):
+    """
+    Take ``article_id`` off the leaderboards until the next update, or
+    with ``keep`` only reload the boards ranking it, e.g. on a rename.
+    """
+    from blog.models import TrendingArticle
+
+    ranked = TrendingArticle.objects.filter(article_id=article_id)
+    category_ids = set(ranked.values_list("category_id", flat=True))
+    if not category_ids:
+        return
+    if not keep:
+        ranked.delete()
+    drop_cached(category_ids)
+
+
+def _leaderboard_rows(category_id):
+    from blog.models import TrendingArticle
+
+    return (
+        TrendingArticle.objects.filter(category_id=category_id)
+        .order_by("rank")
+        .values_list(*LEADERBOARD_FIELDS)
+    )
+
+
+def leaderboard(category_id=None):
+    """
+    Trending articles as of the last update, site-wide or of a category,
+    as ``{"pk", "topic", "slug", "score"}`` dicts.
+    """
+    key = _key(category_id)
+    board = cache.get(key)
+    if board is None:
+        board = _boards(_leaderboard_rows(category_id))[category_id]
+        cache.set(key, board, None)
+    return board
+
+
+async def aleaderboard(category_id=None):
+    key = _key(category_id)
+    board = await cache.aget(key)
+    if board is None:
+        rows = [row async for row in _leaderboard_rows(category_id)]
+        board = _boards(rows)[category_id]
+        await cache.aset(key, board, None)
+    return board
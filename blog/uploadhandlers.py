@@ -0,0 +1,125 @@
+"""
+Streaming validation of thumbnail uploads.
+
+The handler checks the extension, the size, the magic bytes and the image
+header while the upload is read, abandoning the rest of the file on the
+first problem. Accepted files are spooled to a temporary file on disk,
+which the file system storage moves into place instead of copying.
+"""
+import os
+from functools import wraps
+
+from django.conf import settings
+from django.core.files.uploadhandler import (
+    SkipFile,
+    TemporaryFileUploadHandler,
+)
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+from PIL import Image, ImageFile
+
+ALLOWED_EXTENSIONS = ("png", "jpg", "jpeg")
+SIGNATURES = {
+    "PNG": b"\x89PNG\r\n\x1a\n",
+    "JPEG": b"\xff\xd8\xff",
+}
+SIGNATURE_LENGTH = max(map(len, SIGNATURES.values()))
+
+
+class ThumbnailUploadHandler(TemporaryFileUploadHandler):
+    field_name = "thumbnail"
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.active = False
+        if request is not None and not hasattr(request, "upload_errors"):
+            request.upload_errors = {}
+
+    def reject(self, message):
+        self.request.upload_errors[self.field_name] = message
+        raise SkipFile(message)
+
+    def new_file(self, field_name, file_name, *args, **kwargs):
+        self.active = field_name == self.field_name
+        if not self.active:
+            return
+
+        extension = os.path.splitext(file_name)[1].lstrip(".").lower()
+        if extension not in ALLOWED_EXTENSIONS:
+            self.reject(
+                f"File extension “{extension}” is not allowed. Allowed "
+                f"extensions are: {', '.join(ALLOWED_EXTENSIONS)}."
+            )
+
+        self.size = 0
+        self.head = b""
+        self.parser = ImageFile.Parser()
+        self.image = None
+        super().new_file(field_name, file_name, *args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        if not self.active:
+            return raw_data
+
+        self.size += len(raw_data)
+        limit = settings.BLOG_THUMBNAIL_MAX_UPLOAD_SIZE
+        if self.size > limit:
+            self.reject(f"Thumbnail cannot exceed {limit / 1024**2:.1f}Mb")
+
+        if len(self.head) < SIGNATURE_LENGTH:
+            self.head += raw_data[:SIGNATURE_LENGTH]
+            if len(self.head) >= SIGNATURE_LENGTH and not any(
+                self.head.startswith(sig) for sig in SIGNATURES.values()
+            ):
+                self.reject("Thumbnail must be a PNG or JPEG image")
+
+        if self.image is None:
+            self.inspect(raw_data)
+
+        return super().receive_data_chunk(raw_data, start)
+
+    def inspect(self, raw_data):
+        """Feed the image parser until it has read the image header."""
+        try:
+            self.parser.feed(raw_data)
+        except Exception:
+            self.reject("Thumbnail is not a valid image")
+
+        image = self.parser.image
+        if image is None:
+            return
+        if image.format not in SIGNATURES:
+            self.reject("Thumbnail must be a PNG or JPEG image")
+        if image.width * image.height > Image.MAX_IMAGE_PIXELS:
+            self.reject("Thumbnail dimensions are too large")
+        # Stop feeding, the parser would otherwise decode the whole image
+        self.image = image
+
+    def file_complete(self, file_size):
+        if not self.active:
+            return None
+
+        self.active = False
+        if self.image is None:
+            self.request.upload_errors[self.field_name] = (
+                "Thumbnail is not a valid image"
+            )
+        return super().file_complete(file_size)
+
+
+def stream_thumbnail_uploads(view):
+    """
+    Validate thumbnails with ``ThumbnailUploadHandler`` as they upload.
+
+    Upload handlers must be installed before anything reads
+    ``request.POST``, the CSRF middleware included, so the CSRF check runs
+    inside the view instead.
+    """
+    protected = csrf_protect(view)
+
+    @csrf_exempt
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        request.upload_handlers.insert(0, ThumbnailUploadHandler(request))
+        return protected(request, *args, **kwargs)
+
+    return wrapper
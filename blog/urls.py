@@ -2,20 +2,32 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.urls import path
 
-from . import views
+from . import async_views, views
 
 app_name = "blog"
 
+
+def view(name):
+    """The async variant of a view when BLOG_ASYNC_VIEWS lists it."""
+    module = async_views if name in settings.BLOG_ASYNC_VIEWS else views
+    return getattr(module, name)
+
+
 urlpatterns = [
-    path("", views.home, name="home"),
-    path("dashboard/", views.dashboard, name="dashboard"),
+    path("", view("home"), name="home"),
+    path("dashboard/", view("dashboard"), name="dashboard"),
+    path(
+        "category/<int:pk>/",
+        view("category_articles"),
+        name="category",
+    ),
     path("article/create/", views.article_create, name="article_create"),
     path(
         "article/update/<slug>/", views.article_update, name="article_update"
     ),
     path(
         "article/details/<slug>/",
-        views.article_details,
+        view("article_details"),
         name="article_details",
     ),
     path(
@@ -0,0 +1,38 @@
+"""
+Articles a reader was already counted a view for, kept in a signed cookie
+rather than the session so reading articles never writes a session row.
+
+The cookie holds the ids of the last BLOG_VIEWED_COOKIE_SIZE articles
+counted, in base 36. Older ones fall off and are counted again, which
+keeps the cookie small however much someone reads.
+"""
+from django.conf import settings
+from django.utils.http import int_to_base36
+
+SALT = "blog.viewed"
+
+
+def read(request):
+    """Ids of the articles the reader of ``request`` was counted for."""
+    value = request.get_signed_cookie(
+        settings.BLOG_VIEWED_COOKIE, default="", salt=SALT
+    )
+    try:
+        return [int(pk, 36) for pk in value.split(".") if pk]
+    except ValueError:
+        return []
+
+
+def remember(response, viewed, pk):
+    """Add ``pk`` to the ``viewed`` ids sent back with ``response``."""
+    viewed = [*viewed, pk][-settings.BLOG_VIEWED_COOKIE_SIZE :]
+    response.set_signed_cookie(
+        settings.BLOG_VIEWED_COOKIE,
+        ".".join(map(int_to_base36, viewed)),
+        salt=SALT,
+        max_age=settings.BLOG_VIEWED_COOKIE_AGE,
+        secure=settings.SESSION_COOKIE_SECURE,
+        httponly=True,
+        samesite="Lax",
+    )
+    return response
@@ -1,66 +1,353 @@
+import hashlib
+
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
-from django.db import transaction
-from django.db.models import Q
+from django.core.cache import cache
+from django.http import Http404
+from django.middleware.csrf import get_token
 from django.shortcuts import redirect, render
+from django.template.loader import render_to_string
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from django.utils.http import http_date, quote_etag
 
+from blog import search, slugs, trending, viewed
+from blog.cache import (
+    ARTICLES,
+    CATEGORIES,
+    TRENDING,
+    article_scope,
+    author_scope,
+    category_scope,
+    get_stamps,
+    get_versions,
+    make_key,
+    slug_digest,
+)
+from blog.counters import view_counter
 from blog.forms import ArticleForm
-from blog.models import Article
+from blog.models import Article, Category
+from blog.pagination import KeysetPaginator
+from blog.uploadhandlers import stream_thumbnail_uploads
+
+
+def paginate(request, queryset):
+    paginator = KeysetPaginator(queryset, settings.BLOG_PAGE_SIZE)
+    return paginator.page(
+        after=request.GET.get("after"), before=request.GET.get("before")
+    )
+
+
+async def apaginate(request, queryset):
+    paginator = KeysetPaginator(queryset, settings.BLOG_PAGE_SIZE)
+    return await paginator.apage(
+        after=request.GET.get("after"), before=request.GET.get("before")
+    )
+
+
+def page_validators(parts, modified):
+    """
+    ETag and Last-Modified of a page built from version stamps: ``parts``
+    identify the page and the versions it was built from, ``modified``
+    are the times those versions changed.
+    """
+    digest = hashlib.md5(":".join(map(str, parts)).encode()).hexdigest()
+    return quote_etag(digest), int(max(modified))
+
+
+def home_validators(request, versions, modified):
+    """
+    Validators of a home page. The page carries the CSRF token of the
+    search form, which signing in rotates, so the token is part of it.
+    """
+    # Creates the secret on a first visit, as rendering the form would
+    get_token(request)
+    token = request.META["CSRF_COOKIE"]
+    parts = ["home", request.GET.urlencode(), token, *versions]
+    return page_validators(parts, modified)
+
+
+def revalidate(response):
+    """
+    Make clients check every reuse of ``response`` with its validators,
+    and keep it out of shared caches: pages depend on the reader's cookies.
+    """
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ["Cookie"])
+    return response
+
+
+def not_modified(request, etag, last_modified):
+    """The 304 response when the client's copy is current, else None."""
+    if request.method not in ("GET", "HEAD"):
+        return None
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    return response and revalidate(response)
+
+
+def set_validators(response, etag, last_modified):
+    response.headers["ETag"] = etag
+    response.headers["Last-Modified"] = http_date(last_modified)
+    return revalidate(response)
 
 
 def home(request):
+    page, validators = None, None
     if request.method == "POST":
         query = request.POST["query"]
-        articles = Article.objects.filter(
-            Q(topic__icontains=query) | Q(body__icontains=query)
+        articles = search.get_backend().search(
+            query, limit=settings.BLOG_SEARCH_LIMIT
         )
     else:
-        articles = Article.objects.all()
+        versions, modified = get_stamps(ARTICLES, CATEGORIES, TRENDING)
+        validators = home_validators(request, versions, modified)
+        if response := not_modified(request, *validators):
+            return response
+        page = paginate(request, Article.published.for_listing())
+        articles = page.object_list
+
+    context = {
+        "articles": articles,
+        "page": page,
+        "categories": category_sidebar(),
+        "trending": trending.leaderboard(),
+    }
+    response = render(request, "blog/home.html", context=context)
+    return set_validators(response, *validators) if validators else response
+
+
+def category_sidebar(version=None):
+    """
+    Every category with its ``published_post``, for the sidebar. ``version``
+    is that of the CATEGORIES scope, when the caller already has it.
+    """
+    if version is None:
+        (version,) = get_versions(CATEGORIES)
+    key = make_key("categories", version)
+    categories = cache.get(key)
+    if categories is None:
+        categories = list(
+            Category.objects.order_by("name").values(
+                "pk", "name", "published_post"
+            )
+        )
+        cache.set(key, categories, settings.BLOG_PAGE_CACHE_TIMEOUT)
+    return categories
+
+
+def find_category(categories, pk):
+    for category in categories:
+        if category["pk"] == pk:
+            return category
+    raise Http404("No category found matching the query")
+
+
+def category_page_key(pk, query, versions):
+    digest = hashlib.md5(query.encode()).hexdigest()
+    return make_key("category_page", pk, digest, *versions)
+
+
+def category_articles(request, pk):
+    versions, modified = get_stamps(category_scope(pk), CATEGORIES)
+    query = request.GET.urlencode()
+    validators = page_validators(["category", pk, query, *versions], modified)
+    if response := not_modified(request, *validators):
+        return response
+
+    categories = category_sidebar(versions[1])
+    category = find_category(categories, pk)
+
+    # Pages of a category stay cached until one of its articles changes
+    key = category_page_key(pk, query, versions)
+    page = cache.get(key)
+    if page is None:
+        articles = Article.published.filter(category_id=pk).for_listing()
+        page = paginate(request, articles)
+        cache.set(key, page, settings.BLOG_CATEGORY_PAGE_CACHE_TIMEOUT)
+
+    context = {
+        "category": category,
+        "articles": page.object_list,
+        "page": page,
+        "categories": categories,
+    }
+    response = render(request, "blog/category.html", context=context)
+    return set_validators(response, *validators)
+
 
-    return render(request, "blog/home.html", context={"articles": articles})
+def get_article(slug, published=False):
+    """
+    Load the article at ``slug``, or the one renamed from it. Resolved
+    slugs are looked up by primary key, cold ones by slug directly. With
+    ``published`` drafts are not found.
+    """
+    manager = Article.published if published else Article.objects
+    articles = manager.select_related("category")
+    found = slugs.lookup(slug)
+    if found is not None:
+        article = articles.filter(pk=found[0]).first()
+        if article is not None and article.slug == found[1]:
+            return article
+        # Renamed or deleted since this process cached it
+        slugs.forget(slug)
 
+    article = articles.filter(slug=slug).first()
+    if article is None:
+        pk = slugs.redirect_target(slug)
+        article = articles.filter(pk=pk).first() if pk else None
+    if article is None:
+        raise Http404("No article found matching the slug")
 
-def get_article(slug):
-    return Article.objects.get(slug=slug)
+    slugs.remember(slug, article.pk, article.slug)
+    return article
+
+
+def fragment_keys(slug, article_version, articles_version):
+    digest = slug_digest(slug)
+    return (
+        make_key("article", digest, article_version),
+        make_key("related", digest, articles_version),
+    )
+
+
+def render_article_fragment(article):
+    return {
+        "pk": article.pk,
+        "slug": article.slug,
+        "category": str(article.category),
+        "updated_on": article.updated_on,
+        "html": render_to_string(
+            "blog/article_body.html", {"article": article}
+        ),
+    }
+
+
+def related_articles_of(pk):
+    return (
+        Article.published.for_listing()
+        .filter(related_to__article_id=pk)
+        .order_by("related_to__rank")
+    )
+
+
+def render_related_fragment(related_articles):
+    return render_to_string(
+        "blog/related_articles.html", {"related_articles": related_articles}
+    )
+
+
+def article_fragments(slug, versions=None):
+    """
+    Return the rendered article and related articles for ``slug``, from
+    the cache when their versions are current, along with the stored view
+    count when the article had to be loaded. For an old slug only the
+    article's pk and current slug are returned. ``versions`` are those of
+    the article and ARTICLES scopes, when the caller already has them.
+    """
+    if versions is None:
+        versions = get_versions(article_scope(slug), ARTICLES)
+    article_key, related_key = fragment_keys(slug, *versions)
+    cached = cache.get_many([article_key, related_key])
+    timeout = settings.BLOG_PAGE_CACHE_TIMEOUT
+
+    article, views = cached.get(article_key), None
+    if article is None:
+        found = slugs.lookup(slug)
+        if found is not None and found[1] != slug:
+            # Old slug, article_details redirects to the current one
+            return {"pk": found[0], "slug": found[1]}, None, None
+
+        instance = get_article(slug, published=True)
+        if instance.slug != slug:
+            return {"pk": instance.pk, "slug": instance.slug}, None, None
+        article = render_article_fragment(instance)
+        views = instance.views
+        cache.set(article_key, article, timeout)
+
+    related = cached.get(related_key)
+    if related is None:
+        related = render_related_fragment(related_articles_of(article["pk"]))
+        cache.set(related_key, related, timeout)
+
+    return article, related, views
 
 
-@transaction.atomic()
 def article_details(request, slug):
-    article = get_article(slug)
-    id_ = article.pk
+    # Answered from the version stamps alone when the client is current
+    versions, modified = get_stamps(article_scope(slug), ARTICLES)
+    validators = page_validators(["article", slug, *versions], modified)
+    if response := not_modified(request, *validators):
+        return response
+
+    article, related, views = article_fragments(slug, versions)
+    if article["slug"] != slug:
+        return redirect(
+            "blog:article_details", slug=article["slug"], permanent=True
+        )
+    id_ = article["pk"]
 
-    instance_id = request.session.get(f"instance_{id_}", 0)
-    if instance_id != article.pk:
-        article.views += 1
-        article.save()
-        request.session[f"instance_{id_}"] = article.pk
+    # Counted once per reader, without touching the session
+    seen = viewed.read(request)
+    if id_ not in seen:
+        view_counter.incr(id_)
 
-    related_articles = Article.objects.all().exclude(slug=slug)[:6]
-    context = {"article": article, "related_articles": related_articles}
-    return render(request, "blog/article_details.html", context=context)
+    context = {
+        "article": article,
+        "related_html": related,
+        "views": view_counter.total(id_, stored=views),
+    }
+    response = render(request, "blog/article_details.html", context=context)
+    if id_ not in seen:
+        viewed.remember(response, seen, id_)
+    return set_validators(response, *validators)
 
 
 # Management
+def redirect_saved(article):
+    # Drafts have no public page until they are posted
+    if article.posted:
+        return redirect(article.get_absolute_url())
+    return redirect("blog:dashboard")
+
+
 @login_required()
+@stream_thumbnail_uploads
 def article_create(request):
     if request.method == "POST":
-        form = ArticleForm(request.POST, request.FILES)
+        form = ArticleForm(
+            request.POST,
+            request.FILES,
+            upload_errors=request.upload_errors,
+        )
         if form.is_valid():
             article = form.save(commit=False)
             article.author = request.user
             article.save()
-            return redirect(article.get_absolute_url())
+            return redirect_saved(article)
+    else:
+        form = ArticleForm()
 
-    form = ArticleForm()
     return render(request, "blog/article_create.html", {"form": form})
 
 
 @login_required()
+@stream_thumbnail_uploads
 def article_update(request, slug):
     article = get_article(slug)
-    form = ArticleForm(data=request.POST or None, instance=article)
+    form = ArticleForm(
+        data=request.POST or None,
+        files=request.FILES or None,
+        instance=article,
+        upload_errors=request.upload_errors,
+    )
     if form.is_valid():
         form.save()
-        return redirect(article.get_absolute_url())
+        return redirect_saved(article)
 
     context = {"form": form}
     return render(request, "blog/article_create.html", context)
@@ -73,7 +360,41 @@ def article_delete(request, slug):
     return redirect("blog:dashboard")
 
 
+def summarize_stats(rows):
+    """Dashboard stats: the ``category_stats`` rows and their totals."""
+    stats = {"categories": [], "articles": 0, "published": 0, "views": 0}
+    for row in rows:
+        row["drafts"] = row["articles"] - row["published"]
+        stats["categories"].append(row)
+        for name in ("articles", "published", "views"):
+            stats[name] += row[name]
+    stats["drafts"] = stats["articles"] - stats["published"]
+    return stats
+
+
+def author_stats(author_id):
+    """
+    Dashboard stats of ``author_id``, cached until one of the author's
+    articles changes.
+    """
+    key = make_key(
+        "author_stats", author_id, *get_versions(author_scope(author_id))
+    )
+    stats = cache.get(key)
+    if stats is None:
+        rows = Article.objects.filter(author_id=author_id).category_stats()
+        stats = summarize_stats(rows)
+        cache.set(key, stats, settings.BLOG_DASHBOARD_CACHE_TIMEOUT)
+    return stats
+
+
 @login_required()
 def dashboard(request):
-    articles = Article.objects.all()
-    return render(request, "blog/dashboard.html", {"articles": articles})
+    articles = Article.objects.filter(author=request.user).for_listing()
+    page = paginate(request, articles)
+    context = {
+        "articles": page.object_list,
+        "page": page,
+        "stats": author_stats(request.user.pk),
+    }
+    return render(request, "blog/dashboard.html", context)
@@ -0,0 +1,19 @@
+"""
+SQLite backend applying PRAGMAs to every new connection.
+
+Set them in the database OPTIONS, e.g. ``"pragmas": {"journal_mode": "wal"}``.
+"""
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        self.pragmas = params.pop("pragmas", {})
+        return params
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
@@ -0,0 +1,95 @@
+"""
+Version stamps for cached values.
+
+Cache keys embed the current version of what they depend on, so bumping
+a version invalidates every entry built from it without having to find
+and delete those entries. Stamps live in the default cache, which has to
+be shared by every process for a bump to reach them all.
+"""
+import time
+
+from django.core.cache import cache
+
+
+def _version_key(scope):
+    return f"version:{scope}"
+
+
+def _modified_key(scope):
+    return f"modified:{scope}"
+
+
+def _missing_versions(keys, versions):
+    return [key for key in keys if key not in versions]
+
+
+def get_versions(*scopes):
+    """Return the current version of each scope, in order."""
+    keys = [_version_key(scope) for scope in scopes]
+    versions = cache.get_many(keys)
+
+    for key in _missing_versions(keys, versions):
+        # Never reuse a version of an evicted stamp
+        cache.add(key, time.time_ns(), None)
+        versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+async def aget_versions(*scopes):
+    keys = [_version_key(scope) for scope in scopes]
+    versions = await cache.aget_many(keys)
+
+    for key in _missing_versions(keys, versions):
+        await cache.aadd(key, time.time_ns(), None)
+        versions[key] = await cache.aget(key)
+    return [versions[key] for key in keys]
+
+
+def get_stamps(*scopes):
+    """
+    Return the versions of ``scopes`` and the times they last changed, in
+    order, for the validators of pages built from them.
+    """
+    version_keys = [_version_key(scope) for scope in scopes]
+    modified_keys = [_modified_key(scope) for scope in scopes]
+    stamps = cache.get_many(version_keys + modified_keys)
+
+    for key in _missing_versions(version_keys, stamps):
+        cache.add(key, time.time_ns(), None)
+        stamps[key] = cache.get(key)
+    for key in _missing_versions(modified_keys, stamps):
+        # Unknown change times are treated as now
+        cache.add(key, time.time(), None)
+        stamps[key] = cache.get(key)
+    return (
+        [stamps[key] for key in version_keys],
+        [stamps[key] for key in modified_keys],
+    )
+
+
+async def aget_stamps(*scopes):
+    version_keys = [_version_key(scope) for scope in scopes]
+    modified_keys = [_modified_key(scope) for scope in scopes]
+    stamps = await cache.aget_many(version_keys + modified_keys)
+
+    for key in _missing_versions(version_keys, stamps):
+        await cache.aadd(key, time.time_ns(), None)
+        stamps[key] = await cache.aget(key)
+    for key in _missing_versions(modified_keys, stamps):
+        await cache.aadd(key, time.time(), None)
+        stamps[key] = await cache.aget(key)
+    return (
+        [stamps[key] for key in version_keys],
+        [stamps[key] for key in modified_keys],
+    )
+
+
+def bump_versions(*scopes):
+    for scope in scopes:
+        try:
+            cache.incr(_version_key(scope))
+        except ValueError:
+            # Missing stamps restart from the clock, newer than any before
+            pass
+    now = time.time()
+    cache.set_many({_modified_key(scope): now for scope in scopes}, None)
@@ -1,4 +1,5 @@
 import os
+from importlib.util import find_spec
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -56,6 +57,7 @@ TEMPLATES = [
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
+                "blog.context_processors.highlighting",
             ],
         },
     },
@@ -67,12 +69,94 @@ WSGI_APPLICATION = "core.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+# DJANGO_DB_PROFILE selects the database: "sqlite" (default) or "postgres"
+DB_PROFILE = os.environ.get("DJANGO_DB_PROFILE", "sqlite")
+CONN_MAX_AGE = int(os.environ.get("DJANGO_DB_CONN_MAX_AGE", 600))
+
+if DB_PROFILE == "postgres":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.environ.get("DJANGO_DB_NAME", "blog"),
+            "USER": os.environ.get("DJANGO_DB_USER", "blog"),
+            "PASSWORD": os.environ.get("DJANGO_DB_PASSWORD", ""),
+            "HOST": os.environ.get("DJANGO_DB_HOST", "localhost"),
+            "PORT": os.environ.get("DJANGO_DB_PORT", "5432"),
+            # Persistent connections, reused across requests per worker
+            "CONN_MAX_AGE": CONN_MAX_AGE,
+            "CONN_HEALTH_CHECKS": True,
+            # Set when connecting through PgBouncer in transaction mode
+            "DISABLE_SERVER_SIDE_CURSORS": bool(
+                os.environ.get("DJANGO_DB_PGBOUNCER")
+            ),
+            "OPTIONS": {"connect_timeout": 5},
+        }
     }
-}
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "core.backends.sqlite3",
+            "NAME": os.environ.get("DJANGO_DB_NAME", BASE_DIR / "db.sqlite3"),
+            "CONN_MAX_AGE": CONN_MAX_AGE,
+            "CONN_HEALTH_CHECKS": True,
+            "OPTIONS": {
+                # Busy timeout: seconds a writer waits for the lock
+                "timeout": 20,
+                "pragmas": {
+                    # Readers no longer block on the writer
+                    "journal_mode": "wal",
+                    # Safe with WAL, fsyncs at checkpoints only
+                    "synchronous": "normal",
+                    "mmap_size": 256 * 1024**2,
+                    "cache_size": -64 * 1024,
+                    "temp_store": "memory",
+                },
+            },
+        }
+    }
+
+
+# DJANGO_CACHE_PROFILE selects the cache: "locmem" (default), "redis" or
+# "memcached". Pages and signed in users are invalidated through version
+# stamps kept in this cache, so every worker process must share it:
+# locmem is per process and only fits a single process, like runserver.
+# redis needs the redis package, memcached the pymemcache package.
+CACHE_PROFILE = os.environ.get("DJANGO_CACHE_PROFILE", "locmem")
+
+if CACHE_PROFILE == "redis":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ.get(
+                "DJANGO_CACHE_LOCATION", "redis://localhost:6379/0"
+            ),
+            "KEY_PREFIX": "blog",
+        }
+    }
+elif CACHE_PROFILE == "memcached":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.memcached.PyMemcacheCache",
+            "LOCATION": os.environ.get(
+                "DJANGO_CACHE_LOCATION", "localhost:11211"
+            ),
+            "KEY_PREFIX": "blog",
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "blog",
+            "OPTIONS": {"MAX_ENTRIES": 10000},
+        }
+    }
+
+# Session storage: "db", "cached_db", "cache" or "signed_cookies". Reading
+# articles doesn't use the session, so only signed in users have one.
+SESSION_ENGINE = "django.contrib.sessions.backends." + os.environ.get(
+    "DJANGO_SESSION_BACKEND", "db"
+)
 
 
 # Password validation
@@ -94,6 +178,50 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashers, see users/hashers.py. The first one hashes new
+# passwords and rehashes the others on sign in. DJANGO_PASSWORD_HASHER
+# picks it: "scrypt", "argon2" or "pbkdf2". Argon2 falls back to scrypt
+# when argon2-cffi isn't installed.
+PASSWORD_HASHER_CHOICES = {
+    "scrypt": "users.hashers.ScryptPasswordHasher",
+    "argon2": "users.hashers.Argon2PasswordHasher",
+    "pbkdf2": "users.hashers.PBKDF2PasswordHasher",
+}
+PASSWORD_HASHER = os.environ.get("DJANGO_PASSWORD_HASHER", "scrypt")
+if PASSWORD_HASHER == "argon2" and find_spec("argon2") is None:
+    PASSWORD_HASHER = "scrypt"
+PASSWORD_HASHERS = [PASSWORD_HASHER_CHOICES[PASSWORD_HASHER]] + [
+    hasher
+    for name, hasher in PASSWORD_HASHER_CHOICES.items()
+    if name != PASSWORD_HASHER
+]
+USERS_SCRYPT_WORK_FACTOR = 2**14
+USERS_SCRYPT_BLOCK_SIZE = 8
+USERS_SCRYPT_PARALLELISM = 1
+USERS_ARGON2_TIME_COST = 2
+USERS_ARGON2_MEMORY_COST = 64 * 1024
+USERS_ARGON2_PARALLELISM = 2
+# Hashes or checks taking longer are logged as warnings
+USERS_SLOW_HASH_SECONDS = 0.5
+
+# Failed sign ins allowed per client IP and per email within a sliding
+# window of USERS_LOGIN_THROTTLE_WINDOW seconds, see users/throttle.py
+USERS_LOGIN_THROTTLE_WINDOW = 60 * 5
+USERS_LOGIN_THROTTLE_IP_LIMIT = 20
+USERS_LOGIN_THROTTLE_EMAIL_LIMIT = 5
+
+# Sign ins within this many seconds of the last recorded one leave
+# last_login alone, see users/signals.py
+USERS_LAST_LOGIN_INTERVAL = 60 * 60
+
+# Seconds a signed in user and its permissions stay cached, changes to
+# them invalidate the entries sooner
+USERS_AUTH_CACHE_TIMEOUT = 60 * 60
+
+# Processes hashing passwords in UserManager.bulk_create_users
+USERS_BULK_HASH_WORKERS = os.cpu_count() or 1
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.0/topics/i18n/
 
@@ -149,6 +277,101 @@ TINYMCE_DEFAULT_CONFIG = {
 }
 
 AUTH_USER_MODEL = "users.User"
+# Caches the signed in user and its permissions, see users/backends.py.
+# Only with a shared cache, processes would miss each other's changes.
+AUTHENTICATION_BACKENDS = [
+    "django.contrib.auth.backends.ModelBackend"
+    if CACHE_PROFILE == "locmem"
+    else "users.backends.CachingModelBackend"
+]
 EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 LOGIN_URL = "/users/login/"
 LOGIN_REDIRECT_URL = "blog:dashboard"
+
+# Full-text search backend used by the blog, see blog/search.py
+BLOG_SEARCH_BACKEND = (
+    "blog.search.SQLiteFTSBackend"
+    if DB_PROFILE == "sqlite"
+    else "blog.search.DatabaseSearchBackend"
+)
+BLOG_SEARCH_LIMIT = 50
+
+# Articles per page on the keyset paginated listings
+BLOG_PAGE_SIZE = 10
+
+# Article views are buffered in memory and written in bulk, see
+# blog/counters.py
+BLOG_VIEW_COUNT_FLUSH_INTERVAL = 10
+BLOG_VIEW_COUNT_MAX_PENDING = 500
+BLOG_VIEW_COUNT_CACHE_TIMEOUT = 60 * 5
+
+# Articles a reader was counted a view for, see blog/viewed.py. The
+# cookie lasts as long as the browser session unless an age is set.
+BLOG_VIEWED_COOKIE = "viewed"
+BLOG_VIEWED_COOKIE_SIZE = 200
+BLOG_VIEWED_COOKIE_AGE = None
+
+# Views served by their async variant from blog/async_views.py, as a comma
+# separated list of URL names, e.g. "home,article_details,dashboard"
+BLOG_ASYNC_VIEWS = frozenset(
+    filter(None, os.environ.get("DJANGO_BLOG_ASYNC_VIEWS", "").split(","))
+)
+
+# Rendered article fragments, invalidated by version stamps on change
+BLOG_PAGE_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Pages of a category's articles, invalidated when an article in it is
+# saved. View counts in the listing lag by at most this long.
+BLOG_CATEGORY_PAGE_CACHE_TIMEOUT = 60 * 5
+
+# Per-author dashboard stats, invalidated when the author's articles are
+# saved. Flushed view counts show up after at most this long.
+BLOG_DASHBOARD_CACHE_TIMEOUT = 60 * 5
+
+# Slug to primary key resolutions, see blog/slugs.py. Each process trusts
+# its own copy for BLOG_SLUG_LOCAL_TIMEOUT seconds.
+BLOG_SLUG_CACHE_SIZE = 10000
+BLOG_SLUG_LOCAL_TIMEOUT = 10
+BLOG_SLUG_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Related articles, precomputed by blog/related.py
+BLOG_RELATED_ARTICLES = 6
+BLOG_RELATED_TOPIC_WEIGHT = 3
+BLOG_RELATED_CATEGORY_BOOST = 0.1
+# Ignore terms found in more than this share of articles
+BLOG_RELATED_MAX_DF = 0.5
+# Queue saved and deleted articles, so that the scheduled
+# build_related_articles --pending refreshes the lists they affect
+BLOG_RELATED_UPDATE_ON_SAVE = True
+
+# Trending articles, see blog/trending.py. Views are counted in hourly
+# buckets, merged into daily ones after BLOG_TRENDING_HOURLY_HOURS and
+# dropped after BLOG_TRENDING_WINDOW_HOURS. Schedule update_trending to
+# refresh the leaderboards.
+BLOG_TRENDING_WINDOW_HOURS = 24 * 7
+BLOG_TRENDING_HOURLY_HOURS = 48
+BLOG_TRENDING_HALF_LIFE_HOURS = 24
+BLOG_TRENDING_SIZE = 10
+
+# Resized thumbnail variants, see blog/thumbnails.py
+BLOG_THUMBNAIL_MAX_UPLOAD_SIZE = 3 * 1024**2
+BLOG_THUMBNAIL_WIDTHS = (320, 640, 960, 1280)
+BLOG_THUMBNAIL_DEFAULT_WIDTH = 640
+BLOG_THUMBNAIL_QUALITY = 80
+BLOG_THUMBNAIL_ASYNC = True
+BLOG_THUMBNAIL_WORKERS = 2
+
+# Highlight code samples with Pygments when articles are saved, see
+# blog/highlighting.py. Pages then stop loading highlight.js, run
+# render_articles after turning this on for existing articles.
+BLOG_HIGHLIGHT_CODE = True
+# Rendered code blocks kept in memory by each process
+BLOG_HIGHLIGHT_CACHE_SIZE = 512
+
+# Hosts whose iframes article bodies may embed, see blog/sanitizer.py.
+# Run render_articles after changing them.
+BLOG_EMBED_HOSTS = {
+    "www.youtube.com",
+    "www.youtube-nocookie.com",
+    "player.vimeo.com",
+}
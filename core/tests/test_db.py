@@ -0,0 +1,31 @@
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+
+
+class SQLitePragmasTest(TestCase):
+    def pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+    def test_pragmas_applied(self):
+        """Test configured pragmas are set on the connection"""
+
+        pragmas = connection.settings_dict["OPTIONS"]["pragmas"]
+        self.assertEqual(pragmas["synchronous"], "normal")
+        # 1 is NORMAL
+        self.assertEqual(self.pragma("synchronous"), 1)
+        self.assertEqual(self.pragma("temp_store"), 2)
+
+    def test_pragmas_not_passed_to_sqlite(self):
+        """Test pragmas aren't handed to sqlite3.connect"""
+
+        self.assertNotIn("pragmas", connection.get_connection_params())
+
+
+class DatabaseProfileTest(SimpleTestCase):
+    def test_persistent_connections(self):
+        """Test connections are reused and health checked"""
+
+        self.assertGreater(connection.settings_dict["CONN_MAX_AGE"], 0)
+        self.assertTrue(connection.settings_dict["CONN_HEALTH_CHECKS"])
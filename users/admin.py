@@ -9,7 +9,13 @@ class CustomUserAdmin(UserAdmin):
     form = UserEditForm
     add_form = UserAddForm
     ordering = ("email",)
-    list_display = ("email", "is_active", "is_staff", "date_join")
+    list_display = (
+        "email",
+        "is_active",
+        "is_staff",
+        "date_join",
+        "last_login",
+    )
     fieldsets = (
         ("Authentication", {"fields": ("email", "password")}),
         (
@@ -4,3 +4,14 @@ from django.apps import AppConfig
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'users'
+
+    def ready(self):
+        from django.contrib.auth.models import update_last_login
+        from django.contrib.auth.signals import user_logged_in
+
+        from users import checks, signals  # noqa: F401
+
+        # Replaced by the throttled users.signals.record_last_login
+        user_logged_in.disconnect(
+            update_last_login, dispatch_uid="update_last_login"
+        )
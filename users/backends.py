@@ -0,0 +1,78 @@
+"""
+Authentication backend caching what every signed in request loads.
+
+The user behind a session and, once checked, its permissions are kept in
+the cache under keys carrying two version stamps: that of the user, bumped
+when the user or its groups and permissions change, and PERMISSIONS,
+bumped when any group or permission changes. See users/signals.py.
+
+Users are cached without their password, only with the session hash
+derived from it. They come back with the password deferred, so saving
+one never overwrites it. The stamps only reach every process through a
+shared cache, which the users.E001 check requires.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+from core.cache import get_versions
+
+# Bumped whenever a group or a permission changes
+PERMISSIONS = "permissions"
+
+
+def user_scope(user_id):
+    return f"user:{user_id}"
+
+
+def _key(name, user_id):
+    versions = get_versions(user_scope(user_id), PERMISSIONS)
+    return ":".join(["users", name, str(user_id), *map(str, versions)])
+
+
+def _cached_fields(model):
+    return [
+        field.attname
+        for field in model._meta.concrete_fields
+        if field.attname != "password"
+    ]
+
+
+class CachingModelBackend(ModelBackend):
+    def get_user(self, user_id):
+        User = get_user_model()
+        key = _key("auth_user", user_id)
+        cached = cache.get(key)
+        if cached is not None:
+            values, session_hash = cached
+            user = User.from_db(
+                User._default_manager.db, _cached_fields(User), values
+            )
+            user._session_auth_hash = session_hash
+            return user
+
+        user = super().get_user(user_id)
+        if user is not None:
+            values = [getattr(user, name) for name in _cached_fields(User)]
+            cache.set(
+                key,
+                (values, user.get_session_auth_hash()),
+                settings.USERS_AUTH_CACHE_TIMEOUT,
+            )
+        return user
+
+    def _get_permissions(self, user_obj, obj, from_name):
+        # Object permissions and inactive users are left to ModelBackend
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return super()._get_permissions(user_obj, obj, from_name)
+
+        cache_name = f"_{from_name}_perm_cache"
+        if not hasattr(user_obj, cache_name):
+            key = _key(f"auth_{from_name}_perms", user_obj.pk)
+            perms = cache.get(key)
+            if perms is None:
+                perms = super()._get_permissions(user_obj, obj, from_name)
+                cache.set(key, perms, settings.USERS_AUTH_CACHE_TIMEOUT)
+            setattr(user_obj, cache_name, perms)
+        return getattr(user_obj, cache_name)
@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.checks import Error, register
+
+CACHING_BACKEND = "users.backends.CachingModelBackend"
+
+
+@register()
+def check_shared_auth_cache(app_configs, **kwargs):
+    """CachingModelBackend needs a cache every process sees."""
+    if CACHING_BACKEND not in settings.AUTHENTICATION_BACKENDS:
+        return []
+    if not isinstance(caches["default"], (LocMemCache, DummyCache)):
+        return []
+    return [
+        Error(
+            f"{CACHING_BACKEND} needs a cache shared by every process.",
+            hint=(
+                "Set DJANGO_CACHE_PROFILE to redis or memcached, or use "
+                "django.contrib.auth.backends.ModelBackend."
+            ),
+            id="users.E001",
+        )
+    ]
@@ -0,0 +1,72 @@
+"""
+Password hashers with their cost taken from settings, and timed so the
+cost of signing in can be watched while tuning it.
+
+Each hash or check is logged at DEBUG level on the ``users.hashers``
+logger, and at WARNING when it takes longer than USERS_SLOW_HASH_SECONDS.
+Hashers keep Django's algorithm names, so existing hashes still verify
+and are rehashed with the first entry of PASSWORD_HASHERS on login.
+"""
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+logger = logging.getLogger(__name__)
+
+_timing = threading.local()
+
+
+class TimedHasherMixin:
+    def _timed(self, operation, call):
+        # Verifying usually encodes too, only time the outer call
+        if getattr(_timing, "active", False):
+            return call()
+
+        _timing.active = True
+        start = time.perf_counter()
+        try:
+            return call()
+        finally:
+            _timing.active = False
+            elapsed = time.perf_counter() - start
+            slow = elapsed > settings.USERS_SLOW_HASH_SECONDS
+            logger.log(
+                logging.WARNING if slow else logging.DEBUG,
+                "%s %s took %.1fms",
+                self.algorithm,
+                operation,
+                elapsed * 1000,
+            )
+
+    def encode(self, password, salt, *args, **kwargs):
+        return self._timed(
+            "encode",
+            lambda: super(TimedHasherMixin, self).encode(
+                password, salt, *args, **kwargs
+            ),
+        )
+
+    def verify(self, password, encoded):
+        return self._timed(
+            "verify",
+            lambda: super(TimedHasherMixin, self).verify(password, encoded),
+        )
+
+
+class ScryptPasswordHasher(TimedHasherMixin, hashers.ScryptPasswordHasher):
+    work_factor = settings.USERS_SCRYPT_WORK_FACTOR
+    block_size = settings.USERS_SCRYPT_BLOCK_SIZE
+    parallelism = settings.USERS_SCRYPT_PARALLELISM
+
+
+class Argon2PasswordHasher(TimedHasherMixin, hashers.Argon2PasswordHasher):
+    time_cost = settings.USERS_ARGON2_TIME_COST
+    memory_cost = settings.USERS_ARGON2_MEMORY_COST
+    parallelism = settings.USERS_ARGON2_PARALLELISM
+
+
+class PBKDF2PasswordHasher(TimedHasherMixin, hashers.PBKDF2PasswordHasher):
+    pass
@@ -0,0 +1,86 @@
+import csv
+import json
+import sys
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Create users from a CSV file with an email and an optional "
+        "password column, or from JSONL objects with those keys. Invalid, "
+        "repeated and existing emails are skipped, users without a "
+        "password get an unusable one."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help='CSV or JSONL file, "-" for stdin.')
+        parser.add_argument(
+            "--format",
+            choices=["csv", "jsonl"],
+            help="Format of the file, by default from its extension.",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=settings.USERS_BULK_HASH_WORKERS,
+            help="Processes hashing passwords, 0 to hash inline.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        format = options["format"]
+        if format is None:
+            format = "csv" if path.endswith(".csv") else "jsonl"
+        progress = None
+        if options["verbosity"] > 1:
+            progress = self.report
+
+        self.start = time.perf_counter()
+        stream = sys.stdin if path == "-" else open(path, encoding="utf-8")
+        try:
+            rows = getattr(self, f"read_{format}")(stream)
+            created, skipped = get_user_model().objects.bulk_create_users(
+                rows,
+                batch_size=options["batch_size"],
+                workers=options["workers"],
+                progress=progress,
+            )
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        self.report(created, skipped, style=self.style.SUCCESS)
+
+    def report(self, created, skipped, style=str):
+        elapsed = time.perf_counter() - self.start
+        self.stdout.write(
+            style(
+                f"Created {created} users in {elapsed:.2f}s "
+                f"({created / (elapsed or 1):.0f} rows/s), "
+                f"skipped {skipped}"
+            )
+        )
+
+    def read_csv(self, stream):
+        reader = csv.DictReader(stream)
+        if "email" not in (reader.fieldnames or []):
+            raise CommandError("The CSV header needs an email column")
+        for row in reader:
+            yield row["email"], row.get("password") or None
+
+    def read_jsonl(self, stream):
+        for number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as error:
+                raise CommandError(f"Line {number}: {error}")
+            if not isinstance(row, dict):
+                raise CommandError(f"Line {number}: object expected")
+            yield row.get("email"), row.get("password") or None
@@ -1,5 +1,14 @@
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from itertools import islice
+
+import django
+from django.conf import settings
 from django.contrib.auth.base_user import BaseUserManager
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
 from django.db import models
 from django.utils.text import gettext_lazy as _
 
@@ -28,6 +37,86 @@ class UserManager(BaseUserManager):
 
         return self.create_user(email, password, **extra_fields)
 
+    def bulk_create_users(
+        self, rows, batch_size=1000, workers=None, progress=None
+    ):
+        """
+        Create users from ``(email, password)`` pairs in batches of
+        ``batch_size``; return (created, skipped).
+
+        Emails are normalized as by ``create_user``, those invalid, repeated
+        or already taken are skipped. Passwords are hashed in a pool of
+        ``workers`` processes, inline with 0 or 1, and a None password makes
+        an unusable one. ``progress`` is called with the running totals
+        after each batch.
+        """
+        if workers is None:
+            workers = settings.USERS_BULK_HASH_WORKERS
+        rows = iter(rows)
+        seen, created, skipped = set(), 0, 0
+
+        with ExitStack() as stack:
+            hash_passwords = map
+            if workers > 1:
+                pool = stack.enter_context(
+                    ProcessPoolExecutor(workers, initializer=django.setup)
+                )
+                hash_passwords = pool.map
+
+            while batch := list(islice(rows, batch_size)):
+                pending = self._new_users(batch, seen)
+                passwords = hash_passwords(
+                    make_password,
+                    pending.values(),
+                    **({"chunksize": 32} if workers > 1 else {}),
+                )
+                users = [
+                    self.model(email=email, password=password)
+                    for email, password in zip(pending, passwords)
+                ]
+                # A concurrent sign up may have taken an email since
+                self.bulk_create(users, ignore_conflicts=True)
+                inserted = self._inserted(users)
+                created += inserted
+                skipped += len(batch) - inserted
+                if progress:
+                    progress(created, skipped)
+        return created, skipped
+
+    def _inserted(self, users):
+        """
+        How many of ``users`` were inserted. Conflicting rows were dropped,
+        the ones stored are those with the hashes just made, salted so no
+        other row has them.
+        """
+        return self.filter(
+            email__in=[user.email for user in users],
+            password__in=[user.password for user in users],
+        ).count()
+
+    def _new_users(self, batch, seen):
+        """
+        ``{email: password}`` of the rows of ``batch`` to create, adding
+        their emails to ``seen``.
+        """
+        max_length = self.model._meta.get_field("email").max_length
+        pending = {}
+        for email, password in batch:
+            email = self.normalize_email((email or "").strip())
+            if email in seen or len(email) > max_length:
+                continue
+            try:
+                validate_email(email)
+            except ValidationError:
+                continue
+            seen.add(email)
+            pending[email] = password
+
+        taken = self.filter(email__in=pending).values_list("email", flat=True)
+        for email in taken:
+            del pending[email]
+        return pending
+
 
 class User(AbstractBaseUser, PermissionsMixin):
     username = None
@@ -36,9 +125,29 @@ class User(AbstractBaseUser, PermissionsMixin):
     is_staff = models.BooleanField(default=False)
     is_superuser = models.BooleanField(default=False)
     date_join = models.DateTimeField(auto_now_add=True)
-    last_login = models.DateTimeField(auto_now=True)
+    # Written by users.signals.record_last_login, not on every save
+    last_login = models.DateTimeField(_("last login"), blank=True, null=True)
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
 
     objects = UserManager()
+
+    def get_session_auth_hash(self):
+        # Users cached by CachingModelBackend have no password loaded
+        if "password" in self.get_deferred_fields():
+            session_hash = getattr(self, "_session_auth_hash", None)
+            if session_hash is not None:
+                return session_hash
+        return super().get_session_auth_hash()
+
+    class Meta:
+        indexes = [
+            # The admin sorts by either column, then by -pk, both ways
+            models.Index(
+                fields=["date_join", "-id"], name="user_date_join_idx"
+            ),
+            models.Index(
+                fields=["last_login", "-id"], name="user_last_login_idx"
+            ),
+        ]
@@ -0,0 +1,69 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.contrib.auth.signals import user_logged_in
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from core.cache import bump_versions
+from users.backends import PERMISSIONS, user_scope
+from users.models import User
+
+
+@receiver(user_logged_in, dispatch_uid="users.record_last_login")
+def record_last_login(sender, user, **kwargs):
+    """
+    Stamp ``last_login`` at most once per USERS_LAST_LOGIN_INTERVAL
+    seconds, writing that column alone instead of saving the whole user.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.USERS_LAST_LOGIN_INTERVAL)
+    if user.last_login is not None and user.last_login > stale:
+        return
+
+    # Checked again in the UPDATE, concurrent sign ins write it once
+    get_user_model().objects.filter(
+        Q(last_login__isnull=True) | Q(last_login__lte=stale), pk=user.pk
+    ).update(last_login=now)
+    user.last_login = now
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user(sender, instance, **kwargs):
+    bump_versions(user_scope(instance.pk))
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def invalidate_user_permissions(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if not action.startswith("post_"):
+        return
+
+    if not reverse:
+        bump_versions(user_scope(instance.pk))
+    elif pk_set:
+        bump_versions(*map(user_scope, pk_set))
+    else:
+        # Cleared from the group or permission side, members unknown
+        bump_versions(PERMISSIONS)
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+@receiver(post_save, sender=Permission)
+@receiver(post_delete, sender=Permission)
+def invalidate_permissions(sender, **kwargs):
+    bump_versions(PERMISSIONS)
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def invalidate_group_permissions(sender, action, **kwargs):
+    if action.startswith("post_"):
+        bump_versions(PERMISSIONS)
@@ -0,0 +1,125 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
+from django.shortcuts import reverse
+from django.test import TestCase, override_settings
+
+from users.backends import CachingModelBackend
+from users.checks import check_shared_auth_cache
+
+CACHING_BACKENDS = ["users.backends.CachingModelBackend"]
+
+
+class CachingModelBackendTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="minux@test.com", password="test"
+        )
+        cls.group = Group.objects.create(name="Editors")
+        cls.permission = Permission.objects.get(codename="change_article")
+
+    def setUp(self):
+        cache.clear()
+        self.backend = CachingModelBackend()
+
+    def has_perm(self):
+        user = self.backend.get_user(self.user.pk)
+        return self.backend.has_perm(user, "blog.change_article")
+
+    def test_cached_user(self):
+        """Test the user is loaded once until it changes"""
+
+        with self.assertNumQueries(1):
+            self.backend.get_user(self.user.pk)
+        with self.assertNumQueries(0):
+            user = self.backend.get_user(self.user.pk)
+        self.assertEqual(user, self.user)
+        self.assertEqual(
+            user.get_session_auth_hash(), self.user.get_session_auth_hash()
+        )
+
+    def test_cached_without_password(self):
+        """Test cached users leave the password out and keep it on save"""
+
+        self.backend.get_user(self.user.pk)
+        user = self.backend.get_user(self.user.pk)
+        self.assertIn("password", user.get_deferred_fields())
+
+        user.is_staff = True
+        user.save()
+        self.assertTrue(
+            get_user_model().objects.get().check_password("test")
+        )
+
+    def test_cached_permissions(self):
+        """Test resolved permissions are reused across requests"""
+
+        self.user.user_permissions.add(self.permission)
+        self.assertTrue(self.has_perm())
+        with self.assertNumQueries(0):
+            self.assertTrue(self.has_perm())
+
+        self.user.user_permissions.clear()
+        self.assertFalse(self.has_perm())
+
+    def test_group_changes(self):
+        """Test group membership and group permissions invalidate"""
+
+        self.group.permissions.add(self.permission)
+        self.assertFalse(self.has_perm())
+
+        self.group.user_set.add(self.user)
+        self.assertTrue(self.has_perm())
+
+        self.group.permissions.clear()
+        self.assertFalse(self.has_perm())
+
+
+@override_settings(AUTHENTICATION_BACKENDS=CACHING_BACKENDS)
+class CachedSessionTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="minux@test.com", password="test"
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+        self.url = reverse("blog:dashboard")
+        self.client.get(self.url)
+
+    def test_cached_request(self):
+        """Test signed in requests don't load the user again"""
+
+        # The session and the articles
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_password_change_ends_sessions(self):
+        """Test changing the password signs other sessions out"""
+
+        user = get_user_model().objects.get()
+        user.set_password("changed")
+        user.save()
+
+        response = self.client.get(self.url)
+        self.assertRedirects(response, f"/users/login/?next={self.url}")
+
+    def test_deactivation_ends_sessions(self):
+        """Test deactivating a user signs its sessions out"""
+
+        user = get_user_model().objects.get()
+        user.is_active = False
+        user.save()
+
+        response = self.client.get(self.url)
+        self.assertRedirects(response, f"/users/login/?next={self.url}")
+
+    def test_needs_shared_cache(self):
+        """Test the backend is refused with a per-process cache"""
+
+        errors = check_shared_auth_cache(None)
+        self.assertEqual([error.id for error in errors], ["users.E001"])
@@ -0,0 +1,116 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from users.models import User
+
+
+class BulkCreateUsersTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        get_user_model().objects.create_user(
+            email="minux@test.com", password="test"
+        )
+
+    def test_bulk_create_users(self):
+        """Test emails are normalized and deduped, passwords hashed"""
+
+        rows = [
+            (" new@Test.COM ", "secret"),
+            ("new@test.com", "again"),
+            ("minux@test.com", "taken"),
+            ("not an email", "secret"),
+            ("nopass@test.com", None),
+        ]
+        totals = []
+        created, skipped = User.objects.bulk_create_users(
+            rows,
+            batch_size=2,
+            workers=0,
+            progress=lambda *counts: totals.append(counts),
+        )
+
+        self.assertEqual((created, skipped), (2, 3))
+        self.assertEqual(totals, [(1, 1), (1, 3), (2, 3)])
+        self.assertTrue(
+            User.objects.get(email="new@test.com").check_password("secret")
+        )
+        user = User.objects.get(email="nopass@test.com")
+        self.assertFalse(user.has_usable_password())
+        self.assertTrue(user.date_join)
+
+    def test_concurrent_sign_up(self):
+        """Test emails taken during a batch are reported as skipped"""
+
+        new_users = User.objects._new_users
+
+        def sign_up_meanwhile(batch, seen):
+            pending = new_users(batch, seen)
+            get_user_model().objects.create_user(
+                email="late@test.com", password="first"
+            )
+            return pending
+
+        rows = [("late@test.com", "second"), ("other@test.com", "secret")]
+        with mock.patch.object(
+            User.objects, "_new_users", side_effect=sign_up_meanwhile
+        ):
+            created, skipped = User.objects.bulk_create_users(
+                rows, workers=0
+            )
+
+        self.assertEqual((created, skipped), (1, 1))
+        self.assertTrue(
+            User.objects.get(email="late@test.com").check_password("first")
+        )
+
+    def test_process_pool(self):
+        """Test passwords hashed by worker processes verify"""
+
+        rows = [(f"user{i}@test.com", f"password{i}") for i in range(4)]
+        self.assertEqual(
+            User.objects.bulk_create_users(rows, workers=2), (4, 0)
+        )
+        user = User.objects.get(email="user3@test.com")
+        self.assertTrue(user.check_password("password3"))
+
+    def command(self, name, content, *args):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory, name)
+            path.write_text(content)
+            out = StringIO()
+            call_command(
+                "bulk_create_users",
+                str(path),
+                "--workers=0",
+                *args,
+                stdout=out,
+            )
+        return out.getvalue()
+
+    def test_command_csv(self):
+        """Test the command reads CSV and reports what it did"""
+
+        out = self.command(
+            "users.csv",
+            "email,password\ncsv@test.com,secret\nminux@test.com,x\n",
+        )
+        self.assertIn("Created 1 users", out)
+        self.assertIn("skipped 1", out)
+        self.assertTrue(User.objects.filter(email="csv@test.com").exists())
+
+    def test_command_jsonl(self):
+        """Test the command reads JSONL and rejects malformed lines"""
+
+        line = json.dumps({"email": "jsonl@test.com", "password": "secret"})
+        self.command("users.jsonl", line + "\n\n")
+        self.assertTrue(User.objects.filter(email="jsonl@test.com").exists())
+
+        with self.assertRaisesMessage(CommandError, "Line 2"):
+            self.command("users.jsonl", line + "\n{oops\n")
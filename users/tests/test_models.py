@@ -1,5 +1,9 @@
+from datetime import timedelta
+
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 from users.models import User
@@ -67,3 +71,53 @@ class UserTest(TestCase):
             email="test@user.com", password="passwd"
         )
         self.assertTrue(user.date_join)
+
+
+@override_settings(USERS_LAST_LOGIN_INTERVAL=60)
+class LastLoginTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="minux@test.com", password="test"
+        )
+
+    def last_login(self):
+        return User.objects.values_list("last_login", flat=True).get()
+
+    def test_save_leaves_last_login(self):
+        """Test saving a user does not stamp its last login"""
+
+        self.user.is_staff = True
+        self.user.save()
+        self.assertIsNone(self.last_login())
+
+    def test_login_writes_last_login_once_per_interval(self):
+        """Test sign ins within the interval skip the last login write"""
+
+        self.client.force_login(self.user)
+        first = self.last_login()
+        self.assertIsNotNone(first)
+
+        self.client.logout()
+        with CaptureQueriesContext(connection) as queries:
+            self.client.force_login(User.objects.get())
+        self.assertFalse(
+            [q for q in queries if q["sql"].startswith('UPDATE "users_user"')]
+        )
+        self.assertEqual(self.last_login(), first)
+
+        User.objects.update(last_login=first - timedelta(minutes=2))
+        self.client.force_login(User.objects.get())
+        self.assertGreater(self.last_login(), first)
+
+    def test_admin_sort_uses_index(self):
+        """Test sorting users either way walks the column's index"""
+
+        for field, index in (
+            ("date_join", "user_date_join_idx"),
+            ("last_login", "user_last_login_idx"),
+        ):
+            for ordering in ((field, "-pk"), (f"-{field}", "pk")):
+                plan = User.objects.order_by(*ordering).explain()
+                self.assertIn(index, plan)
+                self.assertNotIn("TEMP B-TREE", plan)
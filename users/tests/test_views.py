@@ -1,8 +1,13 @@
+from unittest import mock
+
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
 from django.core import mail
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 from django.urls import resolve, reverse
 
+from users import throttle
 from users.views import create_user, login_user
 
 
@@ -145,6 +150,87 @@ class LoginViewTest(TestCase):
         self.assertRedirects(response, expected_url=reverse("home"))
 
 
+@override_settings(
+    USERS_LOGIN_THROTTLE_WINDOW=60,
+    USERS_LOGIN_THROTTLE_IP_LIMIT=4,
+    USERS_LOGIN_THROTTLE_EMAIL_LIMIT=2,
+)
+class LoginThrottleTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="minux@dev.com", password="validpassword"
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse("login_user")
+
+    def login(self, password, email="minux@dev.com"):
+        return self.client.post(
+            self.url, data={"email": email, "password": password}
+        )
+
+    def test_throttled_before_hashing(self):
+        """Test refused sign ins don't reach authenticate"""
+
+        for _ in range(2):
+            self.assertEqual(self.login("wrongpassword").status_code, 200)
+
+        with mock.patch("users.views.authenticate") as authenticate:
+            response = self.login("validpassword")
+        authenticate.assert_not_called()
+        self.assertEqual(response.status_code, 429)
+        self.assertTrue(response.has_header("Retry-After"))
+        self.assertContains(
+            response, "Too many failed attempts", status_code=429
+        )
+
+    def test_throttled_per_ip(self):
+        """Test one client trying many emails is throttled too"""
+
+        for i in range(4):
+            self.login("wrongpassword", email=f"user{i}@example.com")
+        self.assertEqual(self.login("validpassword").status_code, 429)
+
+    def test_success_resets_email(self):
+        """Test signing in forgets the email's failures"""
+
+        self.login("wrongpassword")
+        self.assertEqual(self.login("validpassword").status_code, 302)
+        self.client.logout()
+
+        self.login("wrongpassword")
+        self.assertEqual(self.login("validpassword").status_code, 302)
+
+    def test_sliding_window(self):
+        """Test failures of the previous window weigh by their overlap"""
+
+        ip, email = "10.0.0.1", "minux@dev.com"
+        for _ in range(3):
+            throttle.record_failure(ip, email, now=50)
+
+        # A quarter into the next window 3 * 0.75 failures remain
+        self.assertGreater(throttle.retry_after(ip, email, now=75), 0)
+        # Three quarters in, 3 * 0.25 do
+        self.assertEqual(throttle.retry_after(ip, email, now=105), 0)
+
+    def test_rehash_on_login(self):
+        """Test older hashes are upgraded to the preferred hasher"""
+
+        self.user.password = make_password(
+            "validpassword", hasher="pbkdf2_sha256"
+        )
+        self.user.save(update_fields=["password"])
+
+        with self.assertLogs("users.hashers", "DEBUG") as logs:
+            self.login("validpassword")
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("scrypt$"))
+        self.assertIn("pbkdf2_sha256 verify took", logs.output[0])
+
+
 class PasswordResetTest(TestCase):
     def setUp(self):
         self.user = get_user_model().objects.create_user(
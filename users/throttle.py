@@ -0,0 +1,71 @@
+"""
+Login throttling, checked before any password is hashed.
+
+Failed sign-ins are counted per client IP and per email in the cache,
+over a sliding window of USERS_LOGIN_THROTTLE_WINDOW seconds: the count
+is that of the current fixed window plus the previous one's, weighted by
+how much of it still overlaps. Once either count reaches its limit, sign
+ins are refused without calling ``authenticate``.
+"""
+import hashlib
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+LIMITS = {
+    "ip": "USERS_LOGIN_THROTTLE_IP_LIMIT",
+    "email": "USERS_LOGIN_THROTTLE_EMAIL_LIMIT",
+}
+
+
+def client_ip(request):
+    return request.META.get("REMOTE_ADDR", "")
+
+
+def _keys(scope, value, now):
+    """Keys of the current and previous windows of ``value``."""
+    digest = hashlib.md5(value.strip().lower().encode()).hexdigest()
+    window = int(now // settings.USERS_LOGIN_THROTTLE_WINDOW)
+    return [
+        f"users:throttle:{scope}:{digest}:{index}"
+        for index in (window, window - 1)
+    ]
+
+
+def retry_after(ip, email, now=None):
+    """
+    Seconds until ``ip`` and ``email`` may try to sign in again, 0 when
+    they may now.
+    """
+    now = time.time() if now is None else now
+    window = settings.USERS_LOGIN_THROTTLE_WINDOW
+    keys = {"ip": _keys("ip", ip, now), "email": _keys("email", email, now)}
+    counts = cache.get_many([key for pair in keys.values() for key in pair])
+
+    overlap = 1 - (now % window) / window
+    for scope, (current, previous) in keys.items():
+        count = counts.get(current, 0) + counts.get(previous, 0) * overlap
+        if count >= getattr(settings, LIMITS[scope]):
+            return math.ceil(window - now % window)
+    return 0
+
+
+def record_failure(ip, email, now=None):
+    now = time.time() if now is None else now
+    timeout = settings.USERS_LOGIN_THROTTLE_WINDOW * 2
+    for scope, value in (("ip", ip), ("email", email)):
+        key = _keys(scope, value, now)[0]
+        cache.add(key, 0, timeout)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Evicted in between, start over
+            cache.set(key, 1, timeout)
+
+
+def reset(email, now=None):
+    """Forget the failures of ``email`` once its owner signed in."""
+    now = time.time() if now is None else now
+    cache.delete_many(_keys("email", email, now))
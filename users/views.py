@@ -2,6 +2,7 @@ from django.conf import settings
 from django.contrib.auth import authenticate, login, logout
 from django.shortcuts import redirect, render, reverse
 
+from . import throttle
 from .forms import UserAddForm, UserLoginForm
 
 
@@ -19,18 +20,35 @@ def create_user(request):
 
 
 def login_user(request):
-    form = UserLoginForm()
+    form, wait = UserLoginForm(), 0
     if request.method == "POST":
         form = UserLoginForm(request.POST)
         if form.is_valid():
-            user = authenticate(
-                email=form.data["email"], password=form.data["password"]
-            )
-            if user is not None:
-                login(request, user)
-                return redirect(settings.LOGIN_REDIRECT_URL)
+            email, ip = form.data["email"], throttle.client_ip(request)
+            # Refused before authenticate() spends time hashing
+            wait = throttle.retry_after(ip, email)
+            if wait:
+                form.add_error(
+                    None,
+                    f"Too many failed attempts, try again in {wait} seconds.",
+                )
+            else:
+                user = authenticate(
+                    request, email=email, password=form.data["password"]
+                )
+                if user is not None:
+                    throttle.reset(email)
+                    login(request, user)
+                    return redirect(settings.LOGIN_REDIRECT_URL)
+                throttle.record_failure(ip, email)
+
     context = {"form": form}
-    return render(request, "users/login.html", context)
+    response = render(
+        request, "users/login.html", context, status=429 if wait else 200
+    )
+    if wait:
+        response.headers["Retry-After"] = str(wait)
+    return response
 
 
 def logout_user(request):